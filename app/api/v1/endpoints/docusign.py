@@ -1,17 +1,25 @@
 from fastapi import APIRouter, Depends, HTTPException
-from app.api.v1.schemas.docusign_schemas import SendEnvelopeRequest, SendEnvelopeResponse
+from app.api.v1.schemas.docusign_schemas import (
+    SendEnvelopeRequest,
+    SendEnvelopeResponse,
+    SendEnvelopesRequest,
+    SendEnvelopesResponse,
+    TemplateCatalogResponse,
+)
+from app.core.config import settings
 from app.domain.services.docusign_service import DocusignService
-from app.dependencies import get_docusign_service 
+from app.dependencies import get_docusign_service, get_template_catalog
+from app.infrastructure.external.docusign_templates import DocuSignTemplateCatalog
 
 router = APIRouter()
 
 @router.post("/send_envelope", response_model=SendEnvelopeResponse)
-def send_envelope(
+async def send_envelope(
     payload: SendEnvelopeRequest,
     docusign_service: DocusignService = Depends(get_docusign_service)
 ):
     try:
-        result = docusign_service.send_envelope_for_property(
+        result = await docusign_service.send_envelope_for_property(
             customer_id=payload.customer_id,
             property_id=payload.property_id,
             location_id=payload.location_id
@@ -24,4 +32,43 @@ def send_envelope(
     except Exception as e:
         # Catch-all for unexpected errors
         print(f"Unexpected error: {e}")
-        raise HTTPException(status_code=500, detail="An unexpected error occurred.")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="An unexpected error occurred.")
+
+
+@router.post("/send_envelopes", response_model=SendEnvelopesResponse)
+async def send_envelopes(
+    payload: SendEnvelopesRequest,
+    docusign_service: DocusignService = Depends(get_docusign_service)
+):
+    """
+    Sends envelopes for a batch of properties with bounded concurrency.
+    Every item gets its own status/envelopeId/error entry.
+    """
+    max_concurrency = min(
+        payload.max_concurrency or settings.DOCUSIGN_BATCH_CONCURRENCY,
+        settings.DOCUSIGN_BATCH_MAX_CONCURRENCY
+    )
+    try:
+        results = await docusign_service.send_envelopes_for_properties(payload.items, max_concurrency)
+    except ConnectionError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    failed = sum(1 for result in results if result["error"])
+    return SendEnvelopesResponse(results=results, sent=len(results) - failed, failed=failed)
+
+
+@router.post("/templates/refresh", response_model=TemplateCatalogResponse)
+def refresh_templates(catalog: DocuSignTemplateCatalog = Depends(get_template_catalog)):
+    """Reloads the template name -> templateId index from DocuSign right away."""
+    try:
+        count = catalog.refresh()
+    except ConnectionError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return TemplateCatalogResponse(status="refreshed", templates=count)
+
+
+@router.delete("/templates/cache", response_model=TemplateCatalogResponse)
+def invalidate_templates(catalog: DocuSignTemplateCatalog = Depends(get_template_catalog)):
+    """Marks the template index stale; it is reloaded on the next lookup."""
+    catalog.invalidate()
+    return TemplateCatalogResponse(status="invalidated")
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 class SendEnvelopeRequest(BaseModel):
     customer_id: str
@@ -7,4 +7,26 @@ class SendEnvelopeRequest(BaseModel):
 
 class SendEnvelopeResponse(BaseModel):
     status: str
-    envelopeId: str
\ No newline at end of file
+    envelopeId: str
+    timings: dict[str, float] | None = None
+
+class SendEnvelopesRequest(BaseModel):
+    items: list[SendEnvelopeRequest]
+    max_concurrency: int | None = Field(default=None, ge=1)
+
+class SendEnvelopeResult(BaseModel):
+    customer_id: str
+    property_id: str
+    location_id: str
+    status: str
+    envelopeId: str | None = None
+    error: str | None = None
+
+class SendEnvelopesResponse(BaseModel):
+    results: list[SendEnvelopeResult]
+    sent: int
+    failed: int
+
+class TemplateCatalogResponse(BaseModel):
+    status: str
+    templates: int | None = None
\ No newline at end of file
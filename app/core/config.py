@@ -18,20 +18,46 @@ class Settings:
     GHL_API_TOKEN: str = os.getenv("GHL_API_TOKEN") or os.getenv("GHL_ACCESS_TOKEN")
     GHL_ACCESS_TOKEN: str = os.getenv("GHL_ACCESS_TOKEN")
     GHL_BASE_URL: str = os.getenv("GHL_BASE_URL", "https://services.leadconnectorhq.com")
+    # Legacy v1 API used by the /addTag routes in main.py
+    GHL_V1_BASE_URL: str = os.getenv("GHL_V1_BASE_URL", "https://rest.gohighlevel.com/v1")
     GHL_API_VERSION: str = os.getenv("GHL_API_VERSION", "2021-07-28")
+    # Seconds a location's custom field definitions are cached
+    LOCATION_METADATA_CACHE_TTL: int = int(os.getenv("LOCATION_METADATA_CACHE_TTL", "3600"))
+    # GHL duplicate-search results: seconds a match / a "no duplicate" answer is reused, and the entry cap
+    DUPLICATE_LOOKUP_CACHE_TTL: int = int(os.getenv("DUPLICATE_LOOKUP_CACHE_TTL", "300"))
+    DUPLICATE_LOOKUP_MISS_TTL: int = int(os.getenv("DUPLICATE_LOOKUP_MISS_TTL", "60"))
+    DUPLICATE_LOOKUP_CACHE_SIZE: int = int(os.getenv("DUPLICATE_LOOKUP_CACHE_SIZE", "50000"))
+    # Concurrent duplicate searches in one batched lookup
+    DUPLICATE_LOOKUP_CONCURRENCY: int = int(os.getenv("DUPLICATE_LOOKUP_CONCURRENCY", "8"))
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
 
     # DocuSign Configuration
-    DOCUSIGN_INTEGRATION_KEY: str = os.getenv("DOCUSIGN_INTEGRATION_KEY")
-    DOCUSIGN_USER_ID: str = os.getenv("DOCUSIGN_USER_ID")
-    DOCUSIGN_ACCOUNT_ID: str = os.getenv("DOCUSIGN_ACCOUNT_ID")
-    DOCUSIGN_OAUTH_BASE_URL: str = os.getenv("DOCUSIGN_OAUTH_BASE_URL")
-    DOCUSIGN_API_BASE_URL: str = os.getenv("DOCUSIGN_API_BASE_URL")
+    DOCUSIGN_INTEGRATION_KEY: str = os.getenv("DOCUSIGN_INTEGRATION_KEY", "b4bb3953-1adf-4f59-bc99-7980812b4586")
+    DOCUSIGN_USER_ID: str = os.getenv("DOCUSIGN_USER_ID", "38124ca9-c32d-4eee-95fe-e5c9f14a39f3")
+    DOCUSIGN_ACCOUNT_ID: str = os.getenv("DOCUSIGN_ACCOUNT_ID", "d793357d-2249-42c3-a21a-e99f0a993bd7")
+    DOCUSIGN_OAUTH_BASE_URL: str = os.getenv("DOCUSIGN_OAUTH_BASE_URL", "https://account.docusign.com")
+    DOCUSIGN_API_BASE_URL: str = os.getenv("DOCUSIGN_API_BASE_URL", "https://na4.docusign.net/restapi/v2.1")
     PRIVATE_KEY: str = os.getenv("PRIVATE_KEY")
+    # Seconds before expiry at which a cached access token is refreshed in the background
+    DOCUSIGN_TOKEN_REFRESH_MARGIN: int = int(os.getenv("DOCUSIGN_TOKEN_REFRESH_MARGIN", "300"))
+    # Template catalog: how long the name -> templateId index is trusted, and the list page size
+    DOCUSIGN_TEMPLATE_CACHE_TTL: int = int(os.getenv("DOCUSIGN_TEMPLATE_CACHE_TTL", "900"))
+    DOCUSIGN_TEMPLATE_PAGE_SIZE: int = int(os.getenv("DOCUSIGN_TEMPLATE_PAGE_SIZE", "100"))
+    # Default and upper bound for concurrent sends in /docusign/send_envelopes
+    DOCUSIGN_BATCH_CONCURRENCY: int = int(os.getenv("DOCUSIGN_BATCH_CONCURRENCY", "5"))
+    DOCUSIGN_BATCH_MAX_CONCURRENCY: int = int(os.getenv("DOCUSIGN_BATCH_MAX_CONCURRENCY", "20"))
+    # Pooled async DocuSign client (seconds / connection counts)
+    DOCUSIGN_CONNECT_TIMEOUT: float = float(os.getenv("DOCUSIGN_CONNECT_TIMEOUT", "5"))
+    DOCUSIGN_READ_TIMEOUT: float = float(os.getenv("DOCUSIGN_READ_TIMEOUT", "30"))
+    DOCUSIGN_MAX_CONNECTIONS: int = int(os.getenv("DOCUSIGN_MAX_CONNECTIONS", "20"))
+    DOCUSIGN_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("DOCUSIGN_MAX_KEEPALIVE_CONNECTIONS", "10"))
+    DOCUSIGN_HTTP2: bool = os.getenv("DOCUSIGN_HTTP2", "false").lower() in ("1", "true", "yes")
 
     # AWS DynamoDB Configuration
     DYNAMODB_PREFIX: str = os.getenv("DYNAMODB_PREFIX", "homedispo")
     DYNAMODB_REGION: str = os.getenv("DYNAMODB_REGION", "us-east-2")
+    # Optional, e.g. DynamoDB Local for load tests; None uses the regional AWS endpoint
+    DYNAMODB_ENDPOINT_URL: str | None = os.getenv("DYNAMODB_ENDPOINT_URL")
     AWS_ACCESS_KEY_ID: str | None = os.getenv("AWS_ACCESS_KEY_ID")
     AWS_SECRET_ACCESS_KEY: str | None = os.getenv("AWS_SECRET_ACCESS_KEY")
 
@@ -1,19 +1,57 @@
+from functools import lru_cache
+
 from app.domain.services.docusign_service import DocusignService
 from app.infrastructure.database.repository import PropertyRepository, ConnectionRepository
-from app.infrastructure.external.docusign_api import DocuSignAPI
+from app.infrastructure.external.docusign_api_async import AsyncDocuSignAPI
+from app.infrastructure.external.docusign_templates import DocuSignTemplateCatalog
+from app.infrastructure.external.docusign_token import DocuSignTokenProvider
 from app.infrastructure.external.reicb_api import REICBAPI
 
-# --- Step 2: Create Singleton instances of our infrastructure ---
-# These objects are created once and shared across the entire application.
-# This is efficient and manages state in a single place.
+# --- Step 2: Shared instances of our infrastructure, created on first use ---
+# Each getter builds its object once and returns the same instance afterwards,
+# so importing the app stays cheap and every caller shares one client.
 
 # Database Repositories
-property_repository = PropertyRepository()
-connection_repository = ConnectionRepository()
+@lru_cache(maxsize=None)
+def get_property_repository() -> PropertyRepository:
+    return PropertyRepository()
+
+
+@lru_cache(maxsize=None)
+def get_connection_repository() -> ConnectionRepository:
+    return ConnectionRepository()
+
 
 # External API Clients
-docusign_api_client = DocuSignAPI()
-reicb_api_client = REICBAPI(connection_repo=connection_repository)
+# One token provider for every DocuSign caller (including the legacy routes in main.py)
+@lru_cache(maxsize=None)
+def get_docusign_token_provider() -> DocuSignTokenProvider:
+    return DocuSignTokenProvider()
+
+
+@lru_cache(maxsize=None)
+def get_template_catalog() -> DocuSignTemplateCatalog:
+    """Dependency injector for the shared DocuSign template catalog."""
+    return DocuSignTemplateCatalog(token_provider=get_docusign_token_provider())
+
+
+@lru_cache(maxsize=None)
+def get_docusign_api_client() -> AsyncDocuSignAPI:
+    return AsyncDocuSignAPI(
+        token_provider=get_docusign_token_provider(),
+        template_catalog=get_template_catalog()
+    )
+
+
+@lru_cache(maxsize=None)
+def get_reicb_api_client() -> REICBAPI:
+    return REICBAPI(connection_repo=get_connection_repository())
+
+
+async def close_clients():
+    """Closes the pooled clients that were actually created."""
+    if get_docusign_api_client.cache_info().currsize:
+        await get_docusign_api_client().aclose()
 
 
 # --- Step 3: Create the "Getter" function for our service ---
@@ -32,7 +70,7 @@ def get_docusign_service() -> DocusignService:
         An instance of DocusignService.
     """
     return DocusignService(
-        docusign_api=docusign_api_client,
-        reicb_api=reicb_api_client,
-        property_repo=property_repository
-    )
\ No newline at end of file
+        docusign_api=get_docusign_api_client(),
+        reicb_api=get_reicb_api_client(),
+        property_repo=get_property_repository()
+    )
@@ -1,9 +1,14 @@
+import asyncio
+import logging
+import time
 from datetime import datetime as dt, timedelta
 from app.domain.models.docusign_models import EnvelopeData
-from app.infrastructure.external.docusign_api import DocuSignAPI
+from app.infrastructure.external.docusign_api_async import AsyncDocuSignAPI
 from app.infrastructure.external.reicb_api import REICBAPI
 from app.infrastructure.database.repository import PropertyRepository
 
+logger = logging.getLogger(__name__)
+
 def is_number(value):
     try:
         float(value)
@@ -17,7 +22,7 @@ def format_currency(value):
     return f"${float(value):,.0f}"
 
 class DocusignService:
-    def __init__(self, docusign_api: DocuSignAPI, reicb_api: REICBAPI, property_repo: PropertyRepository):
+    def __init__(self, docusign_api: AsyncDocuSignAPI, reicb_api: REICBAPI, property_repo: PropertyRepository):
         """
         Initializes the service with its dependencies (the infrastructure components).
         """
@@ -25,25 +30,57 @@ class DocusignService:
         self.reicb_api = reicb_api
         self.property_repo = property_repo
 
-    def send_envelope_for_property(self, customer_id: str, property_id: str, location_id: str) -> dict:
+    async def send_envelope_for_property(
+        self,
+        customer_id: str,
+        property_id: str,
+        location_id: str,
+        custom_field_map: dict | None = None,
+    ) -> dict:
         """
         The main business logic method. It orchestrates the entire process.
+
+        Independent stages run concurrently as soon as the request arrives:
+        the property -> contact chain, the location's custom field
+        definitions, the DocuSign token and the template index. They are
+        joined before the envelope is built, so latency follows the critical
+        path instead of the sum of every round-trip. Per-stage timings (ms)
+        are logged and returned under "timings".
+
+        `custom_field_map` lets batch callers reuse the location's custom
+        field definitions instead of fetching them for every property.
         """
-        # 1. Coordinate with Infrastructure: Get data from the database
-        property_dict = self.property_repo.get_property_by_id(customer_id, property_id)
-        if not property_dict:
-            raise ValueError(f"Property with ID '{property_id}' not found for customer '{customer_id}'.")
+        started = time.perf_counter()
+        timings = {}
 
-        # 2. Enforce Business Rule
-        if not property_dict.get("reicb_url"):
-            raise ValueError("Property does not have a linked REICB contact URL.")
-        
-        contact_id = property_dict["reicb_url"].split("/")[-1]
+        pending = [asyncio.create_task(self._timed(timings, "contact_chain", self._fetch_property_contact(
+            customer_id, property_id, location_id, timings
+        )))]
+        if custom_field_map is None:
+            pending.append(asyncio.create_task(self._timed(
+                timings, "custom_fields", asyncio.to_thread(self.reicb_api.get_custom_field_map, location_id)
+            )))
+        # Warm-ups only: create_and_send_envelope reports token/template failures itself
+        warmups = [
+            asyncio.create_task(self._timed(timings, "docusign_token", self.docusign_api.get_access_token())),
+            asyncio.create_task(self._timed(timings, "template_index", self._warm_template_index())),
+        ]
 
-        # 3. Coordinate with Infrastructure: Get data from an external API
-        contact = self.reicb_api.fetch_contact_by_id(contact_id, location_id)
-        contact_details = self.reicb_api.get_contact_details(contact, location_id)
+        try:
+            # 1-3. Property from the database, then the contact from REICB
+            property_dict, contact_id, contact = await pending[0]
+            if custom_field_map is None:
+                custom_field_map = await pending[1]
+            await asyncio.gather(*warmups, return_exceptions=True)
+        finally:
+            for task in pending + warmups:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    # Consume sibling failures once the first error is being raised
+                    task.exception()
 
+        contact_details = self.reicb_api.get_contact_details(contact, location_id, custom_field_map)
         if not contact_details:
             raise ValueError("Failed to retrieve contact details from REICB.")
 
@@ -57,7 +94,100 @@ class DocusignService:
         envelope.contactId = contact_id
         
         # 7. Coordinate with Infrastructure: Execute the final action
-        return self.docusign_api.create_and_send_envelope(envelope)
+        result = await self._timed(timings, "envelope", self.docusign_api.create_and_send_envelope(envelope))
+
+        timings["total"] = round((time.perf_counter() - started) * 1000, 1)
+        logger.info("Envelope sent for property=%s timings=%s", property_id, timings)
+        return {**result, "timings": timings}
+
+    async def _fetch_property_contact(
+        self, customer_id: str, property_id: str, location_id: str, timings: dict
+    ) -> tuple[dict, str, dict]:
+        """Loads the property and then the REICB contact it links to."""
+        property_dict = await self._timed(timings, "property", asyncio.to_thread(
+            self.property_repo.get_property_by_id, customer_id, property_id
+        ))
+        if not property_dict:
+            raise ValueError(f"Property with ID '{property_id}' not found for customer '{customer_id}'.")
+
+        # 2. Enforce Business Rule
+        if not property_dict.get("reicb_url"):
+            raise ValueError("Property does not have a linked REICB contact URL.")
+
+        contact_id = property_dict["reicb_url"].split("/")[-1]
+
+        # 3. Coordinate with Infrastructure: Get data from an external API
+        contact = await self._timed(timings, "contact", asyncio.to_thread(
+            self.reicb_api.fetch_contact_by_id, contact_id, location_id
+        ))
+        return property_dict, contact_id, contact
+
+    async def _warm_template_index(self):
+        catalog = self.docusign_api.template_catalog
+        if not catalog.is_fresh():
+            await asyncio.to_thread(catalog.list_templates)
+
+    @staticmethod
+    async def _timed(timings: dict, stage: str, awaitable):
+        started = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            timings[stage] = round((time.perf_counter() - started) * 1000, 1)
+
+    async def send_envelopes_for_properties(self, items: list, max_concurrency: int) -> list[dict]:
+        """
+        Sends one envelope per (customer_id, property_id, location_id) item
+        with at most `max_concurrency` sends in flight.
+
+        The DocuSign token, the template index and each location's custom
+        field definitions are loaded once for the whole batch. A failing item
+        is reported in its own result and never aborts the rest of the batch.
+        """
+        # Warm the shared DocuSign token and template index before fanning out
+        await asyncio.to_thread(self.docusign_api.template_catalog.list_templates)
+
+        location_ids = list({item.location_id for item in items})
+        field_maps = await asyncio.gather(
+            *(asyncio.to_thread(self.reicb_api.get_custom_field_map, location_id) for location_id in location_ids),
+            return_exceptions=True
+        )
+        custom_field_maps, location_errors = {}, {}
+        for location_id, field_map in zip(location_ids, field_maps):
+            if isinstance(field_map, Exception):
+                location_errors[location_id] = str(field_map)
+            else:
+                custom_field_maps[location_id] = field_map
+
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def send_one(item) -> dict:
+            result = {
+                "customer_id": item.customer_id,
+                "property_id": item.property_id,
+                "location_id": item.location_id,
+                "status": "failed",
+                "envelopeId": None,
+                "error": None,
+            }
+            if item.location_id in location_errors:
+                result["error"] = location_errors[item.location_id]
+                return result
+            async with semaphore:
+                try:
+                    response = await self.send_envelope_for_property(
+                        customer_id=item.customer_id,
+                        property_id=item.property_id,
+                        location_id=item.location_id,
+                        custom_field_map=custom_field_maps[item.location_id],
+                    )
+                    result["status"] = response.get("status", "sent")
+                    result["envelopeId"] = response.get("envelopeId")
+                except Exception as e:
+                    result["error"] = str(e)
+            return result
+
+        return list(await asyncio.gather(*(send_one(item) for item in items)))
 
     def _create_envelope_data(self, contact_details: dict, property_dict: dict, contact: dict) -> EnvelopeData:
         """Helper method for data mapping and transformation."""
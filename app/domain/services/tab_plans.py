@@ -0,0 +1,218 @@
+"""
+Per-template DocuSign tab plans.
+
+The tab-label mappings for each template are compiled once at import time into
+a flat tuple of `TabPlanEntry` rows, each carrying the formatter that produces
+its value. Building an envelope's tabs is then a single pass over the plan with
+no label comparisons. Both the legacy `/sendEnvelope` route and the
+`DocuSignAPI` send path use these plans.
+"""
+from typing import Any, Callable, NamedTuple
+
+DEFAULT_TEMPLATE_NAME = "Texas-Creative Purchase Contract Hudly Title"
+BONUS_OFFER_TEMPLATE_NAME = "Cash Offers-(Bonus Offers)"
+SELLER_FINANCE_TEMPLATE_NAME = "Seller Finance Offer"
+
+# Templates whose documents print the title company's details
+TEMPLATES_WITH_TITLE_COMPANY = frozenset({DEFAULT_TEMPLATE_NAME, SELLER_FINANCE_TEMPLATE_NAME})
+
+# Title company (title, address, telephone, email) by market / state
+TITLE_COMPANIES = {
+    "Florida": ("AMZ Title", "8381 N. Gunn Hwy Tampa,FL 33626", "813-200-6130", "neworders@amztitle.com"),
+    "Louisiana": ("True Title", "110 Veterans Blvd. Suite 525, Metairie, LA 70005", "(504) 309-1030", "rlarousse@truetitle.net"),
+    "Midwest": ("Empora Title", "145 E Rich St, Floor 4 Columbus, OH 43215", "(614) 660-5503", "info@emporatitle.com"),
+    "Arizona": ("Closed Title Reinvented", " ", "(480)-615-3661", "ctucker@closedtitle.com"),
+    "Texas": ("Hudly Title", "801 Barton Springs Road Austin, TX 7870", "(512) 400-4210", "escrow@hudlytitle.com"),
+    "Georgia": ("Parkway Law Group", "1755 North Brown Road Suite 150, Lawrenceville, GA 30043", "(678) 407-5555", "brionna@parkwaytitle.com"),
+    "Kane Title": ("Kane Title, Atten: Brittany", "5301 Village Creek Drive, Suite A, Plano, Texas 75093", "(972) 325-1505", "orders@kanetitlellc.com"),
+    "Closed Title Kendall": ("Hudly Title", "801 Barton Springs Road Austin, TX 7870", "(512) 400-4210", "escrow@hudlytitle.com"),
+    "Closed Title Adrienne": ("Closed Title Reinvented", " ", "(480)-615-3661", "ctucker@closedtitle.com"),
+    # abbreviated state names
+    "FL": ("AMZ Title", "8381 N. Gunn Hwy Tampa,FL 33626", "813-200-6130", "neworders@amztitle.com"),
+    "LA": ("True Title", "110 Veterans Blvd. Suite 525, Metairie, LA 70005", "(504) 309-1030", "rlarousse@truetitle.net"),
+    "MW": ("Empora Title", "145 E Rich St, Floor 4 Columbus, OH 43215", "(614) 660-5503", "info@emporatitle.com"),
+    "AZ": ("Closed Title Reinvented", " ", "(480)-615-3661", "ctucker@closedtitle.com"),
+    "TX": ("Hudly Title", "801 Barton Springs Road Austin, TX 7870", "(512) 400-4210", "escrow@hudlytitle.com"),
+    "GA": ("Parkway Law Group", "1755 North Brown Road Suite 150, Lawrenceville, GA 30043", "(678) 407-5555", "brionna@parkwaytitle.com"),
+    "KT": ("Kane Title, Atten: Brittany", "5301 Village Creek Drive, Suite A, Plano, Texas 75093", "(972) 325-1505", "orders@kanetitlellc.com"),
+}
+
+# Tab mappings for different templates: tab type -> field -> tab labels
+TEXAS_PURCHASE_CONTRACT_TABS = {
+    "fullNameTabs": {
+        "FullName": ["Text ac3aaeb0-0679-4b1c-8810-0c24ef969808", "Name bad5d7d1-d668-4d77-b525-f789f28930f9"],
+    },
+    "textTabs": {
+        "FullName": ["Text 3af59d6f-3c3a-4fd4-a7b8-f3a3cd3ccd51"],
+        "ClientEmail": ["Text db5edea4-60d7-47bb-b690-5898bef99cc5"],
+        "propertyAddress": ["Text 8d063961-178b-4c61-a81e-d444a6c56978", "Text 1a9f762b-0095-41a5-843a-0acc2850450e"],
+        "Address": ["Text b6d420a3-c43d-4bca-a07d-0924053c26a0"],
+        "Seller1": ["Text 2e108362-fc9a-4cab-91dc-578b5169bc58", "Text 45d3e6ae-ef41-4cd3-8ce5-060456a856b4", "Text 3150fd93-12fe-4675-a697-45c1db7facae", "Text 9757dbfe-74ad-498a-a41e-4edafd403c8f"],
+        "Seller2": ["Text 8a3ef30d-601a-4f71-b108-af4041d67b7b", "Text 8b3e05be-85a4-47b0-96ce-c95ed88aab4e", "Text eb611128-2a6f-48c4-a4a9-8558b6e5af45", "Text 9e729bce-1a7b-46e6-b9b5-e78fcaf41513"],
+        "Day": ["Text efd6729e-653d-4dc5-9eb5-6ba2b4afce7c"],
+        "Year": ["Text 2e813665-22d3-4bdc-bcaa-7b505dd567d5"],
+        "Apn": ["Text 33976459-a290-4365-8bcc-52b6132ea716"],
+        "LegalDescription": ["Text d4b9e8b5-9b87-4e07-a618-12bcc3d61ca9"],
+        "Debt": ["Text 72492c39-9afa-4008-bd82-75ff96a393c1", "Text a829029c-a0b5-4f14-a891-1893793b6a1e", "Text b0aefea7-7f48-4a17-b882-123b95ffc445", "Text d4047e56-f49f-4f80-8bb7-ffeafe60f121"],
+        "Phone": ["Text d6a58bbd-a825-4b73-acb2-75c78fcf5b44"],
+        "Broker": ["Text 5498e23f-a693-4f95-87c7-15668099b82b"],
+        "sellerCarry": ["Text 8829e6fd-2cb7-425a-bfcd-4026dd2a3407", "Text ab63d105-95e1-412c-998a-696be1924b5f"],
+        "agentComission": ["Text d47a40c5-e305-4bf2-9d0f-23327efc7dc1", "Text 71be9608-14e4-4202-9641-6535ec2c0ccf"],
+        "purchasePrice": ["Text d880ff92-fb45-4b96-87ac-2311bb1ca6ad"],
+        "solarLien": ["Text 45c12c3b-51e6-4e0c-903f-28ec6f4c903b", "Text 75e6f183-4111-4131-aacb-8c951466ede8", "Text 6d5b60db-784f-4a81-82fb-c483fe6485de"],
+        "cashToSeller": ["Text 435cd2a7-605d-4e1c-b808-efcfcf576345", "Text 4c7b42bd-90e8-4b1f-8ad2-d47343493296", "Text ad59c80a-266a-424c-b64d-9bb7c4a0c56a"],
+        "Arrears": ["Text b231eabb-0627-45a6-aa26-b21f1fca082e"],
+        "CompanyTitle": ["Text 4d29231e-a530-47c7-a852-9afa11ca6817", "Text b618a341-0f01-4e87-abee-39aa2becae06"],
+        "CompanyEmail": ["Text bfcdd833-8930-4a77-9a85-cc6ee3000b14"],
+        "CompanyAddress": ["Text 2a8fd0c2-723e-4a61-8cdc-40307e7cb447", "Text 5fc5c901-2804-499f-a851-d9ec1547aa37"],
+        "CompanyTelephone": ["Text 8741379d-5190-4cc5-9121-775f6d814acb"],
+    },
+}
+
+BONUS_OFFER_TABS = {
+    "fullNameTabs": {
+        "FullName": ["Name 654afd7a-cebc-41e3-adaa-ca2a135f9227"],
+    },
+    "textTabs": {
+        "propertyAddress": ["Text f4fea6fc-73af-42cb-9dca-a3a89278433b", "Text 96b302b1-eac1-4494-b6a7-6e60841fbd45"],
+        "FullName": [],
+        "Seller1": ["Text 04c8164c-e4a8-44c9-8551-edd5b50b4757", "Text 2ecb670f-53f1-4c5c-88f3-2d300aaf18df", "Text 96595125-399d-4f15-8a22-9f250217a58c"],
+        "Seller2": ["Text 1d6719de-7739-4d80-9d6f-d85a464c0ac9"],
+        "Day": [],
+        "Year": [],
+        "LegalDescription": ["Text 44d99d8d-5d3b-4cb3-b430-0d755728ac48"],
+        "Debt": [""],
+        "Phone": [],
+        "Broker": [],
+        "ClientEmail": [],
+        "Address": [],
+        "Apn": ["Text e53e1a35-855e-4562-914f-8414f3516a7d"],
+    },
+}
+
+SELLER_FINANCE_OFFER_TABS = {
+    "fullNameTabs": {
+        "FullName": [],
+    },
+    "textTabs": {
+        "propertyAddress": ["Text 763eb56b-ac75-460a-a056-7a6e5665d6c3", "Text 96b302b1-eac1-4494-b6a7-6e60841fbd45", "Text f4fea6fc-73af-42cb-9dca-a3a89278433b"],
+        "FullName": [],
+        "Seller1": ["Text 96595125-399d-4f15-8a22-9f250217a58c", "Text 4e3a6460-bc99-406c-a30e-c9ff5946d97c", "Text 2ecb670f-53f1-4c5c-88f3-2d300aaf18df", "Text 04c8164c-e4a8-44c9-8551-edd5b50b4757"],
+        "Seller2": ["Text 7c6fe0bf-8a2a-4121-90b0-59598bfedbbb", "Text 1d6719de-7739-4d80-9d6f-d85a464c0ac9", "Text 8d3274f5-0de3-4182-87b7-f10add7d8cdf"],
+        "Day": ["Text 806fb25a-9700-44ae-92d3-6858d3543322"],
+        "Year": [],
+        "Apn": ["Text e53e1a35-855e-4562-914f-8414f3516a7d"],
+        "LegalDescription": ["Text 44d99d8d-5d3b-4cb3-b430-0d755728ac48"],
+        "Debt": [],
+        "Phone": [],
+        "Broker": [],
+        "ClientEmail": [],
+        "Address": [],
+        "CashToSeller": ["Text 26cdeb5f-85f4-4dab-9a5f-4634aabee303"],
+        "CompanyName": ["Text fa3727e1-7aaa-437d-b4b7-289e139d3535"],
+        "CompanyAddress": ["Text de5818de-f9bd-4ada-b829-35f3474bdc52"],
+        "CompanyTitle": ["Text c95342ba-0ee8-44e7-b467-05c7371221ab"],
+    },
+}
+
+TEMPLATE_TAB_MAPPINGS = {
+    DEFAULT_TEMPLATE_NAME: TEXAS_PURCHASE_CONTRACT_TABS,
+    BONUS_OFFER_TEMPLATE_NAME: BONUS_OFFER_TABS,
+    SELLER_FINANCE_TEMPLATE_NAME: SELLER_FINANCE_OFFER_TABS,
+}
+
+Formatter = Callable[[Any], Any]
+
+
+class TabPlanEntry(NamedTuple):
+    tab_type: str
+    tab_label: str
+    field: str
+    formatter: Formatter
+
+
+# Custom values for specific tabs, keyed by (field, tab label)
+TAB_FORMATTERS: dict[tuple[str, str], Formatter] = {
+    ("cashToSeller", "Text 4c7b42bd-90e8-4b1f-8ad2-d47343493296"): lambda d: f'•{d.CashToSeller} Cash to the sellers at COE.',
+    ("sellerCarry", "Text 8829e6fd-2cb7-425a-bfcd-4026dd2a3407"): lambda d: f'•${d.sellerCarry} Seller carry to be paid to the sellers in 48 equal payments of $166.67 per month.',
+    ("solarLien", "Text 75e6f183-4111-4131-aacb-8c951466ede8"): lambda d: f'•${d.solarLien}  Solar lien to be taken over subject to the existing loan.',
+    ("agentComission", "Text 71be9608-14e4-4202-9641-6535ec2c0ccf"): lambda d: f'•${d.agentComission}  Listing agent commission paid by buyer at COE.',
+    ("Arrears", "Text b231eabb-0627-45a6-aa26-b21f1fca082e"): lambda d: f'•${d.Arrears} In seller arrears to be paid by buyer at COE.',
+    ("Debt", "Text 72492c39-9afa-4008-bd82-75ff96a393c1"): lambda d: f'existing loan of ${d.Debt}',
+    ("solarLien", "Text 6d5b60db-784f-4a81-82fb-c483fe6485de"): lambda d: f"Solar lien of ${d.solarLien}",
+}
+
+# The legacy route stores the bare amount in `cashToSeller` and adds the "$" itself
+LEGACY_TAB_FORMATTERS: dict[tuple[str, str], Formatter] = {
+    **TAB_FORMATTERS,
+    ("cashToSeller", "Text 4c7b42bd-90e8-4b1f-8ad2-d47343493296"): lambda d: f'•${d.cashToSeller} Cash to the sellers at COE.',
+}
+
+
+def _field_getter(field: str) -> Formatter:
+    return lambda d: getattr(d, field, "")
+
+
+def compile_tab_plan(
+    tab_mappings: dict,
+    formatters: dict[tuple[str, str], Formatter],
+    carry_forward: bool = False,
+) -> tuple[TabPlanEntry, ...]:
+    """
+    Flattens a template's tab mapping into plan entries with resolved formatters.
+
+    With `carry_forward`, a custom formatter also applies to the labels listed
+    after it for the same field; this reproduces how `DocuSignAPI` has always
+    filled those tabs.
+    """
+    plan = []
+    for tab_type, fields in tab_mappings.items():
+        for field, tab_labels in fields.items():
+            formatter = _field_getter(field)
+            for tab_label in tab_labels:
+                custom = formatters.get((field, tab_label))
+                if custom is not None and carry_forward:
+                    formatter = custom
+                plan.append(TabPlanEntry(tab_type, tab_label, field, custom or formatter))
+    return tuple(plan)
+
+
+TAB_PLANS = {
+    name: compile_tab_plan(mappings, TAB_FORMATTERS, carry_forward=True)
+    for name, mappings in TEMPLATE_TAB_MAPPINGS.items()
+}
+LEGACY_TAB_PLANS = {
+    name: compile_tab_plan(mappings, LEGACY_TAB_FORMATTERS)
+    for name, mappings in TEMPLATE_TAB_MAPPINGS.items()
+}
+
+
+def get_tab_plan(template_name: str, legacy: bool = False) -> tuple[TabPlanEntry, ...]:
+    """Returns the compiled plan for a template, defaulting to the Texas purchase contract."""
+    plans = LEGACY_TAB_PLANS if legacy else TAB_PLANS
+    return plans.get(template_name) or plans[DEFAULT_TEMPLATE_NAME]
+
+
+def build_tabs(plan: tuple[TabPlanEntry, ...], envelope_data) -> dict:
+    """Builds the DocuSign `tabs` object for the `app/` send path."""
+    tabs = {"textTabs": [], "fullNameTabs": []}
+    for tab_type, tab_label, _, formatter in plan:
+        tabs[tab_type].append({"tabLabel": tab_label, "value": formatter(envelope_data)})
+    return tabs
+
+
+def build_legacy_tabs(plan: tuple[TabPlanEntry, ...], envelope_data) -> dict:
+    """
+    Builds the `tabs` object for the legacy `/sendEnvelope` route, which skips
+    unset fields and blanks out "null" values.
+    """
+    tabs = {}
+    for tab_type, tab_label, field, formatter in plan:
+        if getattr(envelope_data, field, None) is None:
+            continue
+        value = formatter(envelope_data)
+        tabs.setdefault(tab_type, []).append({
+            "tabLabel": tab_label,
+            "value": value if value != "null" and value != "null null" else ""
+        })
+    return tabs
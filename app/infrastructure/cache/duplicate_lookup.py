@@ -0,0 +1,100 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+from app.core.config import settings
+
+
+class DuplicateLookup(NamedTuple):
+    # Matching GHL contact, or None when the search returned "no duplicate"
+    contact: dict | None
+    expires_at: float
+
+
+LookupKey = tuple[str, str | None, str | None]
+
+
+class DuplicateLookupCache:
+    """
+    Short-lived cache of GHL `contacts/search/duplicate` answers, keyed by
+    (location, email key, phone key) with keys normalized by the caller.
+
+    Both matches and misses are kept (misses for a shorter time), so replayed
+    leads don't search again. Creating or updating a contact must call
+    `invalidate_identity` so a cached miss for its email or phone is not
+    served afterwards. Least recently used entries are evicted past `max_entries`.
+    """
+
+    def __init__(self, ttl: int | None = None, miss_ttl: int | None = None, max_entries: int | None = None):
+        self.ttl = ttl if ttl is not None else settings.DUPLICATE_LOOKUP_CACHE_TTL
+        self.miss_ttl = miss_ttl if miss_ttl is not None else settings.DUPLICATE_LOOKUP_MISS_TTL
+        self.max_entries = max_entries if max_entries is not None else settings.DUPLICATE_LOOKUP_CACHE_SIZE
+        self._entries: OrderedDict[LookupKey, DuplicateLookup] = OrderedDict()
+        # (location, "email"/"phone", key) -> cache keys mentioning it, for invalidation
+        self._by_identity: dict[tuple[str, str, str], set[LookupKey]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, location_id: str, email_key: str | None, phone_key: str | None) -> tuple[bool, dict | None]:
+        """Returns (cached, contact); `cached` is False when GHL has to be asked."""
+        key = (location_id, email_key, phone_key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry.contact
+
+    def put(self, location_id: str, email_key: str | None, phone_key: str | None, contact: dict | None):
+        key = (location_id, email_key, phone_key)
+        expires_at = time.monotonic() + (self.ttl if contact else self.miss_ttl)
+        with self._lock:
+            self._entries[key] = DuplicateLookup(contact, expires_at)
+            self._entries.move_to_end(key)
+            for identity in self._identities(key):
+                self._by_identity.setdefault(identity, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_identity(self, location_id: str, email_key: str | None = None, phone_key: str | None = None) -> int:
+        """Drops every cached answer that involved this email or phone; returns how many."""
+        removed = 0
+        with self._lock:
+            for identity in self._identities((location_id, email_key, phone_key)):
+                for key in list(self._by_identity.get(identity, ())):
+                    self._remove(key)
+                    removed += 1
+        return removed
+
+    def invalidate(self, location_id: str | None = None):
+        """Drops one location's answers, or every answer when no location is given."""
+        with self._lock:
+            for key in [key for key in self._entries if location_id is None or key[0] == location_id]:
+                self._remove(key)
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def _remove(self, key: LookupKey):
+        if self._entries.pop(key, None) is None:
+            return
+        for identity in self._identities(key):
+            keys = self._by_identity.get(identity)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_identity[identity]
+
+    @staticmethod
+    def _identities(key: LookupKey) -> list[tuple[str, str, str]]:
+        location_id, email_key, phone_key = key
+        return [(location_id, kind, value) for kind, value in (("email", email_key), ("phone", phone_key)) if value]
+
+
+duplicate_lookup_cache = DuplicateLookupCache()
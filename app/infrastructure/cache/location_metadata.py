@@ -0,0 +1,89 @@
+import threading
+import time
+from typing import Callable, NamedTuple
+
+from app.core.config import settings
+
+
+class LocationMetadata(NamedTuple):
+    custom_fields: list[dict]
+    # Custom field id -> name exactly as GHL returns it (some names carry trailing spaces)
+    id_to_name: dict[str, str]
+    # Stripped custom field name -> id
+    name_to_id: dict[str, str]
+    loaded_at: float
+
+
+class LocationMetadataCache:
+    """
+    Per-location cache of GoHighLevel custom field definitions.
+
+    Definitions rarely change, so they are kept for `ttl` seconds and shared by
+    every caller (REICBAPI and the /crm upload routes). Loads are single-flight
+    per location: concurrent misses for the same location wait for one fetch
+    instead of each calling `locations/{id}/customFields`.
+    """
+
+    def __init__(self, ttl: int | None = None):
+        self.ttl = ttl if ttl is not None else settings.LOCATION_METADATA_CACHE_TTL
+        self._entries: dict[str, LocationMetadata] = {}
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def peek(self, location_id: str) -> LocationMetadata | None:
+        """Returns the location's entry if it is still fresh, without loading."""
+        entry = self._entries.get(location_id)
+        if entry is not None and time.monotonic() - entry.loaded_at < self.ttl:
+            return entry
+        return None
+
+    def get(self, location_id: str, loader: Callable[[], list[dict]]) -> LocationMetadata:
+        """
+        Returns the location's custom field metadata, calling `loader` (which
+        returns the raw `customFields` list) only when the entry is missing or
+        expired. If a reload fails the previous entry keeps being served.
+        """
+        entry = self.peek(location_id)
+        if entry is not None:
+            return entry
+
+        with self._lock_for(location_id):
+            # Another caller may have loaded it while we were waiting.
+            entry = self.peek(location_id)
+            if entry is not None:
+                return entry
+            try:
+                entry = self._build(loader())
+            except Exception:
+                stale = self._entries.get(location_id)
+                if stale is None:
+                    raise
+                print(f"Custom field refresh failed for location {location_id}; serving the previous definitions.")
+                return stale
+            self._entries[location_id] = entry
+            return entry
+
+    def invalidate(self, location_id: str | None = None):
+        """Drops one location's entry, or every entry when no location is given."""
+        if location_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(location_id, None)
+
+    def _lock_for(self, location_id: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(location_id, threading.Lock())
+
+    @staticmethod
+    def _build(custom_fields: list[dict]) -> LocationMetadata:
+        fields = [field for field in custom_fields if 'id' in field and 'name' in field]
+        return LocationMetadata(
+            custom_fields=fields,
+            id_to_name={field['id']: field['name'] for field in fields},
+            name_to_id={field['name'].strip(): field['id'] for field in fields},
+            loaded_at=time.monotonic(),
+        )
+
+
+# Shared by the app/ services and the legacy routers
+location_metadata_cache = LocationMetadataCache()
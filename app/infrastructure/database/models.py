@@ -9,6 +9,7 @@ class Property(Model):
     class Meta:
         table_name = settings.DYNAMODB_PREFIX + "_properties"
         region = settings.DYNAMODB_REGION
+        host = settings.DYNAMODB_ENDPOINT_URL
 
         # If you're running locally and not using IAM roles, PynamoDB needs credentials.
         # These will be None if not set in the environment, and PynamoDB will
@@ -34,6 +35,7 @@ class Connection(Model):
     class Meta:
         table_name = settings.DYNAMODB_PREFIX + "_connections"
         region = settings.DYNAMODB_REGION
+        host = settings.DYNAMODB_ENDPOINT_URL
         aws_access_key_id = settings.AWS_ACCESS_KEY_ID
         aws_secret_access_key = settings.AWS_SECRET_ACCESS_KEY
 
@@ -0,0 +1,91 @@
+import asyncio
+import importlib.util
+
+import httpx
+
+from app.core.config import settings
+from app.domain.models.docusign_models import EnvelopeData
+from app.infrastructure.external.docusign_api import DocuSignAPI
+
+
+class AsyncDocuSignAPI(DocuSignAPI):
+    """
+    Async variant of `DocuSignAPI` built on one long-lived `httpx.AsyncClient`.
+
+    Connections to DocuSign are kept alive and pooled across requests, every
+    call has explicit connect/read timeouts, and HTTP/2 is used when enabled
+    and the `h2` package is installed. Token and template lookups are served
+    from the shared caches and only fall back to a worker thread on a miss.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._client: httpx.AsyncClient | None = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            http2 = settings.DOCUSIGN_HTTP2 and importlib.util.find_spec("h2") is not None
+            self._client = httpx.AsyncClient(
+                base_url=self.api_base_url,
+                http2=http2,
+                timeout=httpx.Timeout(
+                    settings.DOCUSIGN_READ_TIMEOUT,
+                    connect=settings.DOCUSIGN_CONNECT_TIMEOUT
+                ),
+                limits=httpx.Limits(
+                    max_connections=settings.DOCUSIGN_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.DOCUSIGN_MAX_KEEPALIVE_CONNECTIONS
+                ),
+            )
+        return self._client
+
+    async def aclose(self):
+        """Closes the pooled client; called from the app's shutdown hook."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def get_access_token(self) -> str | None:
+        token = self.token_provider.get_cached_token()
+        if token:
+            return token
+        return await asyncio.to_thread(self.token_provider.get_access_token)
+
+    async def get_template_async(self, template_name: str) -> dict | None:
+        template = self.template_catalog.get_cached_template(template_name)
+        if template is not None:
+            return template
+        return await asyncio.to_thread(self.template_catalog.get_template, template_name)
+
+    async def create_and_send_envelope(self, envelope_data: EnvelopeData) -> dict:
+        """
+        Constructs and sends an envelope using a specific template and data.
+        """
+        access_token = await self.get_access_token()
+        if not access_token:
+            raise ConnectionError("Failed to generate DocuSign access token.")
+
+        template = await self.get_template_async(envelope_data.templateName)
+        if not template:
+            raise ValueError(f"Template '{envelope_data.templateName}' not found.")
+
+        envelope_payload = self.build_envelope_payload(envelope_data, template["templateId"])
+
+        try:
+            response = await self._get_client().post(
+                f"/accounts/{self.account_id}/envelopes",
+                headers={"Authorization": f"Bearer {access_token}"},
+                json=envelope_payload
+            )
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 401:
+                # Force the next call to run a fresh JWT grant
+                self.token_provider.invalidate()
+            print(f"Error creating envelope: {e}")
+            print(f"Response body: {e.response.text}")
+            raise ConnectionError(f"Failed to create DocuSign envelope. Error: {e.response.text}")
+        except httpx.HTTPError as e:
+            print(f"Error creating envelope: {e}")
+            raise ConnectionError(f"Failed to create DocuSign envelope. Error: {e}")
@@ -0,0 +1,154 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from app.core.config import settings
+from app.infrastructure.external.docusign_token import DocuSignTokenProvider
+
+
+class DocuSignTemplateCatalog:
+    """
+    In-memory index of the account's DocuSign templates, keyed by template name.
+
+    The full template list is fetched page by page (remaining pages in parallel)
+    and kept for `ttl` seconds, so resolving a `templateName` on a send is a
+    dictionary lookup instead of a DocuSign round-trip.
+    """
+
+    def __init__(
+        self,
+        token_provider: DocuSignTokenProvider,
+        ttl: int | None = None,
+        page_size: int | None = None,
+        max_workers: int = 4,
+    ):
+        self.token_provider = token_provider
+        self.account_id = settings.DOCUSIGN_ACCOUNT_ID
+        self.api_base_url = settings.DOCUSIGN_API_BASE_URL
+        self.ttl = ttl if ttl is not None else settings.DOCUSIGN_TEMPLATE_CACHE_TTL
+        self.page_size = page_size or settings.DOCUSIGN_TEMPLATE_PAGE_SIZE
+        self.max_workers = max_workers
+
+        self._templates: list[dict] = []
+        self._index: dict[str, dict] = {}
+        self._loaded_at: float | None = None
+        self._load_lock = threading.Lock()
+
+    def is_fresh(self) -> bool:
+        """True when the index is loaded and younger than the TTL."""
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl
+
+    def get_template(self, template_name: str) -> dict | None:
+        """
+        Resolves a template by its exact name.
+
+        Falls back to a single `search_text` query when the name is not in the
+        index, so templates created after the last refresh are still found.
+        """
+        try:
+            self._ensure_loaded()
+        except ConnectionError as e:
+            print(f"An error occurred while fetching templates: {e}")
+
+        template = self._index.get(template_name)
+        if template is not None:
+            return template
+        return self._search_template(template_name)
+
+    def get_cached_template(self, template_name: str) -> dict | None:
+        """
+        Returns the template from a fresh index without any network call, or
+        None when the index is stale or does not contain the name.
+        """
+        if not self.is_fresh():
+            return None
+        return self._index.get(template_name)
+
+    def list_templates(self) -> list[dict]:
+        """Returns every template in the account (served from the index)."""
+        self._ensure_loaded()
+        return list(self._templates)
+
+    def invalidate(self):
+        """Marks the index stale; the next lookup reloads it from DocuSign."""
+        self._loaded_at = None
+
+    def refresh(self) -> int:
+        """Reloads the index immediately and returns the number of templates."""
+        with self._load_lock:
+            self._load()
+        return len(self._templates)
+
+    def _ensure_loaded(self):
+        if self.is_fresh():
+            return
+        with self._load_lock:
+            if self.is_fresh():
+                return
+            try:
+                self._load()
+            except ConnectionError:
+                if self._loaded_at is None and not self._templates:
+                    raise
+                # Keep serving the stale index rather than failing every send
+                print("Template refresh failed; serving the previous template index.")
+
+    def _load(self):
+        """Fetches every page of templates and swaps in a fresh index."""
+        access_token = self.token_provider.get_access_token()
+        if not access_token:
+            raise ConnectionError("Failed to generate DocuSign access token.")
+
+        first_page = self._fetch_page(access_token, 0)
+        templates = list(first_page.get("envelopeTemplates", []))
+        total = int(first_page.get("totalSetSize") or len(templates))
+
+        start_positions = list(range(len(templates), total, self.page_size)) if templates else []
+        if start_positions:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                pages = executor.map(lambda start: self._fetch_page(access_token, start), start_positions)
+                for page in pages:
+                    templates.extend(page.get("envelopeTemplates", []))
+
+        index = {}
+        for template in templates:
+            # First occurrence wins, matching the previous linear scan
+            index.setdefault(template.get("name"), template)
+
+        self._templates = templates
+        self._index = index
+        self._loaded_at = time.monotonic()
+
+    def _fetch_page(self, access_token: str, start_position: int) -> dict:
+        url = f"{self.api_base_url}/accounts/{self.account_id}/templates"
+        headers = {"Authorization": f"Bearer {access_token}"}
+        params = {"start_position": start_position, "count": self.page_size}
+        try:
+            response = requests.get(url, headers=headers, params=params, timeout=30)
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            raise ConnectionError(f"Failed to list DocuSign templates: {e}")
+
+    def _search_template(self, template_name: str) -> dict | None:
+        access_token = self.token_provider.get_access_token()
+        if not access_token:
+            return None
+
+        url = f"{self.api_base_url}/accounts/{self.account_id}/templates"
+        headers = {"Authorization": f"Bearer {access_token}"}
+        params = {"search_text": template_name}
+        try:
+            response = requests.get(url, headers=headers, params=params, timeout=30)
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            print(f"An error occurred while fetching templates: {e}")
+            return None
+
+        for template in response.json().get("envelopeTemplates", []):
+            if template.get("name") == template_name:
+                self._index[template_name] = template
+                return template
+        return None
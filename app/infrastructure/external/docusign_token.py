@@ -0,0 +1,138 @@
+import threading
+import time
+
+import jwt
+import requests
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.backends import default_backend
+
+from app.core.config import settings
+
+
+class DocuSignTokenProvider:
+    """
+    Issues DocuSign access tokens through the JWT grant and caches them until
+    shortly before they expire.
+
+    A single instance is shared by every code path that talks to DocuSign, so
+    the PEM key is parsed once and the RS256 sign + `/oauth/token` round-trip
+    only happens when the cached token is about to lapse.
+    """
+
+    def __init__(
+        self,
+        integration_key: str | None = None,
+        user_id: str | None = None,
+        oauth_base_url: str | None = None,
+        private_key: str | None = None,
+        refresh_margin: int | None = None,
+    ):
+        self.integration_key = integration_key or settings.DOCUSIGN_INTEGRATION_KEY
+        self.user_id = user_id or settings.DOCUSIGN_USER_ID
+        self.oauth_base_url = oauth_base_url or settings.DOCUSIGN_OAUTH_BASE_URL
+        self.private_key = private_key or settings.PRIVATE_KEY
+        self.refresh_margin = refresh_margin if refresh_margin is not None else settings.DOCUSIGN_TOKEN_REFRESH_MARGIN
+
+        self._signing_key = None
+        # (token, time.monotonic() deadline) swapped as a single reference
+        self._cached: tuple[str | None, float] = (None, 0.0)
+        # Held by whoever is currently refreshing; guarantees a single refresh in flight.
+        self._refresh_lock = threading.Lock()
+
+    def get_access_token(self) -> str | None:
+        """
+        Returns a valid access token, refreshing it only when necessary.
+
+        - Fresh token: returned straight from the cache.
+        - Token inside the refresh margin: returned from the cache while a
+          background thread fetches its replacement.
+        - Missing/expired token: callers block on one shared refresh.
+        """
+        token = self.get_cached_token()
+        if token:
+            return token
+
+        with self._refresh_lock:
+            # Another caller may have refreshed while we were waiting.
+            token, expires_at = self._cached
+            if token and time.monotonic() < expires_at:
+                return token
+            return self._refresh()
+
+    def get_cached_token(self) -> str | None:
+        """
+        Returns the cached token without ever blocking on the network, or None
+        when there is no unexpired token. Safe to call from the event loop.
+        """
+        token, expires_at = self._cached
+        now = time.monotonic()
+
+        if token and now < expires_at - self.refresh_margin:
+            return token
+
+        if token and now < expires_at:
+            if self._refresh_lock.acquire(blocking=False):
+                threading.Thread(target=self._background_refresh, daemon=True).start()
+            return token
+
+        return None
+
+    def invalidate(self):
+        """Drops the cached token, e.g. after DocuSign rejected it with a 401."""
+        self._cached = (None, 0.0)
+
+    def _background_refresh(self):
+        try:
+            self._refresh()
+        finally:
+            self._refresh_lock.release()
+
+    def _refresh(self) -> str | None:
+        """Runs the JWT grant. Must be called while holding `_refresh_lock`."""
+        try:
+            now = int(time.time())
+            payload = {
+                "iss": self.integration_key,
+                "sub": self.user_id,
+                "aud": self.oauth_base_url.replace("https://", ""),
+                "iat": now,
+                "exp": now + 3600,  # Token expires in 1 hour
+                "scope": "signature impersonation"
+            }
+            encoded_jwt = jwt.encode(payload, self._get_signing_key(), algorithm="RS256")
+
+            response = requests.post(
+                f"{self.oauth_base_url}/oauth/token",
+                data={
+                    "grant_type": "urn:ietf:params:oauth:grant-type:jwt-bearer",
+                    "assertion": encoded_jwt
+                },
+                timeout=15,
+            )
+            response.raise_for_status()
+            token_data = response.json()
+
+            access_token = token_data.get("access_token")
+            if not access_token:
+                return self._still_valid_token()
+
+            self._cached = (access_token, time.monotonic() + int(token_data.get("expires_in", 3600)))
+            return access_token
+
+        except Exception as e:
+            # Keep serving the old token if it has not lapsed yet
+            print(f"Error generating DocuSign access token: {e}")
+            return self._still_valid_token()
+
+    def _still_valid_token(self) -> str | None:
+        token, expires_at = self._cached
+        return token if time.monotonic() < expires_at else None
+
+    def _get_signing_key(self):
+        if self._signing_key is None:
+            self._signing_key = serialization.load_pem_private_key(
+                self.private_key.encode('utf-8'),
+                password=None,
+                backend=default_backend()
+            )
+        return self._signing_key
@@ -1,24 +1,64 @@
+import threading
 import requests
 from datetime import datetime as dt
 from cryptography.fernet import Fernet
 from app.core.config import settings
+from app.infrastructure.cache.location_metadata import LocationMetadataCache, location_metadata_cache
 from app.infrastructure.database.repository import ConnectionRepository
+from services.ghl_client import ghl_client
 
 class REICBAPI:
     """
     Handles all communication with the REICB (GoHighLevel) API,
     including authentication and token management.
     """
-    def __init__(self, connection_repo: ConnectionRepository):
+    def __init__(self, connection_repo: ConnectionRepository, metadata_cache: LocationMetadataCache | None = None):
         self.repo = connection_repo
+        self.metadata_cache = metadata_cache or location_metadata_cache
         self.base_url = settings.REICB_API_BASE_URL
         self.fernet = Fernet(settings.ENC_KEY.encode())
 
+        # location_id -> (decrypted access token, expiry epoch seconds)
+        self._tokens: dict[str, tuple[str, int]] = {}
+        self._token_locks: dict[str, threading.Lock] = {}
+        self._token_locks_guard = threading.Lock()
+
     def _get_valid_access_token(self, location_id: str) -> str:
         """
         Retrieves the access token for a location, refreshing it if necessary.
         This internal method replaces the check_and_refresh_token decorator.
+
+        Decrypted tokens are cached in memory until they expire, so DynamoDB
+        and Fernet are only touched on a miss. A per-location lock makes sure
+        exactly one caller refreshes (and rotates the refresh token) at a time.
         """
+        token = self._cached_token(location_id)
+        if token:
+            return token
+
+        with self._token_lock(location_id):
+            # Another caller may have refreshed while we were waiting.
+            token = self._cached_token(location_id)
+            if token:
+                return token
+            return self._load_or_refresh_token(location_id)
+
+    def invalidate_token(self, location_id: str):
+        """Drops the cached token so the next call re-reads the connection."""
+        self._tokens.pop(location_id, None)
+
+    def _cached_token(self, location_id: str) -> str | None:
+        cached = self._tokens.get(location_id)
+        if cached and int(dt.now().timestamp()) < cached[1]:
+            return cached[0]
+        return None
+
+    def _token_lock(self, location_id: str) -> threading.Lock:
+        with self._token_locks_guard:
+            return self._token_locks.setdefault(location_id, threading.Lock())
+
+    def _load_or_refresh_token(self, location_id: str) -> str:
+        """Reads the connection from DynamoDB and refreshes it if expired. Call with the location lock held."""
         connection = self.repo.get_connection(location_id)
         if not connection:
             raise ConnectionError(f"No connection found for location ID: {location_id}")
@@ -26,7 +66,9 @@ class REICBAPI:
         current_time = int(dt.now().timestamp())
         if current_time < int(connection.expires):
             # Token is valid, decrypt and return it
-            return self.fernet.decrypt(connection.token.encode()).decode()
+            access_token = self.fernet.decrypt(connection.token.encode()).decode()
+            self._tokens[location_id] = (access_token, int(connection.expires))
+            return access_token
 
         # Token has expired, refresh it
         print(f"Token expired for location {location_id}. Refreshing...")
@@ -52,6 +94,7 @@ class REICBAPI:
             connection.token = self.fernet.encrypt(token_data["access_token"].encode()).decode()
             connection.refresh = self.fernet.encrypt(token_data["refresh_token"].encode()).decode()
             self.repo.save_connection(connection)
+            self._tokens[location_id] = (token_data["access_token"], int(connection.expires))
 
             print(f"Successfully refreshed token for location {location_id}.")
             return token_data["access_token"]
@@ -62,23 +105,23 @@ class REICBAPI:
             raise ConnectionError(f"Failed to refresh token. Please re-link your account. Details: {error_details}")
 
     def _make_request(self, method: str, endpoint: str, location_id: str, **kwargs) -> dict:
-        """A helper method to execute authenticated requests."""
+        """
+        A helper method to execute authenticated requests. Goes through the
+        shared GHL client, so it is paced by the location's rate limiter and
+        retried like every other GHL call.
+        """
         access_token = self._get_valid_access_token(location_id)
-        headers = {
-            "Authorization": f"Bearer {access_token}",
-            "Version": "2021-07-28",
-            "Accept": "application/json"
-        }
-        if 'headers' in kwargs:
-            headers.update(kwargs.pop('headers'))
-        
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
-        
+        kwargs.setdefault("timeout", 15)
+
         try:
-            response = requests.request(method, url, headers=headers, timeout=15, **kwargs)
+            response = ghl_client.request(method, url, access_token, location_id, **kwargs)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.HTTPError as e:
+            if e.response.status_code == 401:
+                # The token may have been rotated elsewhere; re-read it next time
+                self.invalidate_token(location_id)
             print(f"HTTP Error for {method} {url}: {e}")
             raise ConnectionError(f"API request failed: {e.response.status_code} - {e.response.text}")
         except requests.exceptions.RequestException as e:
@@ -90,18 +133,27 @@ class REICBAPI:
         response_data = self._make_request("GET", f"contacts/{contact_id}", location_id)
         return response_data.get('contact', {})
 
-    def get_contact_details(self, contact: dict, location_id: str) -> dict:
+    def get_custom_field_map(self, location_id: str) -> dict:
+        """
+        Returns the location's custom field definitions as an id -> name map,
+        served from the shared location metadata cache.
+        """
+        def load():
+            custom_fields_data = self._make_request("GET", f"locations/{location_id}/customFields", location_id)
+            return custom_fields_data.get("customFields", [])
+
+        return self.metadata_cache.get(location_id, load).id_to_name
+
+    def get_contact_details(self, contact: dict, location_id: str, id_to_name_map: dict | None = None) -> dict:
         """
         Takes a contact object and returns a dictionary of its custom fields
         with human-readable names instead of IDs.
+
+        `id_to_name_map` can be passed in when the caller already holds the
+        location's custom field definitions (e.g. across a batch).
         """
-        custom_fields_data = self._make_request("GET", f"locations/{location_id}/customFields", location_id)
-        
-        id_to_name_map = {
-            field['id']: field['name']
-            for field in custom_fields_data.get("customFields", [])
-            if 'id' in field and 'name' in field
-        }
+        if id_to_name_map is None:
+            id_to_name_map = self.get_custom_field_map(location_id)
 
         # Use the provided 'replace_ids_with_names' logic
         processed_fields = {}
@@ -111,4 +163,4 @@ class REICBAPI:
                 field_name = id_to_name_map[field_id]
                 processed_fields[field_name] = field.get('value')
 
-        return processed_fields
\ No newline at end of file
+        return processed_fields
@@ -0,0 +1,114 @@
+"""
+Memory/time benchmark: streamed lead ingestion vs. the DataFrame + iterrows() path
+`create_contact_from_csv` used to take.
+
+For each size a leads file and a members file are generated, then each reader
+runs in a fresh subprocess so its peak RSS (ru_maxrss, measured after imports)
+is not polluted by the other one.
+
+    python -m benchmarks.bench_csv_ingest                  # 100k and 1M rows
+    python -m benchmarks.bench_csv_ingest --rows 100000 --skip-baseline
+"""
+import argparse
+import csv
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+
+LEAD_HEADER = ["First", "Last", "Email", "Phone", "Address", "City", "State", "Zip", "Map", "Country", "Tag"]
+
+
+def write_files(directory: str, rows: int) -> tuple[str, str]:
+    leads_path = os.path.join(directory, f"leads_{rows}.csv")
+    members_path = os.path.join(directory, f"members_{rows}.csv")
+    with open(leads_path, "w", newline="") as leads, open(members_path, "w", newline="") as members:
+        leads_writer, members_writer = csv.writer(leads), csv.writer(members)
+        leads_writer.writerow(LEAD_HEADER)
+        members_writer.writerow(["Contact Id", "First Name", "Email", "Phone", "Tags"])
+        for r in range(rows):
+            phone = f"(512) 555-{r % 10000:04d}" if r % 7 else ""
+            leads_writer.writerow([
+                f"First{r}", f"Last{r}", f"lead{r}@example.com" if r % 5 else "", phone,
+                f"{r} Main St", "Austin", "TX", f"{78700 + r % 100}", f"{r} Main St, Austin, TX", "US", "Load Test",
+            ])
+            members_writer.writerow([f"c{r}", f"First{r}", f"lead{r * 2}@example.com", f"1512555{r % 10000:04d}", "member"])
+    return leads_path, members_path
+
+
+def dataframe_ingest(leads_path: str, members_path: str) -> int:
+    import pandas as pd
+    from services.lead_csv import normalize_phone
+
+    members_df = pd.read_csv(members_path, index_col=False)
+    leads_df = pd.read_csv(leads_path, index_col=False)
+    email_to_id, phone_to_id = {}, {}
+    for _, row in members_df.iterrows():
+        email_val = row.get("Email")
+        phone_val = normalize_phone(row.get("Phone"))
+        if pd.notna(email_val) and email_val:
+            email_to_id[email_val.strip().lower()] = row.get("Contact Id")
+        if phone_val:
+            phone_to_id[phone_val] = row.get("Contact Id")
+    count = 0
+    for _, row in leads_df.iterrows():
+        row = row.where(pd.notna(row), None)
+        row.to_dict()
+        count += 1
+    return count
+
+
+def streaming_ingest(leads_path: str, members_path: str) -> int:
+    from services.lead_csv import build_member_index, iter_csv_rows
+
+    with open(members_path, "rb") as members:
+        build_member_index(members)
+    count = 0
+    with open(leads_path, "rb") as leads:
+        for _ in iter_csv_rows(leads):
+            count += 1
+    return count
+
+
+def _measure(name: str, leads_path: str, members_path: str, queue):
+    import pandas  # noqa: F401 - count the import in the baseline, not in the reader
+    import services.lead_csv  # noqa: F401
+
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    rows = {"dataframe": dataframe_ingest, "streaming": streaming_ingest}[name](leads_path, members_path)
+    elapsed = time.perf_counter() - started
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((rows, elapsed, (peak - before) / 1024))
+
+
+def run(name: str, leads_path: str, members_path: str) -> tuple[int, float, float]:
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    process = ctx.Process(target=_measure, args=(name, leads_path, members_path, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", default="100000,1000000", help="comma-separated row counts")
+    parser.add_argument("--skip-baseline", action="store_true", help="only run the streaming reader")
+    args = parser.parse_args()
+
+    readers = ["streaming"] if args.skip_baseline else ["dataframe", "streaming"]
+    print(f"{'rows':>9}  {'reader':<10}{'seconds':>9}{'peak MB':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in (int(value) for value in args.rows.split(",")):
+            leads_path, members_path = write_files(directory, rows)
+            for name in readers:
+                count, elapsed, peak_mb = run(name, leads_path, members_path)
+                assert count == rows
+                print(f"{rows:>9}  {name:<10}{elapsed:>9.2f}{peak_mb:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
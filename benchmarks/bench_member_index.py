@@ -0,0 +1,92 @@
+"""
+Microbenchmark: vectorized member-index build vs. the per-row iterrows() loop.
+
+`normalize_phone_series` is checked against the scalar `normalize_phone` on a
+set of edge cases and on the generated export, and `build_member_index` is
+checked against the original loop before anything is timed.
+
+    python -m benchmarks.bench_member_index [--rows 200000]
+"""
+import argparse
+import io
+import random
+import time
+
+import numpy as np
+import pandas as pd
+
+from services.lead_csv import build_member_index, normalize_phone, normalize_phone_series
+
+EDGE_CASES = [
+    None, np.nan, pd.NA, 5125550100, 15125550100.0, "", "   ", "5125550100", " (512) 555-0100 ",
+    "+1 512-555-0100", "1-512-555-0100", "2512555010", "25125550100", "512555010", "512-555-01000",
+    "15125550100x12", "phone: 512.555.0100", "٥١٢٥٥٥٠١٠٠",
+    "1 (800) FLOWERS", "null", "x" * 40 + "5125550100", "call 512 555 0100 or 512 555 0199",
+]
+
+
+def baseline_index(members_df: pd.DataFrame) -> tuple[dict, dict]:
+    email_to_id, phone_to_id = {}, {}
+    for _, row in members_df.iterrows():
+        email_val = row.get("Email")
+        phone_val = normalize_phone(row.get("Phone"))
+        contact_id = row.get("Contact Id")
+        contact_id = None if pd.isna(contact_id) else contact_id
+        if pd.notna(email_val) and email_val:
+            email_to_id[email_val.strip().lower()] = contact_id
+        if pd.notna(phone_val) and phone_val:
+            phone_to_id[phone_val] = contact_id
+    return email_to_id, phone_to_id
+
+
+def member_export(rows: int) -> bytes:
+    rng = random.Random(7)
+    formats = ["({a}) {b}-{c}", "{a}-{b}-{c}", "+1 {a} {b} {c}", "1{a}{b}{c}", "{a}{b}{c}", "{a}-{b}", ""]
+    lines = ["Contact Id,First Name,Email,Phone,Tags"]
+    for r in range(rows):
+        phone = rng.choice(formats).format(a=rng.randint(200, 999), b=rng.randint(200, 999), c=f"{rng.randint(0, 9999):04d}")
+        email = f" Member{rng.randint(0, rows)}@Example.com" if r % 9 else ""
+        contact_id = f"c{r}" if r % 97 else ""
+        lines.append(f'{contact_id},First{r},{email},"{phone}",member')
+    return ("\n".join(lines) + "\n").encode()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    edge = pd.Series(EDGE_CASES, dtype=object)
+    assert normalize_phone_series(edge).tolist() == [normalize_phone(value) for value in EDGE_CASES]
+
+    export = member_export(args.rows)
+    members_df = pd.read_csv(io.BytesIO(export), index_col=False, dtype=str)
+    phones = members_df["Phone"]
+    assert normalize_phone_series(phones).tolist() == [normalize_phone(value) for value in phones]
+
+    started = time.perf_counter()
+    expected = baseline_index(pd.read_csv(io.BytesIO(export), index_col=False, dtype=str))
+    baseline_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    actual = build_member_index(io.BytesIO(export))
+    vectorized_seconds = time.perf_counter() - started
+    assert actual == expected
+
+    started = time.perf_counter()
+    [normalize_phone(value) for value in phones]
+    scalar_phone_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    normalize_phone_series(phones)
+    vector_phone_seconds = time.perf_counter() - started
+
+    print(f"{args.rows} members, {len(expected[0])} emails, {len(expected[1])} phones indexed")
+    print(f"{'step':<26}{'baseline s':>12}{'vectorized s':>14}{'speedup':>9}")
+    print(f"{'normalize phones':<26}{scalar_phone_seconds:>12.3f}{vector_phone_seconds:>14.3f}"
+          f"{scalar_phone_seconds / vector_phone_seconds:>8.1f}x")
+    print(f"{'read + build both indexes':<26}{baseline_seconds:>12.3f}{vectorized_seconds:>14.3f}"
+          f"{baseline_seconds / vectorized_seconds:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
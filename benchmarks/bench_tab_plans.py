@@ -0,0 +1,139 @@
+"""
+Microbenchmark: compiled tab plans vs. the per-request tab building they replaced.
+
+The baseline re-creates the company and tab-mapping dictionaries on every call
+and picks each tab's value through the original if/elif chain of label
+comparisons, as `DocuSignAPI.create_and_send_envelope` and `main.sendEnvelope`
+used to. Both builders are checked for identical output before timing.
+
+    python -m benchmarks.bench_tab_plans
+"""
+import timeit
+from types import SimpleNamespace
+
+from app.domain.services.tab_plans import (
+    TEMPLATE_TAB_MAPPINGS,
+    TITLE_COMPANIES,
+    build_legacy_tabs,
+    build_tabs,
+    get_tab_plan,
+)
+
+SPECIAL_CASES = (
+    ("Text 4c7b42bd-90e8-4b1f-8ad2-d47343493296", "cashToSeller"),
+    ("Text 8829e6fd-2cb7-425a-bfcd-4026dd2a3407", "sellerCarry"),
+    ("Text 75e6f183-4111-4131-aacb-8c951466ede8", "solarLien"),
+    ("Text 71be9608-14e4-4202-9641-6535ec2c0ccf", "agentComission"),
+    ("Text b231eabb-0627-45a6-aa26-b21f1fca082e", "Arrears"),
+    ("Text 72492c39-9afa-4008-bd82-75ff96a393c1", "Debt"),
+    ("Text 6d5b60db-784f-4a81-82fb-c483fe6485de", "solarLien"),
+)
+
+
+def _rebuild_literals():
+    # Stand-in for evaluating the dict literals inside the request handler
+    companys = {name: list(info) for name, info in TITLE_COMPANIES.items()}
+    mappings = {
+        template: {tab_type: {field: list(labels) for field, labels in fields.items()}
+                   for tab_type, fields in tab_mappings.items()}
+        for template, tab_mappings in TEMPLATE_TAB_MAPPINGS.items()
+    }
+    return companys, mappings
+
+
+def baseline_tabs(envelope_data, template_name):
+    _, mappings = _rebuild_literals()
+    tab_mappings = mappings[template_name]
+    tabs = {"textTabs": [], "fullNameTabs": []}
+    for tab_type, fields in tab_mappings.items():
+        for field_name, tab_ids in fields.items():
+            field_value = getattr(envelope_data, field_name, "")
+            for tab_id in tab_ids:
+                if tab_id == SPECIAL_CASES[0][0] and field_name == SPECIAL_CASES[0][1]:
+                    field_value = f'•{envelope_data.CashToSeller} Cash to the sellers at COE.'
+                elif tab_id == SPECIAL_CASES[1][0] and field_name == SPECIAL_CASES[1][1]:
+                    field_value = f'•${envelope_data.sellerCarry} Seller carry to be paid to the sellers in 48 equal payments of $166.67 per month.'
+                elif tab_id == SPECIAL_CASES[2][0] and field_name == SPECIAL_CASES[2][1]:
+                    field_value = f'•${envelope_data.solarLien}  Solar lien to be taken over subject to the existing loan.'
+                elif tab_id == SPECIAL_CASES[3][0] and field_name == SPECIAL_CASES[3][1]:
+                    field_value = f'•${envelope_data.agentComission}  Listing agent commission paid by buyer at COE.'
+                elif tab_id == SPECIAL_CASES[4][0] and field_name == SPECIAL_CASES[4][1]:
+                    field_value = f'•${envelope_data.Arrears} In seller arrears to be paid by buyer at COE.'
+                elif tab_id == SPECIAL_CASES[5][0] and field_name == SPECIAL_CASES[5][1]:
+                    field_value = f'existing loan of ${envelope_data.Debt}'
+                elif tab_id == SPECIAL_CASES[6][0] and field_name == SPECIAL_CASES[6][1]:
+                    field_value = f"Solar lien of ${envelope_data.solarLien}"
+                tabs[tab_type].append({"tabLabel": tab_id, "value": field_value})
+    return tabs
+
+
+def baseline_legacy_tabs(envelope_data, template_name):
+    _, mappings = _rebuild_literals()
+    lableNames = mappings[template_name]
+    tabs = {}
+    for tab in lableNames.keys():
+        for field in lableNames[tab].keys():
+            if getattr(envelope_data, field, None) != None:
+                for tabLabel in lableNames[tab][field]:
+                    if tab not in tabs:
+                        tabs[tab] = []
+                    value = getattr(envelope_data, field, "")
+                    if tabLabel == SPECIAL_CASES[0][0] and field == SPECIAL_CASES[0][1]:
+                        value = f'•${envelope_data.cashToSeller} Cash to the sellers at COE.'
+                    elif tabLabel == SPECIAL_CASES[1][0] and field == SPECIAL_CASES[1][1]:
+                        value = f'•${envelope_data.sellerCarry} Seller carry to be paid to the sellers in 48 equal payments of $166.67 per month.'
+                    elif tabLabel == SPECIAL_CASES[2][0] and field == SPECIAL_CASES[2][1]:
+                        value = f'•${envelope_data.solarLien}  Solar lien to be taken over subject to the existing loan.'
+                    elif tabLabel == SPECIAL_CASES[3][0] and field == SPECIAL_CASES[3][1]:
+                        value = f'•${envelope_data.agentComission}  Listing agent commission paid by buyer at COE.'
+                    elif tabLabel == SPECIAL_CASES[4][0] and field == SPECIAL_CASES[4][1]:
+                        value = f'•${envelope_data.Arrears} In seller arrears to be paid by buyer at COE.'
+                    elif tabLabel == SPECIAL_CASES[5][0] and field == SPECIAL_CASES[5][1]:
+                        value = f'existing loan of ${envelope_data.Debt}'
+                    elif tabLabel == SPECIAL_CASES[6][0] and field == SPECIAL_CASES[6][1]:
+                        value = f"Solar lien of ${envelope_data.solarLien}"
+                    tabs[tab].append({
+                        "tabLabel": tabLabel,
+                        "value": value if value != "null" and value != "null null" else ""
+                    })
+    return tabs
+
+
+def sample_envelope(**overrides):
+    fields = dict(
+        FullName="Jane Agent", ClientEmail="jane@example.com", propertyAddress="1 Main St",
+        Address="1 Main St", Seller1="John Doe", Seller2="null null", Day="May 01,", Year="25",
+        Apn="123-456", LegalDescription="LOT 1 BLK 2", Debt="150,000", Phone="555-555-5555",
+        Broker="Acme Realty", sellerCarry="10,000", agentComission="9,000", purchasePrice="300,000",
+        solarLien="12,000", cashToSeller="5,000", CashToSeller="$5,000", Arrears="2,000",
+        CompanyName="", CompanyTitle="Hudly Title", CompanyEmail="escrow@hudlytitle.com",
+        CompanyAddress="801 Barton Springs Road Austin, TX 7870", CompanyTelephone="(512) 400-4210",
+    )
+    fields.update(overrides)
+    return SimpleNamespace(**fields)
+
+
+def main(number: int = 20000):
+    envelope = sample_envelope()
+    legacy_envelope = sample_envelope(Arrears=None, solarLien=None)
+
+    for template_name in TEMPLATE_TAB_MAPPINGS:
+        assert baseline_tabs(envelope, template_name) == build_tabs(get_tab_plan(template_name), envelope)
+        assert baseline_legacy_tabs(legacy_envelope, template_name) == build_legacy_tabs(
+            get_tab_plan(template_name, legacy=True), legacy_envelope)
+
+    print(f"{'template':<46}{'baseline us':>13}{'plan us':>10}{'speedup':>9}")
+    for template_name in TEMPLATE_TAB_MAPPINGS:
+        plan = get_tab_plan(template_name)
+        before = timeit.timeit(lambda: baseline_tabs(envelope, template_name), number=number)
+        after = timeit.timeit(lambda: build_tabs(plan, envelope), number=number)
+        print(f"{template_name:<46}{before / number * 1e6:>13.2f}{after / number * 1e6:>10.2f}{before / after:>8.1f}x")
+
+        legacy_plan = get_tab_plan(template_name, legacy=True)
+        before = timeit.timeit(lambda: baseline_legacy_tabs(legacy_envelope, template_name), number=number)
+        after = timeit.timeit(lambda: build_legacy_tabs(legacy_plan, legacy_envelope), number=number)
+        print(f"{'  (legacy route)':<46}{before / number * 1e6:>13.2f}{after / number * 1e6:>10.2f}{before / after:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
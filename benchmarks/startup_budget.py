@@ -0,0 +1,116 @@
+"""
+Startup budget: how long `import main` takes, per module, and whether it fits.
+
+Runs `python -X importtime -c "import main"` in fresh subprocesses, reports
+the cumulative import time of the app's own modules and of the heaviest
+third-party packages, and fails (exit code 1) when the median total exceeds
+the budget or a module that should load lazily shows up at import time.
+With --lifespan it also enters the app's lifespan and prints the timed
+startup steps (needs the app's environment: .env, reachable data dir).
+
+    python -m benchmarks.startup_budget
+    python -m benchmarks.startup_budget --budget-ms 1500 --runs 5 --lifespan
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+# Median wall time allowed for `import main`
+DEFAULT_BUDGET_MS = 2500
+# Loaded on first use only; importing main must not pull them in
+LAZY_MODULES = ("pandas", "numpy", "boto3")
+FIRST_PARTY = ("main", "crm_lead_upload", "craimer_countystream", "models", "routers", "services", "app")
+
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+LIFESPAN_PROBE = """
+import asyncio, json, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+async def run():
+    async with main.app.router.lifespan_context(main.app):
+        return dict(getattr(main.app.state, "startup_timings", {}))
+steps = asyncio.run(run())
+print(json.dumps({"import_ms": (imported - started) * 1000, "steps": steps}))
+"""
+
+
+def profile_import(module: str) -> tuple[float, dict[str, int], set[str]]:
+    """Returns (wall ms, module -> cumulative us, every imported module) for one cold import."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import time; s = time.perf_counter(); import {module}; "
+                                                   "print((time.perf_counter() - s) * 1000)"],
+        capture_output=True, text=True, env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    if completed.returncode != 0:
+        errors = "\n".join(line for line in completed.stderr.splitlines() if not LINE.match(line))
+        raise SystemExit(f"import {module} failed:\n{errors[-2000:]}")
+    cumulative, imported = {}, set()
+    for line in completed.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            name = match.group(4)
+            imported.add(name)
+            cumulative[name] = int(match.group(2))
+    return float(completed.stdout.strip().splitlines()[-1]), cumulative, imported
+
+
+def is_first_party(name: str) -> bool:
+    return name.split(".")[0] in FIRST_PARTY
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--lifespan", action="store_true", help="also time the lifespan startup steps")
+    args = parser.parse_args()
+
+    runs = [profile_import(args.module) for _ in range(max(1, args.runs))]
+    totals = [wall for wall, _, _ in runs]
+    median_ms = statistics.median(totals)
+    # Per-module numbers from the run closest to the median
+    _, cumulative, imported = min(runs, key=lambda run: abs(run[0] - median_ms))
+
+    first_party = sorted(((name, us) for name, us in cumulative.items() if is_first_party(name)),
+                         key=lambda item: -item[1])
+    third_party = sorted(((name, us) for name, us in cumulative.items()
+                          if not is_first_party(name) and "." not in name), key=lambda item: -item[1])
+
+    print(f"import {args.module}: median {median_ms:.0f} ms over {len(totals)} runs "
+          f"({', '.join(f'{t:.0f}' for t in totals)}), budget {args.budget_ms:.0f} ms")
+    for title, rows in (("first-party modules", first_party), ("third-party packages", third_party)):
+        print(f"\n{title:<40}{'cumulative ms':>14}")
+        for name, us in rows[:args.top]:
+            print(f"{name:<40}{us / 1000:>14.1f}")
+
+    if args.lifespan:
+        completed = subprocess.run([sys.executable, "-c", LIFESPAN_PROBE], capture_output=True, text=True)
+        if completed.returncode != 0:
+            raise SystemExit(f"lifespan probe failed:\n{completed.stderr[-2000:]}")
+        probe = json.loads(completed.stdout.strip().splitlines()[-1])
+        print(f"\nlifespan startup steps (import {probe['import_ms']:.0f} ms)")
+        for step, ms in probe["steps"].items():
+            print(f"{step:<40}{ms:>14.1f}")
+
+    failures = []
+    if median_ms > args.budget_ms:
+        failures.append(f"import {args.module} took {median_ms:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    eager = [name for name in LAZY_MODULES if name in imported]
+    if eager:
+        failures.append(f"imported at startup but expected lazily: {', '.join(eager)}")
+    if failures:
+        print("\nOVER BUDGET: " + "; ".join(failures))
+        sys.exit(1)
+    print("\nwithin budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,16 @@
 # main.py
 from fastapi import APIRouter, FastAPI, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from models import TenantDataRecord
+import asyncio
+import base64
+import csv
+import io
 import httpx
+from concurrent.futures import ThreadPoolExecutor
+from services.webhook_outbox import webhook_outbox
 from dotenv import load_dotenv
 import re
 import json
@@ -17,28 +24,72 @@ router = APIRouter(
 )
 
 WEBHOOK_URL = os.environ.get("WEBHOOK_URL")
+# /data-ingest/bulk: records handed to one batch_save call (written 25 per request)
+# and the longest accepted NDJSON line
+CRAIMER_BULK_WRITE_BATCH = int(os.environ.get("CRAIMER_BULK_WRITE_BATCH", "200"))
+CRAIMER_BULK_MAX_LINE_BYTES = int(os.environ.get("CRAIMER_BULK_MAX_LINE_BYTES", str(1024 * 1024)))
+# Threads running the (synchronous) PynamoDB writes off the event loop
+CRAIMER_DYNAMODB_WORKERS = int(os.environ.get("CRAIMER_DYNAMODB_WORKERS", "16"))
+# Pooled webhook client (seconds / connection counts)
+CRAIMER_WEBHOOK_CONNECT_TIMEOUT = float(os.environ.get("CRAIMER_WEBHOOK_CONNECT_TIMEOUT", "5"))
+CRAIMER_WEBHOOK_READ_TIMEOUT = float(os.environ.get("CRAIMER_WEBHOOK_READ_TIMEOUT", "15"))
+CRAIMER_WEBHOOK_MAX_CONNECTIONS = int(os.environ.get("CRAIMER_WEBHOOK_MAX_CONNECTIONS", "50"))
+CRAIMER_WEBHOOK_MAX_KEEPALIVE = int(os.environ.get("CRAIMER_WEBHOOK_MAX_KEEPALIVE", "20"))
 
-@router.post("/data-ingest")
-async def ingest_data(request: Request):
-    body = await request.json()
+_dynamodb_executor = ThreadPoolExecutor(max_workers=CRAIMER_DYNAMODB_WORKERS, thread_name_prefix="craimer-dynamodb")
+_webhook_client: httpx.AsyncClient | None = None
 
-    tenant_id = body.pop("tenant_id", None)
-    if not tenant_id:
-        raise HTTPException(status_code=400, detail="Missing tenant_id")
 
-    timestamp = datetime.utcnow().replace(tzinfo=timezone.utc).isoformat()
+async def run_dynamodb(func, *args, **kwargs):
+    """Runs a blocking PynamoDB call on the dedicated DynamoDB threads."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_dynamodb_executor, lambda: func(*args, **kwargs))
 
-    # Save to DynamoDB as valid JSON
-    try:
-        TenantDataRecord.create_record(
-            tenant_id=tenant_id,
-            timestamp=timestamp,
-            data=body
+
+def get_webhook_client() -> httpx.AsyncClient:
+    """App-lifetime client for WEBHOOK_URL; keeps connections to it alive between requests."""
+    global _webhook_client
+    if _webhook_client is None or _webhook_client.is_closed:
+        _webhook_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(CRAIMER_WEBHOOK_READ_TIMEOUT, connect=CRAIMER_WEBHOOK_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=CRAIMER_WEBHOOK_MAX_CONNECTIONS,
+                max_keepalive_connections=CRAIMER_WEBHOOK_MAX_KEEPALIVE,
+            ),
         )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"DynamoDB Error: {str(e)}")
+    return _webhook_client
 
-    # Prepare webhook payload
+
+async def post_to_webhook(payload: dict | list[dict]):
+    """Sends one payload (or a batch) to WEBHOOK_URL; raises unless it was accepted."""
+    response = await get_webhook_client().post(WEBHOOK_URL, json=payload)
+    response.raise_for_status()
+
+
+async def close_clients():
+    """Closes the webhook client and lets queued DynamoDB writes finish (called on shutdown)."""
+    if _webhook_client is not None:
+        await _webhook_client.aclose()
+    _dynamodb_executor.shutdown(wait=True)
+
+_last_timestamp = None
+
+
+def next_timestamp() -> str:
+    """
+    Current UTC time as the record's range key, strictly increasing within
+    the process so records ingested in the same microsecond don't overwrite
+    each other.
+    """
+    global _last_timestamp
+    now = datetime.now(timezone.utc)
+    if _last_timestamp is not None and now <= _last_timestamp:
+        now = _last_timestamp + timedelta(microseconds=1)
+    _last_timestamp = now
+    return now.isoformat(timespec="microseconds")
+
+
+def build_webhook_payload(tenant_id: str, timestamp: str, body: dict) -> dict:
     webhook_payload = {
         "tenant_id": tenant_id,
         "timestamp": timestamp,
@@ -64,13 +115,294 @@ async def ingest_data(request: Request):
 
         # Remove the original phones array if you don't want it
         del webhook_payload["phones"]
+    return webhook_payload
+
+
+@router.post("/data-ingest")
+async def ingest_data(request: Request):
+    body = await request.json()
+
+    tenant_id = body.pop("tenant_id", None)
+    if not tenant_id:
+        raise HTTPException(status_code=400, detail="Missing tenant_id")
+
+    timestamp = next_timestamp()
+
+    # Save to DynamoDB as valid JSON
+    try:
+        await run_dynamodb(
+            TenantDataRecord.create_record,
+            tenant_id=tenant_id,
+            timestamp=timestamp,
+            data=body
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"DynamoDB Error: {str(e)}")
+
+    # Prepare webhook payload
+    webhook_payload = build_webhook_payload(tenant_id, timestamp, body)
 
-    # Send to webhook
-    async with httpx.AsyncClient() as client:
+    # Durable outbox; the background forwarder posts it to the webhook (with retries)
+    try:
+        outbox_ids = await webhook_outbox.put([webhook_payload])
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Outbox Error: {str(e)}")
+
+    return {"status": "success", "message": "Data saved and queued for forwarding.", "outbox_id": outbox_ids[0]}
+
+
+async def iter_ndjson_lines(request: Request):
+    """
+    Yields (line_number, raw line) from an NDJSON request body as it streams
+    in. A line longer than CRAIMER_BULK_MAX_LINE_BYTES is yielded as None;
+    its bytes are dropped instead of buffered and the following lines are
+    read as usual.
+    """
+    buffer = b""
+    line_number = 0
+    oversized = False
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            yield line_number, None if oversized or len(line) > CRAIMER_BULK_MAX_LINE_BYTES else line
+            oversized = False
+        if len(buffer) > CRAIMER_BULK_MAX_LINE_BYTES:
+            oversized = True
+            buffer = b""
+    if oversized:
+        yield line_number + 1, None
+    elif buffer.strip():
+        yield line_number + 1, buffer
+
+
+@router.get("/outbox")
+async def outbox_stats():
+    """Webhook outbox depth, lag and forwarder counters."""
+    return await asyncio.to_thread(webhook_outbox.stats)
+
+
+@router.post("/outbox/requeue-dead")
+async def requeue_dead_payloads():
+    return {"requeued": await asyncio.to_thread(webhook_outbox.requeue_dead)}
+
+
+@router.post("/data-ingest/bulk")
+async def ingest_data_bulk(request: Request, tenant_id: str | None = None, forward: bool = True):
+    """
+    Bulk version of /data-ingest: the body is newline-delimited JSON, one
+    record per line, parsed as it arrives. Each line may carry its own
+    `tenant_id`; otherwise the query parameter is used.
+
+    Records are written with DynamoDB batch writes (25 per request) while the
+    rest of the body is still being read; saved records are queued in the
+    webhook outbox. The response has one outcome per line; oversized lines
+    are reported as invalid.
+
+    If the body stops arriving partway (e.g. the client disconnects), every
+    line read so far is still written and reported, and `resume_from_line`
+    says where a retry should pick up so saved records are not sent twice.
+    """
+    results = []
+    pending = []
+    write_task = None
+    last_line = 0
+    stream_error = None
+
+    async def write(batch):
         try:
-            response = await client.post(WEBHOOK_URL, json=webhook_payload)
-            response.raise_for_status()
+            failures = await run_dynamodb(TenantDataRecord.batch_save, [record for _, record, _ in batch])
         except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Webhook Error: {str(e)}")
+            for outcome, _, _ in batch:
+                outcome.update(status="error", error=f"DynamoDB Error: {str(e)}")
+            return
+        for outcome, record, payload in batch:
+            error = failures.get((record.tenant_id, record.timestamp))
+            if error:
+                outcome.update(status="error", error=f"DynamoDB Error: {error}")
+                continue
+            outcome["status"] = "saved"
+        saved = [(outcome, payload) for outcome, _, payload in batch if outcome["status"] == "saved"]
+        if forward and saved:
+            try:
+                outbox_ids = await webhook_outbox.put([payload for _, payload in saved])
+            except Exception as e:
+                for outcome, _ in saved:
+                    outcome["error"] = f"Outbox Error: {str(e)}"
+            else:
+                for (outcome, _), outbox_id in zip(saved, outbox_ids):
+                    outcome.update(status="queued", outbox_id=outbox_id)
+
+    try:
+        async for line_number, line in iter_ndjson_lines(request):
+            last_line = line_number
+            if line is None:
+                results.append({"line": line_number, "status": "invalid",
+                                "error": f"Line exceeds {CRAIMER_BULK_MAX_LINE_BYTES} bytes"})
+                continue
+            if not line.strip():
+                continue
+            outcome = {"line": line_number}
+            results.append(outcome)
+            try:
+                body = json.loads(line)
+                if not isinstance(body, dict):
+                    raise ValueError("Each line must be a JSON object")
+                record_tenant = body.pop("tenant_id", None) or tenant_id
+                if not record_tenant:
+                    raise ValueError("Missing tenant_id")
+                timestamp = next_timestamp()
+                record = TenantDataRecord.build_record(tenant_id=record_tenant, timestamp=timestamp, data=body)
+                # Surfaces attribute type errors here, per record, instead of failing a whole batch
+                record.serialize()
+            except Exception as e:
+                outcome.update(status="invalid", error=str(e))
+                continue
+
+            outcome.update(tenant_id=record_tenant, timestamp=timestamp)
+            pending.append((outcome, record, build_webhook_payload(record_tenant, timestamp, body)))
+            if len(pending) >= CRAIMER_BULK_WRITE_BATCH:
+                # One write in flight while the next batch is parsed
+                if write_task is not None:
+                    await write_task
+                write_task = asyncio.create_task(write(pending))
+                pending = []
+    except Exception as e:
+        # The body broke off (write() does not raise): keep and report what was read.
+        # A cancelled request is not caught here; write_task is left running, so
+        # a batch already being saved is still queued for forwarding.
+        stream_error = str(e) or type(e).__name__
+        print(f"Bulk ingest stream stopped after line {last_line}: {stream_error}")
+
+    if write_task is not None:
+        await write_task
+    if pending:
+        await write(pending)
+
+    counts = {}
+    for outcome in results:
+        counts[outcome["status"]] = counts.get(outcome["status"], 0) + 1
+    expected = "queued" if forward else "saved"
+    response = {
+        "status": "success" if set(counts) <= {expected} and stream_error is None else "partial",
+        "received": len(results),
+        "counts": counts,
+        "results": results,
+    }
+    if stream_error is not None:
+        response.update(stream_error=stream_error, resume_from_line=last_line + 1)
+    return response
+
+
+# Largest page /tenants/{tenant_id}/records returns
+CRAIMER_RECORDS_MAX_LIMIT = int(os.environ.get("CRAIMER_RECORDS_MAX_LIMIT", "1000"))
+
+
+def encode_cursor(last_evaluated_key: dict | None) -> str | None:
+    if not last_evaluated_key:
+        return None
+    return base64.urlsafe_b64encode(json.dumps(last_evaluated_key).encode()).decode()
+
+
+def decode_cursor(cursor: str | None, tenant_id: str) -> dict | None:
+    if not cursor:
+        return None
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        cursor_tenant = key["tenant_id"]["S"]
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if cursor_tenant != tenant_id:
+        raise HTTPException(status_code=400, detail="Cursor belongs to a different tenant")
+    return key
+
+
+@router.get("/tenants/{tenant_id}/records")
+async def list_tenant_records(
+    tenant_id: str,
+    since: str | None = None,
+    until: str | None = None,
+    limit: int = 100,
+    cursor: str | None = None,
+    order: str = "asc",
+):
+    """
+    A page of the tenant's records, optionally limited to `since` <= timestamp
+    <= `until` (ISO-8601, compared as strings). Pass `next_cursor` back as
+    `cursor` for the following page; it is null on the last one.
+    """
+    if order not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="order must be 'asc' or 'desc'")
+    if not 1 <= limit <= CRAIMER_RECORDS_MAX_LIMIT:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {CRAIMER_RECORDS_MAX_LIMIT}")
+
+    try:
+        records, last_evaluated_key = await run_dynamodb(
+            TenantDataRecord.query_page,
+            tenant_id,
+            since=since,
+            until=until,
+            limit=limit,
+            last_evaluated_key=decode_cursor(cursor, tenant_id),
+            newest_first=order == "desc",
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"DynamoDB Error: {str(e)}")
+
+    return {
+        "tenant_id": tenant_id,
+        "count": len(records),
+        "records": [record.to_simple_dict() for record in records],
+        "next_cursor": encode_cursor(last_evaluated_key),
+    }
+
+
+def iter_export_ndjson(records):
+    for record in records:
+        yield json.dumps(record.to_simple_dict(), default=str) + "\n"
+
+
+def iter_export_csv(records):
+    """CSV with one column per top-level attribute; nested maps and lists are JSON-encoded."""
+    columns = list(TenantDataRecord.get_attributes())
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for record in records:
+        item = record.to_simple_dict()
+        writer.writerow([
+            json.dumps(value, default=str) if isinstance(value, (dict, list)) else value
+            for value in (item.get(column) for column in columns)
+        ])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+@router.get("/tenants/{tenant_id}/export")
+def export_tenant_records(
+    tenant_id: str,
+    format: str = "ndjson",
+    since: str | None = None,
+    until: str | None = None,
+):
+    """
+    Streams every matching record as NDJSON or CSV. Rows are written as
+    DynamoDB pages arrive (the sync generator runs in the threadpool), so
+    memory stays flat however many records the tenant has.
+    """
+    if format not in ("ndjson", "csv"):
+        raise HTTPException(status_code=400, detail="format must be 'ndjson' or 'csv'")
 
-    return {"status": "success", "message": "Data saved and forwarded."}
\ No newline at end of file
+    records = TenantDataRecord.query_by_tenant(tenant_id, since=since, until=until)
+    filename = re.sub(r"[^A-Za-z0-9_.-]", "_", tenant_id) + f"-records.{format}"
+    if format == "csv":
+        body, media_type = iter_export_csv(records), "text/csv"
+    else:
+        body, media_type = iter_export_ndjson(records), "application/x-ndjson"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
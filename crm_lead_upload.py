@@ -1,20 +1,33 @@
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form,Request
 
 from pydantic import BaseModel,Field,HttpUrl
-import pandas as pd
 import requests
+import asyncio
 import json
-import re
+from collections import deque
+from itertools import islice
 from typing import List, Optional
 import os
 import requests
 from services.token_service import get_valid_token
 from routers.update_phones import update_phones_in_ghl
+from services.ghl_client import ghl_client
+from services.lead_csv import build_member_index, iter_csv_rows, normalize_phone
+from services.upload_jobs import upload_jobs
+from services.import_checkpoints import import_checkpoints, import_key
+from services.contact_index import contact_index
+from app.infrastructure.cache.location_metadata import LocationMetadata, location_metadata_cache
+from app.infrastructure.cache.duplicate_lookup import duplicate_lookup_cache
+from app.core.config import settings
 from fastapi import status, HTTPException
 import logging
 logger = logging.getLogger(__name__)
 import json
 AUTH_URL = os.getenv("AUTH_URL")
+# Rows of /crm/upload-contact processed concurrently (each in a worker thread)
+CRM_UPLOAD_CONCURRENCY = int(os.getenv("CRM_UPLOAD_CONCURRENCY", "8"))
+# Lead rows read from the CSV per worker-thread hop
+CRM_UPLOAD_READ_CHUNK = int(os.getenv("CRM_UPLOAD_READ_CHUNK", "500"))
 
 router = APIRouter(prefix='/crm')
 
@@ -68,27 +81,37 @@ def extract_message_from_error(error):
         return error.get("message", str(error))
     return str(error)
 
+def identity_keys(email: str = None, phone: str = None) -> tuple[str | None, str | None]:
+    """Normalized (email, phone) used to key the contact index and duplicate cache."""
+    email_key = email.strip().lower() if email and email.strip() else None
+    phone_key = (normalize_phone(phone) or phone.strip() or None) if isinstance(phone, str) else None
+    return email_key, phone_key
+
 def check_duplicates(token: str, location_id: str, email: str = None, phone: str = None) -> dict | None:
     if not token:
         raise HTTPException(status_code=400, detail="No access token provided.")
 
-    url = "https://services.leadconnectorhq.com/contacts/search/duplicate"
+    # Recent answers (including "no duplicate") are reused for a short time
+    email_key, phone_key = identity_keys(email, phone)
+    cached, contact = duplicate_lookup_cache.get(location_id, email_key, phone_key)
+    if cached:
+        return contact
+
     params = {
         "locationId": location_id,
         "email": email,
         "number": phone
     }
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Version": "2021-07-28"
-    }
 
     try:
-        response = requests.get(url, params=params, headers=headers)
+        response = ghl_client.get("contacts/search/duplicate", token, location_id, params=params)
         if response.status_code == 200:
-            return response.json().get("contact")
+            contact = response.json().get("contact")
+            duplicate_lookup_cache.put(location_id, email_key, phone_key, contact)
+            return contact
         elif response.status_code == 404:
             # 404 means no duplicate found — return None
+            duplicate_lookup_cache.put(location_id, email_key, phone_key, None)
             return None
         else:
             raise HTTPException(
@@ -100,16 +123,33 @@ def check_duplicates(token: str, location_id: str, email: str = None, phone: str
             status_code=400,
             detail=f"Error checking duplicates: {str(e)}"
         )
+
+async def check_duplicates_batch(
+    token: str, location_id: str, lookups: list[tuple[str | None, str | None]], concurrency: int | None = None
+) -> list[dict]:
+    """
+    Resolves many (email, phone) pairs at once. Identical pairs are searched
+    once, cached answers are reused and at most `concurrency` searches run at
+    a time. Returns one {"contact": ...} or {"error": ...} per input pair.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency or settings.DUPLICATE_LOOKUP_CONCURRENCY))
+    unique = {identity_keys(email, phone): (email, phone) for email, phone in lookups}
+
+    async def resolve(email, phone):
+        async with semaphore:
+            try:
+                return {"contact": await asyncio.to_thread(check_duplicates, token, location_id, email, phone)}
+            except HTTPException as e:
+                return {"error": e.detail}
+
+    answers = dict(zip(unique, await asyncio.gather(*(resolve(*pair) for pair in unique.values()))))
+    return [answers[identity_keys(email, phone)] for email, phone in lookups]
     
-def create_contact(data, access_token):
-    url = "https://services.leadconnectorhq.com/contacts"
-    headers = {"Authorization": f"Bearer {access_token}", "Version": "2021-07-28"}
-    return requests.post(url, headers=headers, json=data).json()
-
-def update_contact(data, access_token, contact_id):
-    url = f"https://services.leadconnectorhq.com/contacts/{contact_id}"
-    headers = {"Authorization": f"Bearer {access_token}", "Version": "2021-07-28"}
-    return requests.put(url, headers=headers, json=data).json()
+def create_contact(data, access_token, location_id=None):
+    return ghl_client.post("contacts", access_token, location_id, json=data).json()
+
+def update_contact(data, access_token, contact_id, location_id=None):
+    return ghl_client.put(f"contacts/{contact_id}", access_token, location_id, json=data).json()
 def get_label_from_type(phone_type: str) -> str:
     if phone_type is None:
         return "Mobile"
@@ -123,7 +163,8 @@ def get_label_from_type(phone_type: str) -> str:
     elif pt in ["landline", "voip"]:
         return "Landline"
     return "Mobile"  # fallback default
-def update_contacts(token: str, contact_id: str, contact_data: dict,phone_lists:list=[]) -> tuple[dict | None, str | None]:
+def update_contacts(token: str, contact_id: str, contact_data: dict,phone_lists:list=[],
+                    location_id: str | None = None) -> tuple[dict | None, str | None]:
     if not token:
         raise HTTPException(status_code=400, detail="No access token provided.")
     phone = contact_data.get("phone")
@@ -133,13 +174,7 @@ def update_contacts(token: str, contact_id: str, contact_data: dict,phone_lists:
     else:
         phone_lists.append({"phone":contact_data.get("phone"),"type":"wireless"})
        # 📥 Fetch existing contact data
-        existing_resp = requests.get(
-            f"https://services.leadconnectorhq.com/contacts/{contact_id}",
-            headers={
-                "Authorization": f"Bearer {token}",
-                "Version": "2021-07-28"
-            }
-        )
+        existing_resp = ghl_client.get(f"contacts/{contact_id}", token, location_id)
         existing = existing_resp.json()
 
         existing_phones = []
@@ -181,13 +216,6 @@ def update_contacts(token: str, contact_id: str, contact_data: dict,phone_lists:
             contact_data["additionalPhones"]= merged_phones if old_phone else merged_phones[1:]
 
     
-    url = f"https://services.leadconnectorhq.com/contacts/{contact_id}"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Version": "2021-07-28",
-        "Content-Type": "application/json"
-    }
-
     # Remove read-only fields that cause 422 errors
     read_only_fields = {
         'id', 'dateAdded', 'locationId', 'firstNameLowerCase', 
@@ -200,7 +228,7 @@ def update_contacts(token: str, contact_id: str, contact_data: dict,phone_lists:
     
     try:
         print("CONTACT DATA", clean_data)
-        response = requests.put(url, json=clean_data, headers=headers)
+        response = ghl_client.put(f"contacts/{contact_id}", token, location_id, json=clean_data)
         if response.status_code == 200:
             return response.json(), None
         else:
@@ -208,28 +236,88 @@ def update_contacts(token: str, contact_id: str, contact_data: dict,phone_lists:
             raise HTTPException(status_code=response.status_code, detail=error_msg)
     except requests.RequestException as e:
         raise HTTPException(status_code=400, detail=f"Error updating contact: {str(e)}")
-async def get_custom_fields(location_id: str, access_token: str):
-    if not access_token:
-        raise HTTPException(status_code=400, detail="No access token provided.")
-    url = f"https://services.leadconnectorhq.com/locations/{location_id}/customFields"
-    headers = {"Authorization": f"Bearer {access_token}", "Version": "2021-07-28"}
+def _fetch_custom_fields(location_id: str, access_token: str) -> list[dict]:
     try:
-        r = requests.get(url, headers=headers)
+        r = ghl_client.get(f"locations/{location_id}/customFields", access_token, location_id)
         r.raise_for_status()
-        return r.json()
+        return r.json().get("customFields", [])
     except requests.RequestException as e:
         raise HTTPException(status_code=400, detail=f"Error fetching custom fields: {str(e)}")
 
-def normalize_phone(phone: str) -> str:
-    if pd.isna(phone) or not isinstance(phone, str):
-        return ""
-    phone = phone.strip()
-    digits = re.sub(r'\D', '', phone)
-    if len(digits) == 11 and digits.startswith('1'):
-        digits = digits[1:]
-    if len(digits) == 10:
-        return f"{digits[0:3]}-{digits[3:6]}-{digits[6:10]}"
-    return ""
+async def get_custom_fields(location_id: str, access_token: str) -> LocationMetadata:
+    """Returns the location's custom field definitions from the shared cache."""
+    if not access_token:
+        raise HTTPException(status_code=400, detail="No access token provided.")
+    metadata = location_metadata_cache.peek(location_id)
+    if metadata is None:
+        metadata = await asyncio.to_thread(
+            location_metadata_cache.get, location_id, lambda: _fetch_custom_fields(location_id, access_token)
+        )
+    return metadata
+
+@router.delete("/custom-fields/cache")
+async def invalidate_custom_fields(locationId: Optional[str] = None):
+    """Drops cached custom field definitions for one location (or all of them)."""
+    location_metadata_cache.invalidate(locationId)
+    return {"status": "invalidated", "locationId": locationId}
+
+class DuplicateLookupItem(BaseModel):
+    email: Optional[str] = None
+    phone: Optional[str] = None
+
+class DuplicateLookupRequest(BaseModel):
+    location_id: str
+    lookups: List[DuplicateLookupItem]
+    concurrency: Optional[int] = None
+
+
+@router.post("/duplicates/lookup")
+async def lookup_duplicates(body: DuplicateLookupRequest):
+    """Batched GHL duplicate search; results are in the order of `lookups`."""
+    token = await asyncio.to_thread(get_valid_token, body.location_id)
+    pairs = [(item.email, item.phone) for item in body.lookups]
+    results = await check_duplicates_batch(token, body.location_id, pairs, body.concurrency)
+    return {
+        "location_id": body.location_id,
+        "results": [{"email": email, "phone": phone, **result} for (email, phone), result in zip(pairs, results)],
+        "cache": duplicate_lookup_cache.stats(),
+    }
+
+
+@router.delete("/duplicates/cache")
+async def invalidate_duplicate_cache(locationId: Optional[str] = None):
+    duplicate_lookup_cache.invalidate(locationId)
+    return {"invalidated": locationId or "all"}
+
+
+@router.get("/contact-index/{location_id}")
+async def contact_index_stats(location_id: str):
+    return await asyncio.to_thread(contact_index.stats, location_id)
+
+
+@router.delete("/contact-index/{location_id}")
+async def clear_contact_index(location_id: str, contactId: Optional[str] = None):
+    """Forgets one contact's entries, or the whole location's index."""
+    removed = await asyncio.to_thread(contact_index.forget, location_id, contactId)
+    return {"location_id": location_id, "removed": removed}
+
+
+@router.get("/ghl/pool-stats")
+async def ghl_pool_stats():
+    """Shared GHL session: request counters and connection pool utilization."""
+    return ghl_client.pool_stats()
+
+def new_result_data() -> dict:
+    return {
+        'new_leads': 0,
+        'existing_leads': 0,
+        'error': 0,
+        'total_': 0,
+        'already_imported': 0,
+        'skipped_rows': [],
+        'details': []
+    }
+
 # -----------------------------
 # Main Endpoint
 # -----------------------------
@@ -238,10 +326,24 @@ async def create_contact_from_csv(
     locationId: str,
     access_token: str = Form(...),
     map_data: str = Form(...),
-    members_file: UploadFile = File(...),
+    members_file: Optional[UploadFile] = File(None),
     new_members_file: UploadFile = File(...),
-    customeFields: str = Form(...)
+    customeFields: str = Form(...),
+    background: bool = False,
+    restart: bool = False
 ):
+    """
+    Imports a leads CSV into GHL. With `background=true` the files are
+    spooled to disk, a job id is returned immediately and progress is polled
+    through /crm/jobs/{job_id}.
+
+    Rows already imported from the same file for the same location are
+    skipped (reported as `already_imported`); `restart=true` forgets them
+    and processes every row again.
+
+    `members_file` is optional: rows are matched against the location's
+    local contact index, which a member export (when given) refreshes.
+    """
     # Parse mappings
     try:
         map_data = NameMap(**json.loads(map_data))
@@ -254,24 +356,68 @@ async def create_contact_from_csv(
     except json.JSONDecodeError:
         raise HTTPException(status_code=400, detail="Invalid JSON format for customFields")
 
-    members_df = pd.read_csv(members_file.file, index_col=False)
-    leads_df = pd.read_csv(new_members_file.file, index_col=False)
+    if not background:
+        return await import_contacts(
+            locationId, access_token, map_data, customeFields, members_file.file if members_file else None,
+            new_members_file.file, restart=restart
+        )
+
+    # Job mode: spool the uploads to disk and return right away
+    job = await asyncio.to_thread(
+        upload_jobs.create_job, locationId, members_file.file if members_file else None, new_members_file.file,
+        {"map_data": map_data.model_dump(), "customeFields": customeFields}
+    )
+    upload_jobs.start(job["id"], lambda members, leads, result_data: import_contacts(
+        locationId, access_token, map_data, customeFields, members, leads, result_data, restart=restart
+    ), new_result_data())
+    return {
+        "job_id": job["id"],
+        "status": job["status"],
+        "total_rows": job["total_rows"],
+        "status_url": f"/crm/jobs/{job['id']}",
+        "result_url": f"/crm/jobs/{job['id']}/result",
+    }
+
+
+async def import_contacts(
+    locationId: str,
+    access_token: str,
+    map_data: NameMap,
+    customeFields: list,
+    members_file,
+    leads_file,
+    result_data: dict | None = None,
+    restart: bool = False,
+) -> dict:
+    """
+    Imports the leads file into GHL, matching rows against the location's
+    contact index (refreshed from the member export when one is given).
 
-    # Build maps for email/phone -> contact ID
-    email_to_id, phone_to_id = {}, {}
-    for _, row in members_df.iterrows():
-        email_val = row.get("Email")
-        phone_val = normalize_phone(row.get("Phone"))
-        contact_id = row.get("Contact Id")
-        if pd.notna(email_val) and email_val:
-            email_to_id[email_val.strip().lower()] = contact_id
-        if pd.notna(phone_val) and phone_val:
-            phone_to_id[phone_val] = contact_id
+    `result_data` may be passed in so a caller (the background job runner)
+    can watch the counters while the import is running. Every finished row
+    is checkpointed under a hash of the location and file, so a re-run of
+    the same file skips it unless `restart` is set.
+    """
+    # Build maps for email/phone -> contact ID: a member export (chunked, only
+    # the needed columns) refreshes the local index, which is then loaded
+    if members_file is not None:
+        export_email_to_id, export_phone_to_id = await asyncio.to_thread(build_member_index, members_file)
+        await asyncio.to_thread(contact_index.add_many, locationId, export_email_to_id, export_phone_to_id)
+    email_to_id, phone_to_id = await asyncio.to_thread(contact_index.load, locationId)
+
+    # Rows finished by an earlier run of this file; contacts they created are matched again
+    checkpoint_key = await asyncio.to_thread(import_key, locationId, leads_file)
+    if restart:
+        await asyncio.to_thread(import_checkpoints.clear, checkpoint_key)
+    finished_rows, created_contacts = await asyncio.to_thread(import_checkpoints.load, checkpoint_key)
+    for email_key, phone_key, contact_id in created_contacts:
+        if email_key:
+            email_to_id[email_key] = contact_id
+        if phone_key:
+            phone_to_id[phone_key] = contact_id
 
     # Fetch custom fields
-    result = await get_custom_fields(locationId, access_token)
-    custom_fields = result.get("customFields", [])
-    custom_field_id_map = {f['name'].strip(): f["id"] for f in custom_fields}
+    custom_field_id_map = (await get_custom_fields(locationId, access_token)).name_to_id
 
     general_property_fields = {
         "Property Address": "PropertyAddress",
@@ -282,131 +428,182 @@ async def create_contact_from_csv(
     }
 
     # Tracking
-    result_data = {
-        'new_leads': 0,
-        'existing_leads': 0,
-        'error': 0,
-        'total_': 0,
-        'skipped_rows': [],
-        'details': []
-    }
+    if result_data is None:
+        result_data = new_result_data()
+    result_data.setdefault('already_imported', 0)
+
+    def skip(idx, reason, normalized_data):
+        result_data["error"] += 1
+        result_data["skipped_rows"].append({
+            "row_index": idx,
+            "reason": reason,
+            "row_data": normalized_data
+        })
+
+    def upsert_row(row, email, phone, contact_id):
+        """
+        Creates or updates the GHL contact for one row. Runs in a worker thread;
+        returns ("new", contact_id), ("existing", None), ("existing", contact_id)
+        when a create found a duplicate GHL knew about, or ("error", reason).
+        """
+        # Prepare custom fields
+        custom_field_values = [
+            {"id": custom_field_id_map[field], "value": row.get(field, "")}
+            for field in customeFields if field in custom_field_id_map
+        ]
+
+        if contact_id:
+            # Update existing lead
+            populated_fields = custom_field_values
+            update_data = {"customFields": populated_fields}
+            response = update_contact(update_data, access_token, contact_id, locationId)
+            if response.get("error"):
+                return "error", "API error on update"
+            return "existing", None
+
+        # Create new contact
+        new_custom_fields = []
+        for key, attr in general_property_fields.items():
+            val = row.get(getattr(map_data, attr))
+            if val is not None and key in custom_field_id_map:
+                new_custom_fields.append({"id": custom_field_id_map[key], "value": val})
+        new_custom_fields.extend(custom_field_values)
+
+        contact_payload = {
+            "firstName": row.get(map_data.firstName),
+            "lastName": row.get(map_data.lastName),
+            "fullName": row.get(map_data.fullName),
+            "email": email,
+            "phone": phone,
+            "country": row.get(map_data.Country),
+            "locationId": locationId,
+            "customFields": new_custom_fields,
+            "tags": [tag.strip() for tag in row.get(map_data.Tag).split(",")] if row.get(map_data.Tag) is not None else []
+        }
 
-    # Main loop
-    for idx, row in leads_df.iterrows():
+        response = create_contact(contact_payload, access_token, locationId)
+        if response.get("statusCode", 200) >= 400:
+            # Duplicate → update instead of counting as error
+            if (
+                response.get("message") == "This location does not allow duplicated contacts."
+                and "meta" in response
+                and "contactId" in response["meta"]
+            ):
+                duplicate_id = response["meta"]["contactId"]
+                update_payload = {"customFields": new_custom_fields}
+                update_response = update_contact(update_payload, access_token, duplicate_id, locationId)
+                if update_response.get("error"):
+                    return "error", "Duplicate found but update failed"
+                return "existing", duplicate_id
+
+            # Real error
+            return "error", f"API error on creation: {response}"
+
+        # New lead created
+        return "new", (response.get("contact") or {}).get("id")
+
+    # Rows that share an email or phone are serialized through per-key locks
+    # (taken in sorted order, FIFO per key), so a later row still sees the
+    # contact an earlier row created and updates it instead of creating a twin.
+    # Each key maps to [lock, rows holding or waiting for it]; the entry is
+    # dropped when that count reaches zero, so only keys in flight are kept.
+    key_locks: dict[str, list] = {}
+
+    async def acquire_key(key):
+        entry = key_locks.setdefault(key, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            await entry[0].acquire()
+        except BaseException:
+            release_key(key, locked=False)
+            raise
+
+    def release_key(key, locked=True):
+        entry = key_locks[key]
+        if locked:
+            entry[0].release()
+        entry[1] -= 1
+        if not entry[1]:
+            del key_locks[key]
+
+    async def process_row(idx, row):
         result_data['total_'] += 1
-        row = row.where(pd.notna(row), None)
+        if idx in finished_rows:
+            result_data['already_imported'] += 1
+            return
 
         email = row.get(map_data.email)
         phone = normalize_phone(row.get(map_data.phone))
         email_key = email.strip().lower() if email else None
         phone_key = phone if phone else None
 
-        normalized_data = row.to_dict()
+        normalized_data = row
 
         # Skip rows with no phone and no email
         if not email and not phone:
-            result_data["error"] += 1
-            result_data["skipped_rows"].append({
-                "row_index": idx,
-                "reason": "Missing both email and phone",
-                "row_data": normalized_data
-            })
-            continue
+            skip(idx, "Missing both email and phone", normalized_data)
+            return
 
+        lock_keys = sorted(key for key in (f"email:{email_key}" if email_key else None,
+                                           f"phone:{phone_key}" if phone_key else None) if key)
+        acquired = []
         try:
-            # Prepare custom fields
-            custom_field_values = [
-                {"id": custom_field_id_map[field], "value": row.get(field, "")}
-                for field in customeFields if field in custom_field_id_map
-            ]
+            for key in lock_keys:
+                await acquire_key(key)
+                acquired.append(key)
 
             # Match existing contact
             contact_id = email_to_id.get(email_key) if email_key else None
             if not contact_id and phone_key:
                 contact_id = phone_to_id.get(phone_key)
 
-            if not contact_id:
-                # Create new contact
-                new_custom_fields = []
-                for key, attr in general_property_fields.items():
-                    val = row.get(getattr(map_data, attr))
-                    if pd.notna(val) and key in custom_field_id_map:
-                        new_custom_fields.append({"id": custom_field_id_map[key], "value": val})
-                new_custom_fields.extend(custom_field_values)
-
-                contact_payload = {
-                    "firstName": row.get(map_data.firstName),
-                    "lastName": row.get(map_data.lastName),
-                    "fullName": row.get(map_data.fullName),
-                    "email": email,
-                    "phone": phone,
-                    "country": row.get(map_data.Country),
-                    "locationId": locationId,
-                    "customFields": new_custom_fields,
-                    "tags": [tag.strip() for tag in row.get(map_data.Tag).split(",")] if pd.notna(row.get(map_data.Tag)) else []
-                }
-
-                response = create_contact(contact_payload, access_token)
-                if response.get("statusCode", 200) >= 400:
-                    # Duplicate → update instead of counting as error
-                    if (
-                        response.get("message") == "This location does not allow duplicated contacts."
-                        and "meta" in response
-                        and "contactId" in response["meta"]
-                    ):
-                        duplicate_id = response["meta"]["contactId"]
-                        update_payload = {"customFields": new_custom_fields}
-                        update_response = update_contact(update_payload, access_token, duplicate_id)
-                        if update_response.get("error"):
-                            result_data["error"] += 1
-                            result_data["skipped_rows"].append({
-                                "row_index": idx,
-                                "reason": "Duplicate found but update failed",
-                                "row_data": normalized_data
-                            })
-                        else:
-                            result_data["existing_leads"] += 1
-                        continue
-
-                    # Real error
-                    result_data["error"] += 1
-                    result_data["skipped_rows"].append({
-                        "row_index": idx,
-                        "reason": f"API error on creation: {response}",
-                        "row_data": normalized_data
-                    })
-                    continue
-
-                # New lead created
-                result_data["new_leads"] += 1
-                contact_id = response.get("contactId")
+            outcome, value = await asyncio.to_thread(upsert_row, row, email, phone, contact_id)
+            if outcome in ("new", "existing") and value:
+                # A created contact, or the duplicate GHL pointed a create at:
+                # later rows and re-runs match it instead of creating again
                 if email_key:
-                    email_to_id[email_key] = contact_id
+                    email_to_id[email_key] = value
                 if phone_key:
-                    phone_to_id[phone_key] = contact_id
-
-            else:
-                # Update existing lead
-                populated_fields = custom_field_values
-                update_data = {"customFields": populated_fields}
-                response = update_contact(update_data, access_token, contact_id)
-                if response.get("error"):
-                    result_data["error"] += 1
-                    result_data["skipped_rows"].append({
-                        "row_index": idx,
-                        "reason": "API error on update",
-                        "row_data": normalized_data
-                    })
-                    continue
+                    phone_to_id[phone_key] = value
+                await asyncio.to_thread(contact_index.add, locationId, value, email_key, phone_key)
+                duplicate_lookup_cache.invalidate_identity(locationId, email_key, phone_key)
+            if outcome == "new":
+                result_data["new_leads"] += 1
+                await asyncio.to_thread(
+                    import_checkpoints.record, checkpoint_key, idx, outcome, value, email_key, phone_key
+                )
+            elif outcome == "existing":
                 result_data["existing_leads"] += 1
-
+                await asyncio.to_thread(import_checkpoints.record, checkpoint_key, idx, outcome)
+            else:
+                skip(idx, value, normalized_data)
         except Exception as e:
-            result_data["error"] += 1
-            result_data["skipped_rows"].append({
-                "row_index": idx,
-                "reason": f"Unhandled exception: {str(e)}",
-                "row_data": normalized_data
-            })
+            skip(idx, f"Unhandled exception: {str(e)}", normalized_data)
+        finally:
+            for key in reversed(acquired):
+                release_key(key)
+
+    # Workers share one row iterator, so rows are picked up in file order and
+    # the leads file is streamed instead of being loaded into a DataFrame.
+    # Rows are read in chunks in a worker thread, so file reads and CSV
+    # parsing don't block the event loop.
+    rows = iter_csv_rows(leads_file)
+    buffered_rows: deque = deque()
+    read_lock = asyncio.Lock()
+
+    async def next_row():
+        async with read_lock:
+            if not buffered_rows:
+                buffered_rows.extend(await asyncio.to_thread(list, islice(rows, CRM_UPLOAD_READ_CHUNK)))
+            return buffered_rows.popleft() if buffered_rows else None
+
+    async def worker():
+        while (item := await next_row()) is not None:
+            await process_row(*item)
+
+    await asyncio.gather(*(worker() for _ in range(max(1, CRM_UPLOAD_CONCURRENCY))))
+    result_data["skipped_rows"].sort(key=lambda skipped: skipped["row_index"])
+
     print("\nSkipped rows info:")
     for skipped in result_data["skipped_rows"]:
         print(f"Row {skipped['row_index']}: {skipped['reason']}")
@@ -416,6 +613,47 @@ async def create_contact_from_csv(
     return result_data
 
 
+@router.get("/jobs/{job_id}")
+async def get_upload_job(job_id: str):
+    """Live counters, rows/sec and ETA for a background upload."""
+    job = await asyncio.to_thread(upload_jobs.get_job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.post("/jobs/{job_id}/resume")
+async def resume_upload_job(job_id: str, access_token: str = Form(...)):
+    """
+    Re-runs a failed or interrupted background upload from its spooled files.
+    Rows that already finished are skipped through the import checkpoints.
+    """
+    job = await asyncio.to_thread(upload_jobs.get_job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if not upload_jobs.can_resume(job):
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']} and cannot be resumed")
+
+    options = job["options"]
+    map_data = NameMap(**options["map_data"])
+    job = await upload_jobs.resume(job_id, lambda members, leads, result_data: import_contacts(
+        job["location_id"], access_token, map_data, options["customeFields"], members, leads, result_data
+    ), new_result_data())
+    return {"job_id": job_id, "status": job["status"], "status_url": f"/crm/jobs/{job_id}"}
+
+
+@router.get("/jobs/{job_id}/result")
+async def get_upload_job_result(job_id: str):
+    """Final report of a background upload (same shape as the synchronous response)."""
+    job = await asyncio.to_thread(upload_jobs.get_job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    result = await asyncio.to_thread(upload_jobs.get_result, job_id)
+    if result is None:
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}; no result yet")
+    return {"job_id": job_id, "status": job["status"], "message": job["message"], "result": result}
+
+
 @router.post("/county-stream/upload-data")
 async def create_county_stream_contact(request: Request):
     try:
@@ -447,14 +685,19 @@ async def create_county_stream_contact(request: Request):
     auction_info = {k: body[k] for k in auction_info_keys if k in body}
 
     # Optional: convert auction_date to datetime
+    # GHL calls block (rate-limit pacing and retry backoff), so they run in worker threads
     try:
-        token = get_valid_token(location_id)
-        is_duplicate=  check_duplicates(token,location_id,email,phone_number)
+        token = await asyncio.to_thread(get_valid_token, location_id)
+        email_key, phone_key = identity_keys(email, phone_number)
+        # Local index first; GHL's duplicate search only when it has no match
+        indexed_id = await asyncio.to_thread(contact_index.lookup, location_id, email_key, phone_key)
+        if indexed_id:
+            is_duplicate = {"id": indexed_id}
+        else:
+            is_duplicate=  await asyncio.to_thread(check_duplicates, token, location_id, email, phone_number)
         print("DUPLICATE DATA",is_duplicate)
     
-        result = await get_custom_fields(location_id, token)
-        custom_fields = result.get("customFields", [])
-        custom_field_id_map = {f['name'].strip(): f["id"] for f in custom_fields}
+        custom_field_id_map = (await get_custom_fields(location_id, token)).name_to_id
         print("customfieldsid",custom_field_id_map)
         general_property_fields_raw = {
             "Auction Date": auction_info.get("auction_date",""),
@@ -517,17 +760,30 @@ async def create_county_stream_contact(request: Request):
         if phone_number:
             contact_payload["phone"] = phone_number
         print("contact payload",contact_payload)
+        result = {}
         if is_duplicate:
             contact_payload.pop("locationId", None)
-            response,err= update_contacts( token, is_duplicate['id'],contact_payload,phone_lists)
+            try:
+                response,err= await asyncio.to_thread(
+                    update_contacts, token, is_duplicate['id'], contact_payload, phone_lists, location_id
+                )
+            except HTTPException:
+                if indexed_id:
+                    # Stale entry (contact deleted or merged in GHL); the next call asks GHL again
+                    await asyncio.to_thread(contact_index.forget, location_id, indexed_id)
+                raise
             contact_id=is_duplicate['id']
             if not response:
                 return {"error":extract_message_from_error(err)}
+            await asyncio.to_thread(contact_index.add, location_id, contact_id, email_key, phone_key)
+            duplicate_lookup_cache.invalidate_identity(location_id, email_key, phone_key)
         else:
-            response = create_contact(contact_payload, token)
+            response = await asyncio.to_thread(create_contact, contact_payload, token, location_id)
             print("response",response)
             contact_id=response.get("contact").get("id")
-            result = send_update_phones(phone_lists, location_id=location_id, contact_id=contact_id)
+            await asyncio.to_thread(contact_index.add, location_id, contact_id, email_key, phone_key)
+            duplicate_lookup_cache.invalidate_identity(location_id, email_key, phone_key)
+            result = await asyncio.to_thread(send_update_phones, phone_lists, location_id, contact_id)
             if result is not None and "error" in result.get("ghl_response", {}):
                 return {"error": result.get("ghl_response", {})["error"]}
         return {"success": True, "location_id": location_id, "status": result.get("status", "unknown")}
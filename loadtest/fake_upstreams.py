@@ -0,0 +1,240 @@
+"""
+Local stand-in for the DocuSign and GoHighLevel endpoints this service calls.
+
+Run it next to the app and point the base-URL settings at it:
+
+    uvicorn loadtest.fake_upstreams:app --port 9000
+
+    DOCUSIGN_OAUTH_BASE_URL=http://127.0.0.1:9000/docusign-auth
+    DOCUSIGN_API_BASE_URL=http://127.0.0.1:9000/docusign/restapi/v2.1
+    GHL_BASE_URL=http://127.0.0.1:9000/ghl
+    REICB_API_BASE_URL=http://127.0.0.1:9000/ghl
+    REICB_OAUTH_URL=http://127.0.0.1:9000/ghl/oauth/token
+    GHL_V1_BASE_URL=http://127.0.0.1:9000/ghl-v1
+
+Fault injection applies to every route except `/_fake/*` and is configured
+from the environment at startup or at runtime through `POST /_fake/config`:
+
+    FAKE_LATENCY_MS         base latency added to each response (default 50)
+    FAKE_LATENCY_JITTER_MS  uniform jitter added on top (default 20)
+    FAKE_ERROR_RATE         fraction of requests answered with a 500 (default 0)
+    FAKE_RATE_LIMIT_RATE    fraction of requests answered with a 429 (default 0)
+    FAKE_RETRY_AFTER        Retry-After seconds sent with injected 429s (default 1)
+"""
+import asyncio
+import itertools
+import os
+import random
+import time
+import uuid
+import zlib
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+app = FastAPI(title="Fake DocuSign / GoHighLevel upstreams")
+
+config = {
+    "latency_ms": float(os.getenv("FAKE_LATENCY_MS", "50")),
+    "latency_jitter_ms": float(os.getenv("FAKE_LATENCY_JITTER_MS", "20")),
+    "error_rate": float(os.getenv("FAKE_ERROR_RATE", "0")),
+    "rate_limit_rate": float(os.getenv("FAKE_RATE_LIMIT_RATE", "0")),
+    "retry_after": int(os.getenv("FAKE_RETRY_AFTER", "1")),
+}
+stats = {"requests": 0, "injected_errors": 0, "injected_429s": 0}
+
+# Names match the custom fields read by DocusignService and crm_lead_upload
+CUSTOM_FIELD_NAMES = [
+    "MLS Agent Name", "Owner 1 First Name ", "Owner 1 Last Name ", "Owner 2 First Name ",
+    "Owner 2 Last Name ", "MLS Agent Phone", "MLS Agent E-Mail", "MLS Brokerage Name", "APN",
+    "Property Address", "Property City", "Property State", "Property Zip", "Legal Description",
+    "Property Address Map", "Document Type", "Auction Date", "Owner 1 Mailing Address",
+    "Loan 1 Balance", "Lot Size Sqft", "Assessor URL", "Notice of Trustee Sale",
+    "County Stream File ID",
+]
+CUSTOM_FIELDS = [{"id": f"cf{i:03d}", "name": name} for i, name in enumerate(CUSTOM_FIELD_NAMES)]
+CUSTOM_FIELD_VALUES = {
+    "Owner 1 First Name ": "John", "Owner 1 Last Name ": "Doe", "Owner 2 First Name ": "Jane",
+    "Owner 2 Last Name ": "Doe", "MLS Brokerage Name": "Acme Realty", "APN": "123-456-789",
+    "Property Address": "1 Main St", "Property City": "Austin", "Property State": "TX",
+    "Legal Description": "LOT 1 BLK 2", "Property Address Map": "1 Main St, Austin, TX",
+    "Document Type": "Subto Contract",
+}
+
+TEMPLATE_NAMES = [
+    "Texas-Creative Purchase Contract Hudly Title",
+    "Cash Offers-(Bonus Offers)",
+    "Seller Finance Offer",
+] + [f"Template {i}" for i in range(250)]
+TEMPLATES = [{"templateId": str(uuid.uuid5(uuid.NAMESPACE_URL, name)), "name": name} for name in TEMPLATE_NAMES]
+
+_ids = itertools.count(1)
+
+
+@app.middleware("http")
+async def inject_faults(request: Request, call_next):
+    if request.url.path.startswith("/_fake"):
+        return await call_next(request)
+
+    stats["requests"] += 1
+    delay = config["latency_ms"] + random.uniform(0, config["latency_jitter_ms"])
+    await asyncio.sleep(delay / 1000)
+
+    roll = random.random()
+    if roll < config["rate_limit_rate"]:
+        stats["injected_429s"] += 1
+        return JSONResponse(
+            {"statusCode": 429, "message": "Too many requests"},
+            status_code=429,
+            headers={"Retry-After": str(config["retry_after"]), **_rate_limit_headers(remaining=0)},
+        )
+    if roll < config["rate_limit_rate"] + config["error_rate"]:
+        stats["injected_errors"] += 1
+        return JSONResponse({"statusCode": 500, "message": "Injected failure"}, status_code=500)
+
+    response = await call_next(request)
+    response.headers.update(_rate_limit_headers())
+    return response
+
+
+def _rate_limit_headers(remaining: int = 99) -> dict:
+    return {
+        "X-RateLimit-Max": "100",
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Interval-Milliseconds": "10000",
+        "X-RateLimit-Limit-Daily": "200000",
+        "X-RateLimit-Daily-Remaining": "199999",
+    }
+
+
+@app.get("/_fake/config")
+async def get_config():
+    return {"config": config, "stats": stats}
+
+
+@app.post("/_fake/config")
+async def update_config(request: Request):
+    updates = await request.json()
+    for key, value in updates.items():
+        if key in config:
+            config[key] = type(config[key])(value)
+    return {"config": config}
+
+
+@app.post("/_fake/reset")
+async def reset_stats():
+    for key in stats:
+        stats[key] = 0
+    return {"stats": stats}
+
+
+# -----------------------------
+# DocuSign
+# -----------------------------
+@app.post("/docusign-auth/oauth/token")
+async def docusign_token():
+    return {"access_token": f"ds-{uuid.uuid4()}", "token_type": "Bearer", "expires_in": 3600}
+
+
+@app.get("/docusign/restapi/v2.1/accounts/{account_id}/templates")
+async def list_templates(start_position: int = 0, count: int = 100, search_text: str | None = None):
+    templates = TEMPLATES
+    if search_text:
+        templates = [t for t in templates if search_text.lower() in t["name"].lower()]
+    page = templates[start_position:start_position + count]
+    return {
+        "envelopeTemplates": page,
+        "resultSetSize": str(len(page)),
+        "startPosition": str(start_position),
+        "endPosition": str(start_position + len(page) - 1),
+        "totalSetSize": str(len(templates)),
+    }
+
+
+@app.get("/docusign/restapi/v2.1/accounts/{account_id}/templates/{template_id}/documents")
+async def list_template_documents(template_id: str):
+    return {"templateDocuments": [{"documentId": "1", "name": "Contract"}]}
+
+
+@app.get("/docusign/restapi/v2.1/accounts/{account_id}/templates/{template_id}/documents/{document_id}/tabs")
+async def list_document_tabs(template_id: str, document_id: str):
+    return {"textTabs": [], "fullNameTabs": []}
+
+
+@app.post("/docusign/restapi/v2.1/accounts/{account_id}/envelopes")
+async def create_envelope():
+    return {"envelopeId": str(uuid.uuid4()), "status": "created", "statusDateTime": time.strftime("%Y-%m-%dT%H:%M:%SZ")}
+
+
+# -----------------------------
+# GoHighLevel / LeadConnector
+# -----------------------------
+@app.post("/ghl/oauth/token")
+async def ghl_token():
+    return {
+        "access_token": f"ghl-{uuid.uuid4()}",
+        "refresh_token": f"ghl-refresh-{uuid.uuid4()}",
+        "expires_in": 86399,
+        "locationId": "fake-location",
+    }
+
+
+@app.get("/ghl/locations/{location_id}")
+async def get_location(location_id: str):
+    return {"location": {"id": location_id, "name": "Fake Location"}}
+
+
+@app.get("/ghl/locations/{location_id}/customFields")
+async def get_custom_fields(location_id: str):
+    return {"customFields": CUSTOM_FIELDS}
+
+
+@app.get("/ghl/contacts/search/duplicate")
+async def search_duplicate(email: str | None = None, number: str | None = None):
+    # Roughly half of the lookups find an existing contact
+    checksum = zlib.crc32((email or number or "").encode())
+    if checksum % 2:
+        return {"contact": {"id": f"dup-{checksum % 100000}", "email": email, "phone": number}}
+    return JSONResponse({"statusCode": 404, "message": "Contact not found"}, status_code=404)
+
+
+@app.get("/ghl/contacts/{contact_id}")
+async def get_contact(contact_id: str):
+    return {
+        "contact": {
+            "id": contact_id,
+            "firstName": "Jane",
+            "lastName": "Agent",
+            "email": "jane.agent@example.com",
+            "phone": "+15125550100",
+            "customFields": [
+                {"id": field["id"], "value": CUSTOM_FIELD_VALUES[field["name"]]}
+                for field in CUSTOM_FIELDS if field["name"] in CUSTOM_FIELD_VALUES
+            ],
+        }
+    }
+
+
+@app.post("/ghl/contacts")
+async def create_contact(request: Request):
+    body = await request.json()
+    contact = {"id": f"c{next(_ids)}", **body}
+    return {"contact": contact}
+
+
+@app.put("/ghl/contacts/{contact_id}")
+async def update_contact(contact_id: str, request: Request):
+    body = await request.json()
+    return {"succeded": True, "contact": {"id": contact_id, **body}}
+
+
+@app.post("/ghl/contacts/{contact_id}/tasks")
+async def create_task(contact_id: str, request: Request):
+    body = await request.json()
+    return {"id": f"t{next(_ids)}", "contactId": contact_id, **body}
+
+
+@app.post("/ghl-v1/contacts/{contact_id}/tags/")
+async def add_tags(contact_id: str, request: Request):
+    body = await request.json()
+    return {"tags": body.get("tags", [])}
@@ -0,0 +1,227 @@
+"""
+Scripted load test for the service's hot routes.
+
+Start the fake upstreams (see loadtest/fake_upstreams.py), seed DynamoDB Local
+(see loadtest/seed_dynamodb.py), run the app with its base URLs pointed at the
+fakes, then drive it:
+
+    python -m loadtest.run_load --target http://127.0.0.1:8000 \\
+        --scenario all --requests 500 --concurrency 25
+
+Scenarios:
+    send-envelope     POST /sendEnvelope (legacy route)
+    docusign-send     POST /docusign/send_envelope
+    upload-contact    POST /crm/upload-contact with generated CSVs (--rows per file)
+    update-phones     POST /api/update-phones
+
+For each scenario the script prints the request count, error count,
+throughput and p50/p95/p99 latency.
+"""
+import argparse
+import asyncio
+import csv
+import io
+import json
+import random
+import statistics
+import time
+
+import httpx
+
+CUSTOMER_ID = "loadtest-customer"
+LOCATION_ID = "fake-location"
+
+
+def _send_envelope_request(i: int) -> dict:
+    return {
+        "method": "POST",
+        "url": "/sendEnvelope",
+        "json": {
+            "templateName": "Texas-Creative Purchase Contract Hudly Title",
+            "emailSubject": f"{i} Main St",
+            "roleName": "Signer 1",
+            "status": "created",
+            "FirstName": "Jane",
+            "LastName": "Agent",
+            "documentName": "Contract",
+            "contactId": f"contact-{i}",
+            "Seller1First": "John",
+            "Seller1Last": "Doe",
+            "Seller2First": "Jane",
+            "Seller2Last": "Doe",
+            "Debt": "$150,000.00",
+            "purchasePrice": "$300,000.00",
+            "city_name": "Texas",
+        },
+    }
+
+
+def _docusign_send_request(i: int, properties: int) -> dict:
+    return {
+        "method": "POST",
+        "url": "/docusign/send_envelope",
+        "json": {
+            "customer_id": CUSTOMER_ID,
+            "property_id": f"property-{i % properties}",
+            "location_id": LOCATION_ID,
+        },
+    }
+
+
+def _csv_bytes(header: list[str], rows: list[list]) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    writer.writerows(rows)
+    return buffer.getvalue().encode()
+
+
+def _upload_contact_request(i: int, rows: int) -> dict:
+    members = _csv_bytes(
+        ["Contact Id", "Email", "Phone"],
+        [[f"m{i}-{r}", f"lead{r}@example.com", f"512555{r:04d}"] for r in range(0, rows, 2)],
+    )
+    leads = _csv_bytes(
+        ["First", "Last", "Email", "Phone", "Address", "City", "State", "Zip", "Map", "Country", "Tag"],
+        [
+            [f"First{r}", f"Last{r}", f"lead{r}@example.com", f"512555{r:04d}", f"{r} Main St",
+             "Austin", "TX", "78701", f"{r} Main St, Austin, TX", "US", "Load Test"]
+            for r in range(rows)
+        ],
+    )
+    map_data = {
+        "firstName": "First", "lastName": "Last", "email": "Email", "phone": "Phone",
+        "PropertyAddress": "Address", "PropertyCity": "City", "PropertyState": "State",
+        "PropertyZip": "Zip", "PropertyAddressMap": "Map", "Country": "Country", "Tag": "Tag",
+    }
+    return {
+        "method": "POST",
+        "url": "/crm/upload-contact",
+        "params": {"locationId": LOCATION_ID},
+        "data": {
+            "access_token": "ghl-loadtest-token",
+            "map_data": json.dumps(map_data),
+            "customeFields": json.dumps(["Property Zip"]),
+        },
+        "files": {
+            "members_file": ("members.csv", members, "text/csv"),
+            "new_members_file": ("leads.csv", leads, "text/csv"),
+        },
+    }
+
+
+def _update_phones_request(i: int) -> dict:
+    return {
+        "method": "POST",
+        "url": "/api/update-phones",
+        "json": {
+            "contact_id": f"contact-{i}",
+            "location_id": LOCATION_ID,
+            "phone 1": f"512555{random.randint(0, 9999):04d}",
+            "phone 1 type": "mobile",
+            "phone 2": f"737555{random.randint(0, 9999):04d}",
+            "phone 2 type": "landline",
+        },
+    }
+
+
+def build_request(scenario: str, i: int, args) -> dict:
+    if scenario == "send-envelope":
+        return _send_envelope_request(i)
+    if scenario == "docusign-send":
+        return _docusign_send_request(i, args.properties)
+    if scenario == "upload-contact":
+        return _upload_contact_request(i, args.rows)
+    if scenario == "update-phones":
+        return _update_phones_request(i)
+    raise ValueError(f"Unknown scenario: {scenario}")
+
+
+def _is_error(response: httpx.Response) -> bool:
+    if response.status_code >= 400:
+        return True
+    try:
+        body = response.json()
+    except ValueError:
+        return False
+    # Several legacy routes report failures in a 200 body
+    return isinstance(body, dict) and "error" in body
+
+
+async def run_scenario(client: httpx.AsyncClient, scenario: str, args) -> dict:
+    latencies, errors = [], 0
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for i in range(args.requests):
+        queue.put_nowait(i)
+
+    async def worker():
+        nonlocal errors
+        while True:
+            try:
+                i = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            request = build_request(scenario, i, args)
+            started = time.perf_counter()
+            try:
+                response = await client.request(**request)
+                if _is_error(response):
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "scenario": scenario,
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": _percentile(latencies, 50),
+        "p95_ms": _percentile(latencies, 95),
+        "p99_ms": _percentile(latencies, 99),
+    }
+
+
+def _percentile(samples: list[float], pct: int) -> float:
+    if not samples:
+        return 0.0
+    if len(samples) == 1:
+        return samples[0] * 1000
+    return statistics.quantiles(samples, n=100, method="inclusive")[pct - 1] * 1000
+
+
+def print_report(results: list[dict]):
+    print(f"{'scenario':<16}{'requests':>9}{'errors':>8}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for r in results:
+        print(
+            f"{r['scenario']:<16}{r['requests']:>9}{r['errors']:>8}{r['throughput_rps']:>9.1f}"
+            f"{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}"
+        )
+
+
+async def main(args):
+    scenarios = ["send-envelope", "docusign-send", "upload-contact", "update-phones"] if args.scenario == "all" else [args.scenario]
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.target, timeout=args.timeout, limits=limits) as client:
+        results = [await run_scenario(client, scenario, args) for scenario in scenarios]
+    print_report(results)
+    if args.json:
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", default="http://127.0.0.1:8000")
+    parser.add_argument("--scenario", default="all",
+                        choices=["all", "send-envelope", "docusign-send", "upload-contact", "update-phones"])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--rows", type=int, default=50, help="lead rows per upload-contact request")
+    parser.add_argument("--properties", type=int, default=200, help="seeded properties to cycle through")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--json", action="store_true", help="also print the results as JSON")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,83 @@
+"""
+Creates and seeds the DynamoDB tables the load test needs in DynamoDB Local.
+
+    docker run -p 8001:8000 amazon/dynamodb-local
+    DYNAMODB_ENDPOINT_URL=http://127.0.0.1:8001 python -m loadtest.seed_dynamodb --properties 200
+
+Seeds `<DYNAMODB_PREFIX>_properties` and `<DYNAMODB_PREFIX>_connections` for
+`/docusign/send_envelope`, and the `DYNAMO_TABLE_NAME` token table read by
+`services.token_service` for `/api/update-phones`.
+"""
+import argparse
+import os
+import time
+
+import boto3
+from cryptography.fernet import Fernet
+
+from app.core.config import settings
+from app.infrastructure.database.models import Connection, Property
+
+CUSTOMER_ID = "loadtest-customer"
+LOCATION_ID = "fake-location"
+
+
+def seed(properties: int):
+    if not settings.DYNAMODB_ENDPOINT_URL:
+        raise SystemExit("Refusing to seed: DYNAMODB_ENDPOINT_URL must point at DynamoDB Local.")
+
+    for model in (Property, Connection):
+        if not model.exists():
+            model.create_table(read_capacity_units=5, write_capacity_units=5, wait=True)
+
+    fernet = Fernet(settings.ENC_KEY.encode())
+    Connection(
+        locationid=LOCATION_ID,
+        token=fernet.encrypt(b"ghl-loadtest-token").decode(),
+        refresh=fernet.encrypt(b"ghl-loadtest-refresh").decode(),
+        expires=str(int(time.time()) + 86400),
+        locationname="Load test",
+    ).save()
+
+    with Property.batch_write() as batch:
+        for i in range(properties):
+            batch.save(Property(
+                customerid=CUSTOMER_ID,
+                id=f"property-{i}",
+                reicb_url=f"https://app.example.com/contacts/detail/contact-{i}",
+                cash_to_seller=5000,
+                agent_commission=9000,
+                loan_balance=150000,
+                contract_price=300000,
+                seller_carry_terms="$10,000",
+            ))
+
+    table_name = os.getenv("DYNAMO_TABLE_NAME")
+    if table_name:
+        dynamodb = boto3.resource(
+            "dynamodb",
+            region_name=os.getenv("AWS_REGION", settings.DYNAMODB_REGION),
+            endpoint_url=settings.DYNAMODB_ENDPOINT_URL,
+        )
+        existing = [table.name for table in dynamodb.tables.all()]
+        if table_name not in existing:
+            dynamodb.create_table(
+                TableName=table_name,
+                KeySchema=[{"AttributeName": "location_id", "KeyType": "HASH"}],
+                AttributeDefinitions=[{"AttributeName": "location_id", "AttributeType": "S"}],
+                BillingMode="PAY_PER_REQUEST",
+            ).wait_until_exists()
+        dynamodb.Table(table_name).put_item(Item={
+            "location_id": LOCATION_ID,
+            "token": "ghl-loadtest-token",
+            "refresh": "ghl-loadtest-refresh",
+            "expires_at": str(int(time.time()) + 86400),
+        })
+
+    print(f"Seeded {properties} properties for customer '{CUSTOMER_ID}' and location '{LOCATION_ID}'.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--properties", type=int, default=200)
+    seed(parser.parse_args().properties)
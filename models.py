@@ -6,10 +6,16 @@ from pynamodb.attributes import (
     MapAttribute,
     ListAttribute
 )
+from pynamodb.exceptions import PutError
 from dotenv import load_dotenv
 import os
 load_dotenv()
 
+# DynamoDB BatchWriteItem accepts at most 25 items per request
+BATCH_WRITE_SIZE = 25
+# Items fetched per DynamoDB Query request while exporting
+EXPORT_PAGE_SIZE = int(os.getenv("CRAIMER_EXPORT_PAGE_SIZE", "500"))
+
 
 class PropertyAddressParts(MapAttribute):
     property_street = UnicodeAttribute(null=True)
@@ -43,6 +49,7 @@ class TenantDataRecord(Model):
     class Meta:
         table_name = "craimer_countystream"
         region = ("us-east-2")
+        host = os.getenv("DYNAMODB_ENDPOINT_URL")
 
     tenant_id = UnicodeAttribute(hash_key=True)
     timestamp = UnicodeAttribute(range_key=True)
@@ -76,7 +83,16 @@ class TenantDataRecord(Model):
         """
         Create a record in DynamoDB.
         """
-        record = cls(
+        record = cls.build_record(tenant_id, timestamp, data)
+        record.save()
+        return record
+
+    @classmethod
+    def build_record(cls, tenant_id, timestamp, data: dict):
+        """
+        Build (without saving) a record from an ingest payload.
+        """
+        return cls(
             tenant_id=tenant_id,
             timestamp=timestamp,
             lead_id=data.get("lead_id"),
@@ -100,15 +116,93 @@ class TenantDataRecord(Model):
             legal_description_parts=data.get("legal_description_parts"),
             phones=data.get("phones")
         )
-        record.save()
-        return record
 
     @classmethod
-    def query_by_tenant(cls, tenant_id):
+    def batch_save(cls, records: list, attempts: int = 3) -> dict:
         """
-        Get all records for a tenant.
+        Write records with BatchWriteItem, 25 per request.
+
+        PynamoDB retries items DynamoDB leaves unprocessed (with backoff); the
+        ones still unprocessed after that are re-submitted, up to `attempts`
+        times in total. Returns {(tenant_id, timestamp): error} for the records
+        that could not be written.
         """
-        return cls.query(tenant_id)
+        failures = {}
+        for start in range(0, len(records), BATCH_WRITE_SIZE):
+            pending = records[start:start + BATCH_WRITE_SIZE]
+            error = None
+            for _ in range(attempts):
+                batch = cls.batch_write()
+                try:
+                    with batch:
+                        for record in pending:
+                            batch.save(record)
+                    pending = []
+                    break
+                except PutError as e:
+                    error = str(e)
+                    failed_keys = cls._unprocessed_keys(getattr(batch, "failed_operations", None))
+                    if failed_keys is not None:
+                        pending = [record for record in pending if (record.tenant_id, record.timestamp) in failed_keys]
+                except Exception as e:
+                    error = str(e)
+            for record in pending:
+                failures[(record.tenant_id, record.timestamp)] = error
+        return failures
+
+    @staticmethod
+    def _unprocessed_keys(operations) -> set | None:
+        """(tenant_id, timestamp) of the put requests DynamoDB left unprocessed, if known."""
+        if not operations:
+            return None
+        try:
+            return {
+                (op["PutRequest"]["Item"]["tenant_id"]["S"], op["PutRequest"]["Item"]["timestamp"]["S"])
+                for op in operations
+            }
+        except (KeyError, TypeError):
+            return None
+
+    @classmethod
+    def query_by_tenant(cls, tenant_id, since=None, until=None, newest_first=False, page_size=EXPORT_PAGE_SIZE):
+        """
+        Get all records for a tenant, optionally within [since, until] on the
+        timestamp range key. The iterator fetches one DynamoDB page at a time.
+        """
+        return cls.query(
+            tenant_id,
+            range_key_condition=cls._timestamp_condition(since, until),
+            scan_index_forward=not newest_first,
+            page_size=page_size,
+        )
+
+    @classmethod
+    def query_page(cls, tenant_id, since=None, until=None, limit=100, last_evaluated_key=None, newest_first=False):
+        """
+        One page of a tenant's records. Returns (records, last_evaluated_key);
+        the key is None once there are no more records.
+        """
+        results = cls.query(
+            tenant_id,
+            range_key_condition=cls._timestamp_condition(since, until),
+            scan_index_forward=not newest_first,
+            limit=limit,
+            page_size=limit,
+            last_evaluated_key=last_evaluated_key,
+        )
+        records = list(results)
+        return records, results.last_evaluated_key
+
+    @classmethod
+    def _timestamp_condition(cls, since=None, until=None):
+        # Timestamps are ISO-8601 strings, so bounds compare lexically
+        if since and until:
+            return cls.timestamp.between(since, until)
+        if since:
+            return cls.timestamp >= since
+        if until:
+            return cls.timestamp <= until
+        return None
 
     @classmethod
     def get_record(cls, tenant_id, timestamp):
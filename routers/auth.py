@@ -3,9 +3,10 @@ from fastapi.responses import RedirectResponse
 from datetime import datetime as dt
 from dotenv import load_dotenv
 import requests
-import boto3
 import os
 from urllib.parse import urlencode
+from services.aws import dynamodb_table
+from services.token_refresher import token_refresher
 
 # Load env variables
 load_dotenv()
@@ -13,19 +14,8 @@ load_dotenv()
 CLIENT_ID = os.getenv("CLIENT_ID")
 CLIENT_SECRET = os.getenv("CLIENT_SECRET")
 AUTH_URL = os.getenv("AUTH_URL")
-AWS_REGION = os.getenv("AWS_REGION")
 DYNAMO_TABLE_NAME = os.getenv("DYNAMO_TABLE_NAME")
-AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
-AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
-
-# Init boto3 DynamoDB
-dynamodb = boto3.resource(
-    "dynamodb",
-    region_name=AWS_REGION,
-    aws_access_key_id=AWS_ACCESS_KEY_ID,
-    aws_secret_access_key=AWS_SECRET_ACCESS_KEY
-)
-table = dynamodb.Table(DYNAMO_TABLE_NAME)
+GHL_BASE_URL = os.getenv("GHL_BASE_URL", "https://services.leadconnectorhq.com")
 
 router = APIRouter()
 
@@ -47,9 +37,15 @@ def connect():
     return RedirectResponse(f"{base_url}?{urlencode(query)}")
 
 
+@router.get("/refresher/status")
+def refresher_status():
+    """Background token refresher state: tracked locations, refresh/failure counters."""
+    return token_refresher.status()
+
+
 @router.get("/redirect")
 def redirect_handler(code: str):
-    token_url = "https://services.leadconnectorhq.com/oauth/token"
+    token_url = f"{GHL_BASE_URL}/oauth/token"
     token_data = {
         "client_id": CLIENT_ID,
         "client_secret": CLIENT_SECRET,
@@ -78,7 +74,7 @@ def redirect_handler(code: str):
     }
 
     location_resp = requests.get(
-        f"https://services.leadconnectorhq.com/locations/{location_id}",
+        f"{GHL_BASE_URL}/locations/{location_id}",
         headers=headers
     )
     location_data = location_resp.json()
@@ -95,6 +91,8 @@ def redirect_handler(code: str):
         "expires_at": expires_at
     }
 
+    table = dynamodb_table(DYNAMO_TABLE_NAME)
+
     # Check if location_id already exists
     existing = table.get_item(Key={"location_id": location_id}).get("Item")
 
@@ -118,3 +116,6 @@ def redirect_handler(code: str):
         # 🟢 New user — insert full item
         print(f"[INFO] New location connected: {location_id}")
         table.put_item(Item=item)
+
+    # Schedule the next proactive refresh for this location
+    token_refresher.track(location_id, expires_at)
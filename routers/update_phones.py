@@ -1,6 +1,7 @@
+import asyncio
 from fastapi import APIRouter, Request
 from services.token_service import get_valid_token
-import requests
+from services.ghl_client import ghl_client
 
 router = APIRouter()
 
@@ -28,13 +29,7 @@ def update_phones_in_ghl(contact_id: str, location_id: str, phones: list):
         # 🔐 Get token (replace later with your token fetch logic)
         token = get_valid_token(location_id)
        # 📥 Fetch existing contact data
-        existing_resp = requests.get(
-            f"https://services.leadconnectorhq.com/contacts/{contact_id}",
-            headers={
-                "Authorization": f"Bearer {token}",
-                "Version": "2021-07-28"
-            }
-        )
+        existing_resp = ghl_client.get(f"contacts/{contact_id}", token, location_id)
         existing = existing_resp.json()
 
         existing_phones = []
@@ -78,15 +73,7 @@ def update_phones_in_ghl(contact_id: str, location_id: str, phones: list):
         }
 
         # ✅ Update contact
-        resp = requests.put(
-            f"https://services.leadconnectorhq.com/contacts/{contact_id}",
-            headers={
-                "Authorization": f"Bearer {token}",
-                "Content-Type": "application/json",
-                "Version": "2021-07-28"
-            },
-            json=update_data
-        )
+        resp = ghl_client.put(f"contacts/{contact_id}", token, location_id, json=update_data)
 
         return {
             "status": resp.status_code,
@@ -131,75 +118,8 @@ async def update_phones(request: Request):
         if not phones:
             return {"error": "No valid phone numbers provided."}
 
-        # 🔐 Get token
-        token = get_valid_token(location_id)
-
-        # 📥 Fetch existing phones from GHL
-        existing_resp = requests.get(
-            f"https://services.leadconnectorhq.com/contacts/{contact_id}",
-            headers={
-                "Authorization": f"Bearer {token}",
-                "Version": "2021-07-28"
-            }
-        )
-        existing = existing_resp.json()
-
-        existing_phones = []
-
-        # Include main phone if it exists
-        if "phone" in existing and existing["phone"]:
-            existing_phones.append({
-                "phone": existing["phone"],
-                "type": existing.get("phoneLabel", "Mobile")
-            })
-
-        # Include additionalPhones
-        for p in existing.get("additionalPhones", []):
-            if "phone" in p:
-                existing_phones.append({
-                    "phone": p["phone"],
-                    "type": p.get("phoneLabel", "Mobile")
-                })
-
-        # ✨ Merge and deduplicate
-        seen = set()
-        all_phones = existing_phones + phones
-        merged_phones = []
-        for p in all_phones:
-            number = p["phone"].strip()
-            norm_number = number.replace(" ", "").replace("-", "").replace("(", "").replace(")", "")
-            if norm_number and norm_number not in seen:
-                seen.add(norm_number)
-                merged_phones.append({
-                    "phone": number,
-                    "phoneLabel": get_label_from_type(p.get("type", "Mobile"))
-                })
-
-        if not merged_phones:
-            return {"error": "All phone numbers are duplicates or empty."}
-
-        update_data = {
-            "phone": merged_phones[0]["phone"],
-            "phoneLabel": merged_phones[0]["phoneLabel"],
-            "additionalPhones": merged_phones[1:]
-        }
-
-        # ✅ PUT update
-        resp = requests.put(
-            f"https://services.leadconnectorhq.com/contacts/{contact_id}",
-            headers={
-                "Authorization": f"Bearer {token}",
-                "Content-Type": "application/json",
-                "Version": "2021-07-28"
-            },
-            json=update_data
-        )
-
-        return {
-            "status": resp.status_code,
-            "payload_sent": update_data,
-            "ghl_response": resp.json()
-        }
+        # GHL calls block (rate-limit pacing and retry backoff), so they run in a worker thread
+        return await asyncio.to_thread(update_phones_in_ghl, contact_id, location_id, phones)
 
     except Exception as e:
         return {"error": str(e)}
\ No newline at end of file
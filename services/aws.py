@@ -0,0 +1,54 @@
+import os
+import threading
+from dotenv import load_dotenv
+
+load_dotenv()
+
+AWS_REGION = os.getenv("AWS_REGION")
+# Optional, e.g. DynamoDB Local for load tests; None uses the regional AWS endpoint
+DYNAMODB_ENDPOINT_URL = os.getenv("DYNAMODB_ENDPOINT_URL")
+
+_lock = threading.Lock()
+_session = None
+_dynamodb = None
+_tables: dict = {}
+
+
+def aws_session():
+    """
+    The process-wide boto3 session. boto3 is imported and the session built on
+    first use, so importing the app does not pay for it.
+    """
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                import boto3
+
+                _session = boto3.session.Session(
+                    region_name=AWS_REGION,
+                    aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
+                    aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
+                )
+    return _session
+
+
+def dynamodb_resource():
+    """Shared DynamoDB resource on the process-wide session."""
+    global _dynamodb
+    if _dynamodb is None:
+        session = aws_session()
+        with _lock:
+            if _dynamodb is None:
+                _dynamodb = session.resource("dynamodb", endpoint_url=DYNAMODB_ENDPOINT_URL)
+    return _dynamodb
+
+
+def dynamodb_table(name: str):
+    """Shared Table handle; created once per table name."""
+    table = _tables.get(name)
+    if table is None:
+        resource = dynamodb_resource()
+        with _lock:
+            table = _tables.setdefault(name, resource.Table(name))
+    return table
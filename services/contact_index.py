@@ -0,0 +1,127 @@
+import os
+import sqlite3
+import threading
+import time
+
+from services.upload_jobs import CRM_JOBS_DIR
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS contact_identities (
+    location_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    identity TEXT NOT NULL,
+    contact_id TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (location_id, kind, identity)
+)
+"""
+CONTACT_INDEX = "CREATE INDEX IF NOT EXISTS contact_identities_contact ON contact_identities (location_id, contact_id)"
+
+EMAIL = "email"
+PHONE = "phone"
+
+
+class ContactIdentityIndex:
+    """
+    Local email/phone -> contact id index per GHL location, in SQLite.
+
+    Keys are already normalized by the caller: emails stripped and
+    lower-cased, phones in `normalize_phone`'s NNN-NNN-NNNN form. The index
+    is fed by member exports and by contacts the app creates or updates, and
+    is consulted before asking GHL's duplicate search.
+    """
+
+    def __init__(self, directory: str = CRM_JOBS_DIR):
+        self.directory = directory
+        self.db_path = os.path.join(directory, "contacts.sqlite3")
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._connection is None:
+            os.makedirs(self.directory, exist_ok=True)
+            connection = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(SCHEMA)
+            connection.execute(CONTACT_INDEX)
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def lookup(self, location_id: str, email_key: str | None = None, phone_key: str | None = None) -> str | None:
+        """Contact id for the email, else for the phone (same precedence as the CSV import)."""
+        with self._lock:
+            db = self._db()
+            for kind, identity in ((EMAIL, email_key), (PHONE, phone_key)):
+                if not identity:
+                    continue
+                row = db.execute(
+                    "SELECT contact_id FROM contact_identities WHERE location_id = ? AND kind = ? AND identity = ?",
+                    (location_id, kind, identity),
+                ).fetchone()
+                if row:
+                    return row[0]
+        return None
+
+    def load(self, location_id: str) -> tuple[dict, dict]:
+        """The location's email -> contact id and phone -> contact id maps."""
+        email_to_id, phone_to_id = {}, {}
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT kind, identity, contact_id FROM contact_identities WHERE location_id = ?",
+                (location_id,),
+            )
+            for kind, identity, contact_id in rows:
+                (email_to_id if kind == EMAIL else phone_to_id)[identity] = contact_id
+        return email_to_id, phone_to_id
+
+    def add(self, location_id: str, contact_id: str, email_key: str | None = None, phone_key: str | None = None):
+        if not contact_id:
+            return
+        now = time.time()
+        rows = [(location_id, kind, identity, contact_id, now)
+                for kind, identity in ((EMAIL, email_key), (PHONE, phone_key)) if identity]
+        self._write(rows)
+
+    def add_many(self, location_id: str, email_to_id: dict, phone_to_id: dict) -> int:
+        """Bulk-loads a member export's maps; entries without a contact id are ignored."""
+        now = time.time()
+        rows = [(location_id, kind, identity, contact_id, now)
+                for kind, mapping in ((EMAIL, email_to_id), (PHONE, phone_to_id))
+                for identity, contact_id in mapping.items() if identity and contact_id]
+        self._write(rows)
+        return len(rows)
+
+    def _write(self, rows: list[tuple]):
+        if not rows:
+            return
+        with self._lock:
+            db = self._db()
+            db.executemany("INSERT OR REPLACE INTO contact_identities VALUES (?, ?, ?, ?, ?)", rows)
+            db.commit()
+
+    def forget(self, location_id: str, contact_id: str | None = None) -> int:
+        """Drops one contact's entries (e.g. it was deleted in GHL), or the whole location."""
+        query = "DELETE FROM contact_identities WHERE location_id = ?"
+        params: tuple = (location_id,)
+        if contact_id:
+            query += " AND contact_id = ?"
+            params += (contact_id,)
+        with self._lock:
+            db = self._db()
+            removed = db.execute(query, params).rowcount
+            db.commit()
+        return removed
+
+    def stats(self, location_id: str) -> dict:
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT kind, COUNT(*) FROM contact_identities WHERE location_id = ? GROUP BY kind",
+                (location_id,),
+            ).fetchall()
+        counts = dict(rows)
+        return {"location_id": location_id, "emails": counts.get(EMAIL, 0), "phones": counts.get(PHONE, 0)}
+
+
+contact_index = ContactIdentityIndex()
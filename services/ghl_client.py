@@ -0,0 +1,155 @@
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from services.ghl_rate_limit import GHL_MAX_RETRIES, GHLRateLimiter, ghl_rate_limiter
+
+GHL_BASE_URL = os.getenv("GHL_BASE_URL", "https://services.leadconnectorhq.com")
+GHL_API_VERSION = os.getenv("GHL_API_VERSION", "2021-07-28")
+# Keep-alive connections kept per host; size it to the upload/worker concurrency
+GHL_POOL_SIZE = int(os.getenv("GHL_POOL_SIZE", "32"))
+GHL_CONNECT_TIMEOUT = float(os.getenv("GHL_CONNECT_TIMEOUT", "5"))
+GHL_READ_TIMEOUT = float(os.getenv("GHL_READ_TIMEOUT", "30"))
+
+IDEMPOTENT_METHODS = {"GET", "PUT", "DELETE", "HEAD", "OPTIONS"}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class GHLClient:
+    """
+    Shared GoHighLevel HTTP client.
+
+    One `requests.Session` with a pooled keep-alive adapter is reused by every
+    caller, so uploads stop paying a TLS handshake per request. It also sets
+    the default timeouts, the `Version` header and the bearer token in one
+    place, and paces each location through `services.ghl_rate_limit`.
+    Paths are relative to `GHL_BASE_URL`; absolute URLs are used as is.
+    """
+
+    def __init__(self, base_url: str = GHL_BASE_URL, pool_size: int = GHL_POOL_SIZE,
+                 timeout: tuple[float, float] = (GHL_CONNECT_TIMEOUT, GHL_READ_TIMEOUT),
+                 rate_limiter: GHLRateLimiter | None = None, max_retries: int = GHL_MAX_RETRIES):
+        self.base_url = base_url.rstrip("/")
+        self.rate_limiter = rate_limiter or ghl_rate_limiter
+        self.max_retries = max_retries
+        self.pool_size = pool_size
+        self.timeout = timeout
+
+        self.adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session = requests.Session()
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+        self.session.headers.update({"Version": GHL_API_VERSION, "Accept": "application/json"})
+
+        self._stats_lock = threading.Lock()
+        self._stats = {"requests": 0, "errors": 0, "in_flight": 0, "peak_in_flight": 0}
+
+    def request(self, method: str, path: str, token: str | None = None, location_id: str | None = None,
+                **kwargs) -> requests.Response:
+        """
+        Sends a request through the rate limiter of `location_id`.
+
+        Calls wait for a token from that location's bucket instead of running
+        into 429s. A 429 (and a 5xx on idempotent methods or a 503 on POST) is
+        retried with exponential backoff and jitter, honouring Retry-After.
+        The last response is returned when retries run out. Raises
+        GHLDailyLimitExceeded when the location's daily budget is spent.
+
+        Pacing and backoff block the calling thread; async routes call this
+        (and the helpers built on it) through `asyncio.to_thread`.
+        """
+        url = path if path.startswith(("http://", "https://")) else f"{self.base_url}/{path.lstrip('/')}"
+        headers = dict(kwargs.pop("headers", None) or {})
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        kwargs.setdefault("timeout", self.timeout)
+        bucket = self.rate_limiter.bucket(location_id)
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+
+        attempt = 0
+        while True:
+            bucket.acquire()
+            try:
+                response = self._send(method, url, headers, kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if not idempotent or attempt >= self.max_retries:
+                    raise
+                time.sleep(self.rate_limiter.backoff(attempt))
+                attempt += 1
+                self.rate_limiter.retries += 1
+                continue
+
+            bucket.learn(response.headers)
+            if not self._should_retry(response.status_code, idempotent) or attempt >= self.max_retries:
+                return response
+
+            delay = self.rate_limiter.backoff(attempt, response.headers.get("Retry-After"))
+            if response.status_code == 429:
+                bucket.pause(delay)
+            print(f"GHL {method} {url} returned {response.status_code}; retrying in {delay:.1f}s")
+            time.sleep(delay)
+            attempt += 1
+            self.rate_limiter.retries += 1
+
+    @staticmethod
+    def _should_retry(status_code: int, idempotent: bool) -> bool:
+        if status_code == 429:
+            return True
+        if idempotent:
+            return status_code in RETRY_STATUSES
+        # A POST that hit a 500/502/504 may have been applied; only 503 is known not to be
+        return status_code == 503
+
+    def _send(self, method: str, url: str, headers: dict, kwargs: dict) -> requests.Response:
+        with self._stats_lock:
+            self._stats["requests"] += 1
+            self._stats["in_flight"] += 1
+            self._stats["peak_in_flight"] = max(self._stats["peak_in_flight"], self._stats["in_flight"])
+        try:
+            return self.session.request(method, url, headers=headers, **kwargs)
+        except requests.RequestException:
+            with self._stats_lock:
+                self._stats["errors"] += 1
+            raise
+        finally:
+            with self._stats_lock:
+                self._stats["in_flight"] -= 1
+
+    def get(self, path: str, token: str | None = None, location_id: str | None = None,
+            **kwargs) -> requests.Response:
+        return self.request("GET", path, token, location_id, **kwargs)
+
+    def post(self, path: str, token: str | None = None, location_id: str | None = None,
+            **kwargs) -> requests.Response:
+        return self.request("POST", path, token, location_id, **kwargs)
+
+    def put(self, path: str, token: str | None = None, location_id: str | None = None,
+            **kwargs) -> requests.Response:
+        return self.request("PUT", path, token, location_id, **kwargs)
+
+    def pool_stats(self) -> dict:
+        """Request counters plus per-host connection pool utilization."""
+        pools = []
+        for key in list(self.adapter.poolmanager.pools.keys()):
+            pool = self.adapter.poolmanager.pools.get(key)
+            if pool is None:
+                continue
+            # urllib3 pre-fills the queue with placeholders, so qsize() is the free slots
+            maxsize = pool.pool.maxsize if pool.pool is not None else self.pool_size
+            free = pool.pool.qsize() if pool.pool is not None else 0
+            pools.append({
+                "host": f"{pool.scheme}://{pool.host}:{pool.port}",
+                "maxsize": maxsize,
+                "checked_out": maxsize - free,
+                "connections_opened": pool.num_connections,
+                "requests_served": pool.num_requests,
+            })
+        with self._stats_lock:
+            stats = dict(self._stats)
+        return {**stats, "pool_size": self.pool_size, "pools": pools, "rate_limits": self.rate_limiter.stats()}
+
+
+ghl_client = GHLClient()
@@ -0,0 +1,160 @@
+import os
+import random
+import threading
+import time
+
+import requests
+
+# GHL's documented per-location burst limit: 100 requests per 10 seconds
+GHL_RATE_LIMIT_MAX = int(os.getenv("GHL_RATE_LIMIT_MAX", "100"))
+GHL_RATE_LIMIT_INTERVAL_MS = int(os.getenv("GHL_RATE_LIMIT_INTERVAL_MS", "10000"))
+# Retries for 429 / 5xx responses, with exponential backoff and full jitter (seconds)
+GHL_MAX_RETRIES = int(os.getenv("GHL_MAX_RETRIES", "5"))
+GHL_BACKOFF_BASE = float(os.getenv("GHL_BACKOFF_BASE", "0.5"))
+GHL_BACKOFF_MAX = float(os.getenv("GHL_BACKOFF_MAX", "30"))
+# Once a location's daily budget is spent, calls fail fast; after this many
+# seconds one call is let through to pick up the budget GHL reports again
+GHL_DAILY_LIMIT_RECHECK = float(os.getenv("GHL_DAILY_LIMIT_RECHECK", "600"))
+# Buckets not used for this long are dropped
+GHL_BUCKET_IDLE_SECONDS = float(os.getenv("GHL_BUCKET_IDLE_SECONDS", "3600"))
+
+
+class GHLDailyLimitExceeded(requests.RequestException):
+    """Raised instead of sending when the location has no daily GHL budget left."""
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. `acquire` blocks until a token is available, so
+    callers queue up instead of being rejected.
+    """
+
+    def __init__(self, capacity: int, interval_ms: int):
+        self.capacity = capacity
+        self.rate = capacity / (interval_ms / 1000)
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.daily_remaining: int | None = None
+        self.daily_checked_at = 0.0
+        self.last_used = self.updated
+        self.waits = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.last_used = now
+                self._check_daily(now)
+                self._refill(now)
+                if now >= self.paused_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    if self.daily_remaining is not None:
+                        self.daily_remaining -= 1
+                    return
+                wait = max(self.paused_until - now, (1 - self.tokens) / self.rate)
+                self.waits += 1
+            time.sleep(wait)
+
+    def learn(self, headers):
+        """Adopts the limits and remaining budget GHL reports in X-RateLimit-* headers."""
+        try:
+            capacity = int(headers["X-RateLimit-Max"])
+            interval_ms = int(headers["X-RateLimit-Interval-Milliseconds"])
+            remaining = int(headers["X-RateLimit-Remaining"])
+        except (KeyError, TypeError, ValueError):
+            return
+        with self._lock:
+            if capacity > 0 and interval_ms > 0:
+                self.capacity = capacity
+                self.rate = capacity / (interval_ms / 1000)
+            # The server's view wins when it has less budget left than we think
+            self.tokens = min(self.tokens, float(remaining))
+            daily = headers.get("X-RateLimit-Daily-Remaining")
+            if daily is not None and str(daily).isdigit():
+                self.daily_remaining = int(daily)
+                self.daily_checked_at = time.monotonic()
+
+    def pause(self, seconds: float):
+        """Holds every caller of this bucket for `seconds` (e.g. from Retry-After)."""
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 0.0
+
+    def idle(self, now: float, seconds: float) -> bool:
+        return now - self.last_used > seconds and now >= self.paused_until
+
+    def _check_daily(self, now: float):
+        if self.daily_remaining is None or self.daily_remaining > 0:
+            return
+        if now - self.daily_checked_at < GHL_DAILY_LIMIT_RECHECK:
+            raise GHLDailyLimitExceeded("GHL daily request limit reached for this location")
+        # Let one probe through; its response headers report the current budget
+        self.daily_remaining = None
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+class GHLRateLimiter:
+    """
+    One token bucket per location, starting from GHL's documented limits and
+    then following the X-RateLimit-* headers of each response. Buckets are
+    keyed by location id, so they outlive token rotation; buckets idle for
+    `idle_seconds` are evicted.
+    """
+
+    def __init__(self, capacity: int = GHL_RATE_LIMIT_MAX, interval_ms: int = GHL_RATE_LIMIT_INTERVAL_MS,
+                 idle_seconds: float = GHL_BUCKET_IDLE_SECONDS):
+        self.capacity = capacity
+        self.interval_ms = interval_ms
+        self.idle_seconds = idle_seconds
+        self._buckets: dict[str, TokenBucket] = {}
+        self._guard = threading.Lock()
+        self.retries = 0
+
+    def bucket(self, location_id: str | None) -> TokenBucket:
+        """The location's bucket; calls without a location (e.g. OAuth) share one."""
+        key = location_id or "unscoped"
+        with self._guard:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                self._evict_idle()
+                bucket = self._buckets[key] = TokenBucket(self.capacity, self.interval_ms)
+            return bucket
+
+    def _evict_idle(self):
+        now = time.monotonic()
+        for key in [key for key, bucket in self._buckets.items() if bucket.idle(now, self.idle_seconds)]:
+            del self._buckets[key]
+
+    @staticmethod
+    def backoff(attempt: int, retry_after: str | None = None) -> float:
+        """Seconds to wait before retry `attempt` (0-based); Retry-After wins when present."""
+        if retry_after:
+            try:
+                return min(float(retry_after), GHL_BACKOFF_MAX)
+            except ValueError:
+                pass
+        return random.uniform(0, min(GHL_BACKOFF_MAX, GHL_BACKOFF_BASE * 2 ** attempt))
+
+    def stats(self) -> dict:
+        with self._guard:
+            buckets = dict(self._buckets)
+        return {
+            "retries": self.retries,
+            "buckets": {
+                key: {
+                    "capacity": bucket.capacity,
+                    "tokens": round(bucket.tokens, 2),
+                    "waits": bucket.waits,
+                    "daily_remaining": bucket.daily_remaining,
+                }
+                for key, bucket in buckets.items()
+            },
+        }
+
+
+ghl_rate_limiter = GHLRateLimiter()
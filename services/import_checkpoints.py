@@ -0,0 +1,106 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import BinaryIO
+
+from services.upload_jobs import CRM_JOBS_DIR
+
+# Finished-row records older than this are pruned when the store opens
+CRM_CHECKPOINT_TTL_DAYS = int(os.getenv("CRM_CHECKPOINT_TTL_DAYS", "30"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS row_checkpoints (
+    import_key TEXT NOT NULL,
+    row_index INTEGER NOT NULL,
+    outcome TEXT NOT NULL,
+    contact_id TEXT,
+    email_key TEXT,
+    phone_key TEXT,
+    finished_at REAL NOT NULL,
+    PRIMARY KEY (import_key, row_index)
+)
+"""
+
+
+def import_key(location_id: str, leads_file: BinaryIO) -> str:
+    """
+    Idempotency key of an import: sha256 over the location id and the leads
+    file's bytes. Rewinds the file when done.
+    """
+    digest = hashlib.sha256(location_id.encode() + b"\0")
+    leads_file.seek(0)
+    for block in iter(lambda: leads_file.read(1024 * 1024), b""):
+        digest.update(block)
+    leads_file.seek(0)
+    return digest.hexdigest()
+
+
+class ImportCheckpointStore:
+    """
+    Per-row completion records for lead imports, keyed by (import key, row index).
+
+    A row is recorded once its create/update succeeded, so re-submitting the
+    same file (or resuming a job) skips finished rows. Rows that created a
+    contact also keep their email/phone keys, which lets a resumed import
+    rebuild the matches earlier rows would have added to the lookup maps.
+    """
+
+    def __init__(self, directory: str = CRM_JOBS_DIR, ttl_days: int = CRM_CHECKPOINT_TTL_DAYS):
+        self.directory = directory
+        self.ttl_days = ttl_days
+        self.db_path = os.path.join(directory, "checkpoints.sqlite3")
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._connection is None:
+            os.makedirs(self.directory, exist_ok=True)
+            connection = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            # Every record is committed; NORMAL keeps that cheap under WAL
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(SCHEMA)
+            connection.execute(
+                "DELETE FROM row_checkpoints WHERE finished_at < ?",
+                (time.time() - self.ttl_days * 86400,),
+            )
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def load(self, key: str) -> tuple[set[int], list[tuple[str | None, str | None, str]]]:
+        """
+        Returns the finished row indexes of an import and the
+        (email_key, phone_key, contact_id) of the rows that created contacts.
+        """
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT row_index, outcome, contact_id, email_key, phone_key "
+                "FROM row_checkpoints WHERE import_key = ? ORDER BY row_index",
+                (key,),
+            ).fetchall()
+        finished = {row[0] for row in rows}
+        created = [(row[3], row[4], row[2]) for row in rows if row[1] == "new" and row[2]]
+        return finished, created
+
+    def record(self, key: str, row_index: int, outcome: str, contact_id: str | None = None,
+               email_key: str | None = None, phone_key: str | None = None):
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO row_checkpoints VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, row_index, outcome, contact_id, email_key, phone_key, time.time()),
+            )
+            db.commit()
+
+    def clear(self, key: str):
+        """Forgets every finished row of an import (used for a forced re-run)."""
+        with self._lock:
+            db = self._db()
+            db.execute("DELETE FROM row_checkpoints WHERE import_key = ?", (key,))
+            db.commit()
+
+
+import_checkpoints = ImportCheckpointStore()
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import csv
+import io
+import re
+from typing import TYPE_CHECKING, BinaryIO, Iterator
+
+# numpy/pandas are imported by the functions that need them, keeping them
+# out of the app's import path (streaming rows and normalize_phone don't)
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Cells pandas.read_csv treats as missing by default; kept so streamed rows
+# carry None exactly where the DataFrame-based upload used to see NaN.
+NA_VALUES = frozenset({
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND",
+    "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+})
+MEMBER_COLUMNS = ("Contact Id", "Email", "Phone")
+MEMBER_CHUNK_SIZE = 50_000
+# Longer phone cells (free text, several numbers) take the scalar path
+PHONE_MAX_VECTOR_WIDTH = 32
+
+
+def normalize_phone(phone: str) -> str:
+    if not isinstance(phone, str):
+        return ""
+    phone = phone.strip()
+    digits = re.sub(r'\D', '', phone)
+    if len(digits) == 11 and digits.startswith('1'):
+        digits = digits[1:]
+    if len(digits) == 10:
+        return f"{digits[0:3]}-{digits[3:6]}-{digits[6:10]}"
+    return ""
+
+
+def iter_csv_rows(file: BinaryIO, encoding: str = "utf-8-sig") -> Iterator[tuple[int, dict]]:
+    """
+    Streams a CSV upload row by row as (row_index, {column: value}) pairs.
+
+    Reads straight from the (spooled) binary upload, so memory stays flat no
+    matter how large the file is. Missing cells are None; every other value
+    is the raw string from the file.
+    """
+    text = io.TextIOWrapper(file, encoding=encoding, newline="")
+    try:
+        reader = csv.DictReader(text)
+        for idx, raw in enumerate(reader):
+            yield idx, {
+                column: None if value is None or value in NA_VALUES else value
+                for column, value in raw.items()
+                # DictReader files surplus cells under a None key
+                if column is not None
+            }
+    finally:
+        # Leave the underlying upload open for its owner to close
+        text.detach()
+
+
+def build_member_index(file: BinaryIO, chunksize: int = MEMBER_CHUNK_SIZE) -> tuple[dict, dict]:
+    """
+    Builds the email -> contact id and phone -> contact id maps from a member
+    export, reading only the three columns it needs, in chunks, as strings.
+    """
+    import pandas as pd
+
+    email_to_id, phone_to_id = {}, {}
+    chunks = pd.read_csv(
+        file,
+        index_col=False,
+        usecols=lambda column: column in MEMBER_COLUMNS,
+        dtype=str,
+        chunksize=chunksize,
+    )
+    for chunk in chunks:
+        contact_ids = _column(chunk, "Contact Id")
+        contact_ids = contact_ids.astype(object).where(contact_ids.notna(), None)
+
+        emails = _column(chunk, "Email")
+        has_email = emails.notna() & (emails.astype(str).str.len() > 0)
+        email_keys = emails[has_email].str.strip().str.lower()
+        email_to_id.update(zip(email_keys, contact_ids[has_email]))
+
+        phones = normalize_phone_series(_column(chunk, "Phone"))
+        has_phone = phones != ""
+        phone_to_id.update(zip(phones[has_phone], contact_ids[has_phone]))
+    return email_to_id, phone_to_id
+
+
+def normalize_phone_series(phones: pd.Series) -> pd.Series:
+    """
+    Column-at-a-time `normalize_phone`: same NNN-NNN-NNNN output, "" for
+    missing, non-string or invalid values.
+
+    Short ASCII values (almost every phone cell) are handled as a 2-D array of
+    code points: digits are compacted to the front of each row with a stable
+    argsort, the optional leading country code 1 is dropped, and the dashes
+    are written in place. Anything else falls back to `normalize_phone`.
+    """
+    import numpy as np
+    import pandas as pd
+
+    values = phones.to_numpy(dtype=object)
+    count = len(values)
+    result = np.full(count, "", dtype=object)
+    if not count:
+        return pd.Series(result, index=phones.index, dtype=object)
+
+    is_text = np.fromiter((isinstance(value, str) for value in values), dtype=bool, count=count)
+    text = np.where(is_text, values, "")
+    lengths = np.fromiter((len(value) for value in text), dtype=np.int64, count=count)
+    short = lengths <= PHONE_MAX_VECTOR_WIDTH
+    width = max(12, int(lengths[short].max(initial=0)))
+
+    codes = np.where(short, text, "").astype(f"U{width}").view(np.uint32).reshape(count, width)
+    fast = short & (codes <= 127).all(axis=1)
+    is_digit = (codes >= ord("0")) & (codes <= ord("9"))
+    digit_count = is_digit.sum(axis=1)
+    leading = np.take_along_axis(codes, np.argsort(~is_digit, axis=1, kind="stable")[:, :11], axis=1)
+
+    has_country_code = (digit_count == 11) & (leading[:, 0] == ord("1"))
+    ten_digits = np.where(has_country_code[:, None], leading[:, 1:11], leading[:, 0:10])
+    valid = fast & ((digit_count == 10) | has_country_code)
+
+    formatted = np.full((int(valid.sum()), 12), ord("-"), dtype=np.uint32)
+    formatted[:, [0, 1, 2, 4, 5, 6, 8, 9, 10, 11]] = ten_digits[valid]
+    result[valid] = formatted.view("U12").ravel()
+
+    for i in np.flatnonzero(is_text & ~fast):
+        result[i] = normalize_phone(values[i])
+    return pd.Series(result, index=phones.index, dtype=object)
+
+
+def _column(chunk: pd.DataFrame, name: str) -> pd.Series:
+    import pandas as pd
+
+    if name in chunk:
+        return chunk[name]
+    return pd.Series(None, index=chunk.index, dtype=object)
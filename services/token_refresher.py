@@ -0,0 +1,117 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime as dt
+
+from services.token_service import list_token_expiries, refresh_token
+
+logger = logging.getLogger(__name__)
+
+# Refresh this many seconds before a token expires
+TOKEN_REFRESH_MARGIN = int(os.getenv("TOKEN_REFRESH_MARGIN", "900"))
+# How often the schedule is checked, and how long to wait before retrying a failed refresh
+TOKEN_REFRESH_INTERVAL = int(os.getenv("TOKEN_REFRESH_INTERVAL", "60"))
+TOKEN_REFRESH_RETRY_DELAY = int(os.getenv("TOKEN_REFRESH_RETRY_DELAY", "120"))
+TOKEN_REFRESHER_ENABLED = os.getenv("TOKEN_REFRESHER_ENABLED", "true").lower() in ("1", "true", "yes")
+
+
+class TokenRefresher:
+    """
+    Background task that keeps the GHL OAuth tokens in the token table fresh.
+
+    It knows every location's `expires_at` (loaded from the table at startup
+    and updated by `routers/auth.redirect_handler`) and refreshes each token
+    `margin` seconds before it expires, so `get_valid_token` on the request
+    path only reads a valid token. Outcomes are kept as counters for the
+    status route.
+    """
+
+    def __init__(self, margin: int = TOKEN_REFRESH_MARGIN, interval: int = TOKEN_REFRESH_INTERVAL,
+                 retry_delay: int = TOKEN_REFRESH_RETRY_DELAY):
+        self.margin = margin
+        self.interval = interval
+        self.retry_delay = retry_delay
+        self._expiries: dict[str, int] = {}
+        self._retry_at: dict[str, float] = {}
+        self._task: asyncio.Task | None = None
+        self.metrics = {
+            "refreshed": 0,
+            "failed": 0,
+            "last_run": None,
+            "last_error": None,
+            "failing_locations": {},
+        }
+
+    def track(self, location_id: str, expires_at: int | str):
+        """Records (or updates) when a location's token expires."""
+        self._expiries[location_id] = int(expires_at)
+        self._retry_at.pop(location_id, None)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def status(self) -> dict:
+        now = round(dt.now().timestamp())
+        next_expiry = min(self._expiries.values(), default=None)
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "tracked_locations": len(self._expiries),
+            "due": len(self._due_locations(now)),
+            "seconds_to_next_expiry": next_expiry - now if next_expiry is not None else None,
+            "margin": self.margin,
+            **self.metrics,
+        }
+
+    async def _run(self):
+        try:
+            expiries = await asyncio.to_thread(list_token_expiries)
+            for location_id, expires_at in expiries.items():
+                self._expiries.setdefault(location_id, expires_at)
+        except Exception as e:
+            logger.error("Token refresher could not load the token table: %s", e)
+            self.metrics["last_error"] = str(e)
+
+        while True:
+            await self.refresh_due()
+            await asyncio.sleep(self.interval)
+
+    def _due_locations(self, now: int) -> list[str]:
+        monotonic_now = time.monotonic()
+        return [
+            location_id
+            for location_id, expires_at in self._expiries.items()
+            if expires_at - self.margin <= now and self._retry_at.get(location_id, 0) <= monotonic_now
+        ]
+
+    async def refresh_due(self):
+        """Refreshes every token that is inside the margin, one at a time."""
+        for location_id in self._due_locations(round(dt.now().timestamp())):
+            try:
+                user = await asyncio.to_thread(refresh_token, location_id, self.margin)
+                self.track(location_id, user["expires_at"])
+                self.metrics["refreshed"] += 1
+                self.metrics["failing_locations"].pop(location_id, None)
+                logger.info("Refreshed GHL token for location %s", location_id)
+            except Exception as e:
+                self._retry_at[location_id] = time.monotonic() + self.retry_delay
+                self.metrics["failed"] += 1
+                self.metrics["last_error"] = f"{location_id}: {e}"
+                self.metrics["failing_locations"][location_id] = (
+                    self.metrics["failing_locations"].get(location_id, 0) + 1
+                )
+                logger.error("Failed to refresh GHL token for location %s: %s", location_id, e)
+        self.metrics["last_run"] = dt.now().isoformat()
+
+
+token_refresher = TokenRefresher()
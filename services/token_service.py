@@ -1,7 +1,8 @@
-import boto3
 import os
+import threading
 from datetime import datetime as dt
-import requests
+from services.aws import dynamodb_table
+from services.ghl_client import ghl_client
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -10,22 +11,27 @@ load_dotenv()
 CLIENT_ID = os.getenv("CLIENT_ID")
 CLIENT_SECRET = os.getenv("CLIENT_SECRET")
 AUTH_URL = os.getenv("AUTH_URL")
-AWS_REGION = os.getenv("AWS_REGION")
 DYNAMO_TABLE_NAME = os.getenv("DYNAMO_TABLE_NAME")
 
-dynamodb = boto3.resource(
-    "dynamodb",
-    region_name=AWS_REGION,
-    aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
-    aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY")
-)
 
-table = dynamodb.Table(DYNAMO_TABLE_NAME)
+def _table():
+    # Created on first use from the shared session (services.aws)
+    return dynamodb_table(DYNAMO_TABLE_NAME)
+
+
+# One refresh per location at a time; GHL rotates the refresh token on every use
+_refresh_locks: dict[str, threading.Lock] = {}
+_refresh_locks_guard = threading.Lock()
+
+
+def _refresh_lock(location_id: str) -> threading.Lock:
+    with _refresh_locks_guard:
+        return _refresh_locks.setdefault(location_id, threading.Lock())
 
 
 def get_valid_token(location_id: str):
     # Fetch user from DynamoDB
-    response = table.get_item(Key={"location_id": location_id})
+    response = _table().get_item(Key={"location_id": location_id})
     user = response.get("Item")
     if not user:
         raise Exception("No user found for that location ID")
@@ -33,11 +39,32 @@ def get_valid_token(location_id: str):
     now = round(dt.now().timestamp())
     expires_at = int(user["expires_at"])
 
-    # Token expired — refresh
+    # Token expired — refresh (normally done ahead of time by services.token_refresher)
     if now > expires_at:
         print("Access token expired, refreshing...")
-        token_resp = requests.post(
-            "https://services.leadconnectorhq.com/oauth/token",
+        user = refresh_token(location_id)
+
+    return user["token"]
+
+
+def refresh_token(location_id: str, margin: int = 0) -> dict:
+    """
+    Exchanges the location's refresh token for a new token pair and stores it,
+    unless the stored token is still valid for more than `margin` seconds.
+
+    Re-reads the item under a per-location lock, so a caller that lost the
+    race gets the freshly stored token instead of spending the (already
+    rotated) refresh token again. Returns the stored item.
+    """
+    with _refresh_lock(location_id):
+        user = _table().get_item(Key={"location_id": location_id}).get("Item")
+        if not user:
+            raise Exception("No user found for that location ID")
+        if round(dt.now().timestamp()) + margin <= int(user["expires_at"]):
+            return user
+
+        token_resp = ghl_client.post(
+            "oauth/token",
             data={
                 "client_id": CLIENT_ID,
                 "client_secret": CLIENT_SECRET,
@@ -47,12 +74,27 @@ def get_valid_token(location_id: str):
                 "user_type": "Location"
             }
         ).json()
+        if "access_token" not in token_resp:
+            raise Exception(f"Token refresh failed for location {location_id}: {token_resp}")
 
         user["token"] = token_resp["access_token"]
         user["refresh"] = token_resp["refresh_token"]
         user["expires_at"] = str(round(dt.now().timestamp() + token_resp["expires_in"]))
 
         # Update in DynamoDB
-        table.put_item(Item=user)
+        _table().put_item(Item=user)
+        return user
 
-    return user["token"]
+
+def list_token_expiries() -> dict[str, int]:
+    """Returns location_id -> expires_at for every stored location."""
+    expiries = {}
+    kwargs = {"ProjectionExpression": "location_id, expires_at"}
+    while True:
+        page = _table().scan(**kwargs)
+        for item in page.get("Items", []):
+            if "expires_at" in item:
+                expiries[item["location_id"]] = int(item["expires_at"])
+        if "LastEvaluatedKey" not in page:
+            return expiries
+        kwargs["ExclusiveStartKey"] = page["LastEvaluatedKey"]
@@ -0,0 +1,243 @@
+import asyncio
+import csv
+import io
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime as dt
+from typing import Awaitable, BinaryIO, Callable
+
+logger = logging.getLogger(__name__)
+
+# Local state for background CRM uploads (SQLite job table + spooled files)
+CRM_JOBS_DIR = os.getenv("CRM_JOBS_DIR", os.path.join("data", "crm_jobs"))
+# Seconds between progress writes while a job is running
+CRM_JOBS_FLUSH_INTERVAL = float(os.getenv("CRM_JOBS_FLUSH_INTERVAL", "1"))
+
+ACTIVE_STATUSES = ("queued", "running")
+RESUMABLE_STATUSES = ("failed", "interrupted")
+COUNTER_FIELDS = ("new_leads", "existing_leads", "error", "already_imported")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    location_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    options TEXT NOT NULL,
+    total_rows INTEGER NOT NULL DEFAULT 0,
+    processed INTEGER NOT NULL DEFAULT 0,
+    new_leads INTEGER NOT NULL DEFAULT 0,
+    existing_leads INTEGER NOT NULL DEFAULT 0,
+    error INTEGER NOT NULL DEFAULT 0,
+    already_imported INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    message TEXT,
+    result TEXT
+)
+"""
+
+
+class UploadJobStore:
+    """
+    Background jobs for /crm/upload-contact, persisted in a local SQLite file.
+
+    The uploaded CSVs are spooled next to the database so the import can run
+    after the request has returned. Counters are flushed every
+    `CRM_JOBS_FLUSH_INTERVAL` seconds and the final report is stored with the
+    job, so results survive a restart. Jobs that were still running when the
+    process stopped are marked "interrupted" on startup; failed and
+    interrupted jobs keep their spooled files and can be resumed.
+    """
+
+    def __init__(self, directory: str = CRM_JOBS_DIR, flush_interval: float = CRM_JOBS_FLUSH_INTERVAL):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.db_path = os.path.join(directory, "jobs.sqlite3")
+        self._db_lock = threading.Lock()
+        self._initialized = False
+        # job id -> (asyncio task, live result_data) for jobs running in this process
+        self._running: dict[str, tuple[asyncio.Task, dict]] = {}
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            os.makedirs(self.directory, exist_ok=True)
+        connection = sqlite3.connect(self.db_path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        if not self._initialized:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(SCHEMA)
+            connection.commit()
+            self._initialized = True
+        return connection
+
+    def _execute(self, query: str, params: tuple = ()) -> list[sqlite3.Row]:
+        with self._db_lock:
+            connection = self._connect()
+            try:
+                rows = connection.execute(query, params).fetchall()
+                connection.commit()
+                return rows
+            finally:
+                connection.close()
+
+    def job_dir(self, job_id: str) -> str:
+        return os.path.join(self.directory, job_id)
+
+    def members_path(self, job_id: str) -> str:
+        return os.path.join(self.job_dir(job_id), "members.csv")
+
+    def leads_path(self, job_id: str) -> str:
+        return os.path.join(self.job_dir(job_id), "leads.csv")
+
+    def create_job(self, location_id: str, members_file: BinaryIO | None, leads_file: BinaryIO, options: dict) -> dict:
+        """Spools the uploads to disk, counts the lead rows and records a queued job."""
+        job_id = uuid.uuid4().hex
+        os.makedirs(self.job_dir(job_id), exist_ok=True)
+        for source, path in ((members_file, self.members_path(job_id)), (leads_file, self.leads_path(job_id))):
+            if source is None:
+                continue
+            source.seek(0)
+            with open(path, "wb") as target:
+                shutil.copyfileobj(source, target)
+
+        self._execute(
+            "INSERT INTO jobs (id, location_id, status, options, total_rows, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (job_id, location_id, "queued", json.dumps(options), self._count_rows(self.leads_path(job_id)),
+             dt.now().isoformat()),
+        )
+        return self.get_job(job_id)
+
+    @staticmethod
+    def _count_rows(path: str) -> int:
+        with open(path, "rb") as file:
+            text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+            return max(sum(1 for _ in csv.reader(text) if _) - 1, 0)
+
+    def start(self, job_id: str, run: Callable[[BinaryIO | None, BinaryIO, dict], Awaitable[dict]], result_data: dict):
+        """
+        Runs `run(members_file, leads_file, result_data)` in the background;
+        `members_file` is None when the job was created without one.
+        `result_data` is watched for live counters while the job runs.
+        """
+        task = asyncio.create_task(self._run(job_id, run, result_data))
+        self._running[job_id] = (task, result_data)
+
+    def can_resume(self, job: dict) -> bool:
+        return (
+            job["status"] in RESUMABLE_STATUSES
+            and job["id"] not in self._running
+            and os.path.exists(self.leads_path(job["id"]))
+        )
+
+    async def resume(self, job_id: str, run: Callable[[BinaryIO | None, BinaryIO, dict], Awaitable[dict]],
+                     result_data: dict) -> dict:
+        """Re-queues a failed/interrupted job on its spooled files and starts it again."""
+        await asyncio.to_thread(
+            self._execute,
+            "UPDATE jobs SET status = 'queued', finished_at = NULL, message = NULL, result = NULL WHERE id = ?",
+            (job_id,),
+        )
+        # A concurrent resume of the same job may have started it while we waited
+        if job_id not in self._running:
+            self.start(job_id, run, result_data)
+        return await asyncio.to_thread(self.get_job, job_id)
+
+    async def _run(self, job_id: str, run, result_data: dict):
+        # SQLite calls (commit, lock, busy timeout) run in worker threads, off the event loop
+        await asyncio.to_thread(
+            self._execute, "UPDATE jobs SET status = 'running', started_at = ? WHERE id = ?", (time.time(), job_id)
+        )
+        flusher = asyncio.create_task(self._flush_periodically(job_id, result_data))
+        try:
+            members_path = self.members_path(job_id)
+            members = open(members_path, "rb") if os.path.exists(members_path) else None
+            try:
+                with open(self.leads_path(job_id), "rb") as leads:
+                    result = await run(members, leads, result_data)
+            finally:
+                if members is not None:
+                    members.close()
+            await asyncio.to_thread(self._finish, job_id, "completed", result)
+            await asyncio.to_thread(shutil.rmtree, self.job_dir(job_id), ignore_errors=True)
+        except Exception as e:
+            logger.exception("CRM upload job %s failed", job_id)
+            await asyncio.to_thread(
+                self._finish, job_id, "failed", result_data, getattr(e, "detail", None) or str(e)
+            )
+        finally:
+            flusher.cancel()
+            self._running.pop(job_id, None)
+
+    async def _flush_periodically(self, job_id: str, result_data: dict):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await asyncio.to_thread(self._flush, job_id, result_data)
+
+    def _flush(self, job_id: str, result_data: dict):
+        self._execute(
+            "UPDATE jobs SET processed = ?, new_leads = ?, existing_leads = ?, error = ?, already_imported = ? "
+            "WHERE id = ?",
+            (result_data.get("total_", 0), *(result_data.get(field, 0) for field in COUNTER_FIELDS), job_id),
+        )
+
+    def _finish(self, job_id: str, status: str, result: dict, message: str | None = None):
+        self._flush(job_id, result)
+        self._execute(
+            "UPDATE jobs SET status = ?, finished_at = ?, message = ?, result = ? WHERE id = ?",
+            (status, time.time(), message, json.dumps(result, default=str), job_id),
+        )
+
+    def get_job(self, job_id: str) -> dict | None:
+        """Job status with live counters, rows/sec and an ETA while it runs."""
+        rows = self._execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
+        if not rows:
+            return None
+        job = dict(rows[0])
+        job.pop("result")
+        job["options"] = json.loads(job["options"])
+
+        running = self._running.get(job_id)
+        if running is not None:
+            # Fresher than the last flush
+            result_data = running[1]
+            job["processed"] = result_data.get("total_", 0)
+            for field in COUNTER_FIELDS:
+                job[field] = result_data.get(field, 0)
+
+        started_at, finished_at = job["started_at"], job["finished_at"]
+        elapsed = ((finished_at or time.time()) - started_at) if started_at else 0.0
+        rate = job["processed"] / elapsed if elapsed > 0 else 0.0
+        remaining = max(job["total_rows"] - job["processed"], 0)
+        job["rows_per_sec"] = round(rate, 2)
+        job["eta_seconds"] = round(remaining / rate, 1) if rate and job["status"] == "running" else None
+        job["elapsed_seconds"] = round(elapsed, 1)
+        return job
+
+    def get_result(self, job_id: str) -> dict | None:
+        rows = self._execute("SELECT result FROM jobs WHERE id = ?", (job_id,))
+        if not rows or rows[0]["result"] is None:
+            return None
+        return json.loads(rows[0]["result"])
+
+    def mark_interrupted(self) -> int:
+        """Flags jobs left queued/running by a previous process; returns how many."""
+        placeholders = ", ".join("?" for _ in ACTIVE_STATUSES)
+        stale = self._execute(f"SELECT id FROM jobs WHERE status IN ({placeholders})", ACTIVE_STATUSES)
+        for row in stale:
+            if row["id"] in self._running:
+                continue
+            self._execute(
+                "UPDATE jobs SET status = 'interrupted', finished_at = ?, message = ? WHERE id = ?",
+                (time.time(), "Process restarted before the job finished", row["id"]),
+            )
+        return len(stale)
+
+
+upload_jobs = UploadJobStore()
@@ -0,0 +1,231 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+# SQLite file holding payloads until the webhook has accepted them
+WEBHOOK_OUTBOX_PATH = os.getenv("WEBHOOK_OUTBOX_PATH", os.path.join("data", "webhook_outbox.sqlite3"))
+# Concurrent POSTs, and records per POST (1 = one JSON object per POST; more sends a JSON array)
+WEBHOOK_OUTBOX_CONCURRENCY = int(os.getenv("WEBHOOK_OUTBOX_CONCURRENCY", "8"))
+WEBHOOK_OUTBOX_BATCH_SIZE = int(os.getenv("WEBHOOK_OUTBOX_BATCH_SIZE", "1"))
+# Retry backoff (seconds) and attempts before a payload is parked as "dead"
+WEBHOOK_OUTBOX_BACKOFF_BASE = float(os.getenv("WEBHOOK_OUTBOX_BACKOFF_BASE", "2"))
+WEBHOOK_OUTBOX_BACKOFF_MAX = float(os.getenv("WEBHOOK_OUTBOX_BACKOFF_MAX", "300"))
+WEBHOOK_OUTBOX_MAX_ATTEMPTS = int(os.getenv("WEBHOOK_OUTBOX_MAX_ATTEMPTS", "20"))
+# Longest idle wait between checks for due retries
+WEBHOOK_OUTBOX_POLL_INTERVAL = float(os.getenv("WEBHOOK_OUTBOX_POLL_INTERVAL", "1"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    next_attempt_at REAL NOT NULL,
+    last_error TEXT
+)
+"""
+DUE_INDEX = "CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_attempt_at)"
+
+
+class WebhookOutbox:
+    """
+    Durable queue of webhook payloads with a background forwarder.
+
+    Payloads are committed to SQLite before the request is acknowledged and
+    deleted only after the webhook accepted them, so delivery is
+    at-least-once and survives restarts. Failed posts are retried with
+    exponential backoff; after `max_attempts` a payload is kept as "dead"
+    until it is re-queued.
+    """
+
+    def __init__(self, path: str = WEBHOOK_OUTBOX_PATH, concurrency: int = WEBHOOK_OUTBOX_CONCURRENCY,
+                 batch_size: int = WEBHOOK_OUTBOX_BATCH_SIZE, max_attempts: int = WEBHOOK_OUTBOX_MAX_ATTEMPTS,
+                 poll_interval: float = WEBHOOK_OUTBOX_POLL_INTERVAL):
+        self.path = path
+        self.concurrency = max(1, concurrency)
+        self.batch_size = max(1, batch_size)
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+        self._task: asyncio.Task | None = None
+        self._wake: asyncio.Event | None = None
+        self.metrics = {"sent": 0, "failed_attempts": 0, "marked_dead": 0, "last_sent_at": None, "last_error": None}
+
+    def _db(self) -> sqlite3.Connection:
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            # FULL: an acknowledged payload is on disk even if the machine goes down
+            connection.execute("PRAGMA synchronous=FULL")
+            connection.execute(SCHEMA)
+            connection.execute(DUE_INDEX)
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def enqueue(self, payloads: list[dict]) -> list[int]:
+        """Stores payloads in one transaction; returns their outbox ids."""
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            ids = [
+                db.execute(
+                    "INSERT INTO outbox (payload, created_at, next_attempt_at) VALUES (?, ?, ?)",
+                    (json.dumps(payload, default=str), now, now),
+                ).lastrowid
+                for payload in payloads
+            ]
+            db.commit()
+        return ids
+
+    async def put(self, payloads: list[dict]) -> list[int]:
+        """Enqueues off the event loop and wakes the forwarder."""
+        ids = await asyncio.to_thread(self.enqueue, payloads)
+        if self._wake is not None:
+            self._wake.set()
+        return ids
+
+    def start(self, send: Callable[[dict | list[dict]], Awaitable[None]]):
+        """
+        Starts forwarding with `send`, which posts one payload (or a list of
+        them when batching) and raises if the webhook did not accept it.
+        """
+        if self._task is None or self._task.done():
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run(send))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self, send):
+        while True:
+            self._wake.clear()
+            try:
+                rows = await asyncio.to_thread(self._claim, self.concurrency * self.batch_size)
+            except Exception as e:
+                logger.error("Webhook outbox could not read pending payloads: %s", e)
+                self.metrics["last_error"] = str(e)
+                rows = []
+            if not rows:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            batches = [rows[i:i + self.batch_size] for i in range(0, len(rows), self.batch_size)]
+            delivered = await asyncio.gather(*(self._deliver(send, batch) for batch in batches))
+            if not all(delivered):
+                # The store is failing (locked, disk full, ...): back off instead of re-sending at once
+                await asyncio.sleep(self.poll_interval)
+
+    async def _deliver(self, send, rows: list[tuple[int, str, int]]) -> bool:
+        """
+        Sends one batch and records the outcome. Returns False when the outcome
+        could not be stored; the rows then stay pending and are sent again.
+        """
+        try:
+            payloads = [json.loads(payload) for _, payload, _ in rows]
+            try:
+                await send(payloads if self.batch_size > 1 else payloads[0])
+            except Exception as e:
+                self.metrics["failed_attempts"] += 1
+                self.metrics["last_error"] = str(e)
+                logger.warning("Webhook delivery of %d payload(s) failed: %s", len(rows), e)
+                await asyncio.to_thread(self._retry_later, rows, str(e))
+                return True
+            await asyncio.to_thread(self._delete, [row_id for row_id, _, _ in rows])
+        except Exception as e:
+            self.metrics["last_error"] = str(e)
+            logger.error("Webhook outbox could not record delivery of %d payload(s): %s", len(rows), e)
+            return False
+        self.metrics["sent"] += len(rows)
+        self.metrics["last_sent_at"] = time.time()
+        return True
+
+    def _claim(self, limit: int) -> list[tuple[int, str, int]]:
+        with self._lock:
+            return self._db().execute(
+                "SELECT id, payload, attempts FROM outbox "
+                "WHERE status = 'pending' AND next_attempt_at <= ? ORDER BY id LIMIT ?",
+                (time.time(), limit),
+            ).fetchall()
+
+    def _delete(self, ids: list[int]):
+        with self._lock:
+            db = self._db()
+            db.executemany("DELETE FROM outbox WHERE id = ?", [(row_id,) for row_id in ids])
+            db.commit()
+
+    def _retry_later(self, rows: list[tuple[int, str, int]], error: str):
+        now = time.time()
+        updates = []
+        for row_id, _, attempts in rows:
+            attempts += 1
+            if attempts >= self.max_attempts:
+                self.metrics["marked_dead"] += 1
+                updates.append(("dead", attempts, now, error, row_id))
+            else:
+                delay = min(WEBHOOK_OUTBOX_BACKOFF_MAX, WEBHOOK_OUTBOX_BACKOFF_BASE * 2 ** (attempts - 1))
+                updates.append(("pending", attempts, now + random.uniform(delay / 2, delay), error, row_id))
+        with self._lock:
+            db = self._db()
+            db.executemany(
+                "UPDATE outbox SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ? WHERE id = ?",
+                updates,
+            )
+            db.commit()
+
+    def requeue_dead(self) -> int:
+        """Gives every dead payload a fresh set of attempts; returns how many."""
+        with self._lock:
+            db = self._db()
+            count = db.execute(
+                "UPDATE outbox SET status = 'pending', attempts = 0, next_attempt_at = ? WHERE status = 'dead'",
+                (time.time(),),
+            ).rowcount
+            db.commit()
+        if count and self._wake is not None:
+            self._wake.set()
+        return count
+
+    def stats(self) -> dict:
+        """Queue depth and lag (age of the oldest undelivered payload) plus forwarder counters."""
+        now = time.time()
+        with self._lock:
+            counts = dict(self._db().execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall())
+            due, oldest = self._db().execute(
+                "SELECT SUM(next_attempt_at <= ?), MIN(created_at) FROM outbox WHERE status = 'pending'",
+                (now,),
+            ).fetchone()
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "depth": counts.get("pending", 0),
+            "due": due or 0,
+            "dead": counts.get("dead", 0),
+            "lag_seconds": round(now - oldest, 1) if oldest is not None else 0.0,
+            "concurrency": self.concurrency,
+            "batch_size": self.batch_size,
+            **self.metrics,
+        }
+
+
+webhook_outbox = WebhookOutbox()
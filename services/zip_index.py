@@ -0,0 +1,154 @@
+"""
+Zip code -> market index behind /addTag and /addTag_sms.
+
+`zip_codes.csv` has one column per market (birmingham, charlotte, ...) with
+that market's zip codes below it. It is compiled once into a small JSON file
+(zip -> indexes into the market list) and the compiled file is what gets
+loaded at startup; it is rebuilt whenever the CSV is newer.
+
+    python -m services.zip_index    # compile zip_codes.csv ahead of deployment
+"""
+import csv
+import json
+import os
+import threading
+import time
+from typing import NamedTuple
+
+ZIP_CODES_CSV = os.getenv("ZIP_CODES_CSV", "zip_codes.csv")
+ZIP_INDEX_PATH = os.getenv("ZIP_INDEX_PATH", os.path.join("data", "zip_index.json"))
+
+FORMAT_VERSION = 1
+
+
+class ZipTable(NamedTuple):
+    markets: tuple[str, ...]
+    # Normalized zip -> markets listing it (a zip may appear under more than one)
+    zip_to_markets: dict[str, tuple[str, ...]]
+    source_mtime: float
+    loaded_at: float
+
+
+def normalize_zip(value) -> str | None:
+    """
+    Zip as the index stores it: digits without leading zeros, ZIP+4 suffix
+    dropped ("02134-1234" -> "2134"). None for empty or non-numeric input.
+    """
+    if value is None:
+        return None
+    text = str(value).strip().split("-")[0]
+    try:
+        return str(int(float(text)))
+    except (ValueError, OverflowError):
+        return None
+
+
+def compile_zip_csv(csv_path: str = ZIP_CODES_CSV, compiled_path: str = ZIP_INDEX_PATH) -> dict:
+    """Reads the market columns of the CSV and writes the compiled index atomically."""
+    with open(csv_path, newline="", encoding="utf-8-sig") as file:
+        reader = csv.reader(file)
+        markets = [name.strip() for name in next(reader, [])]
+        zips: dict[str, list[int]] = {}
+        for row in reader:
+            for market, value in enumerate(row[:len(markets)]):
+                code = normalize_zip(value)
+                if code is not None and market not in zips.setdefault(code, []):
+                    zips[code].append(market)
+
+    compiled = {
+        "version": FORMAT_VERSION,
+        "source_mtime": os.path.getmtime(csv_path),
+        "markets": markets,
+        "zips": zips,
+    }
+    directory = os.path.dirname(compiled_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = f"{compiled_path}.tmp"
+    with open(temp_path, "w") as file:
+        json.dump(compiled, file, separators=(",", ":"))
+    os.replace(temp_path, compiled_path)
+    return compiled
+
+
+class ZipIndex:
+    """
+    In-memory zip -> market lookup, loaded from the compiled index.
+
+    Lookups read one immutable `ZipTable`; `reload` builds a new table and
+    swaps the reference, so requests never see a half-loaded index.
+    """
+
+    def __init__(self, csv_path: str = ZIP_CODES_CSV, compiled_path: str = ZIP_INDEX_PATH):
+        self.csv_path = csv_path
+        self.compiled_path = compiled_path
+        self._table: ZipTable | None = None
+        self._reload_lock = threading.Lock()
+
+    @property
+    def table(self) -> ZipTable:
+        if self._table is None:
+            self.load()
+        return self._table
+
+    def load(self) -> ZipTable:
+        """Loads the compiled index, compiling the CSV first if it is missing or stale."""
+        with self._reload_lock:
+            compiled = self._read_compiled()
+            if compiled is None:
+                compiled = compile_zip_csv(self.csv_path, self.compiled_path)
+            self._table = self._build(compiled)
+            return self._table
+
+    def reload(self) -> ZipTable:
+        """Recompiles the CSV and swaps the new table in."""
+        with self._reload_lock:
+            self._table = self._build(compile_zip_csv(self.csv_path, self.compiled_path))
+            return self._table
+
+    def _read_compiled(self) -> dict | None:
+        try:
+            with open(self.compiled_path) as file:
+                compiled = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if compiled.get("version") != FORMAT_VERSION:
+            return None
+        if os.path.exists(self.csv_path) and os.path.getmtime(self.csv_path) > compiled["source_mtime"]:
+            return None
+        return compiled
+
+    @staticmethod
+    def _build(compiled: dict) -> ZipTable:
+        markets = tuple(compiled["markets"])
+        return ZipTable(
+            markets=markets,
+            zip_to_markets={code: tuple(markets[i] for i in indexes) for code, indexes in compiled["zips"].items()},
+            source_mtime=compiled["source_mtime"],
+            loaded_at=time.time(),
+        )
+
+    def __contains__(self, zip_code) -> bool:
+        code = normalize_zip(zip_code)
+        return code is not None and code in self.table.zip_to_markets
+
+    def markets_for(self, zip_code) -> tuple[str, ...]:
+        code = normalize_zip(zip_code)
+        return self.table.zip_to_markets.get(code, ()) if code is not None else ()
+
+    def stats(self) -> dict:
+        table = self.table
+        return {
+            "markets": len(table.markets),
+            "zip_codes": len(table.zip_to_markets),
+            "source_mtime": table.source_mtime,
+            "loaded_at": table.loaded_at,
+        }
+
+
+zip_index = ZipIndex()
+
+
+if __name__ == "__main__":
+    result = compile_zip_csv()
+    print(f"Compiled {len(result['zips'])} zip codes in {len(result['markets'])} markets to {ZIP_INDEX_PATH}")